@@ -14,6 +14,22 @@ st.set_page_config(
 )
 
 
+# ==================================
+# Schema Migrations
+# ==================================
+# One ledger query per process when the schema is current
+try:
+    from components.migrations import ensure_schema
+
+    migrated = ensure_schema()
+
+    if migrated["applied"]:
+        st.toast(f"Applied {len(migrated['applied'])} schema migration(s)")
+
+except Exception as e:
+    st.error(f"Schema migration failed: {e}")
+
+
 # ==================================
 # Hero Header
 # ==================================
@@ -62,6 +78,7 @@ with col3:
     st.info(
         """
         - accident_weather  
+        - Dashboard rollups  
         """
     )
 
@@ -113,9 +130,56 @@ st.divider()
 # ==================================
 st.markdown("## 📈 Analytics Preview")
 
-st.info(
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_kpis():
     """
-    Analytics dashboards and KPIs will appear here  
-    after successful pipeline execution.
+    Dashboard KPIs, answered from the gold rollups
+    (thousands of rows) rather than the fact table.
     """
-)
+
+    from pipeline.rollups import query
+
+    return {
+        "totals": query(["accidents", "weather_coverage", "avg_tmax_c"]),
+        "by_month": query(["accidents"], group_by=["month"], order_by="month"),
+        "by_state": query(["accidents"], group_by=["state"], order_by="-accidents", limit=10),
+        "by_prcp": query(["accidents"], group_by=["prcp_band"], order_by="-accidents"),
+    }
+
+
+try:
+    kpis = load_kpis()
+    totals = kpis["totals"].iloc[0]
+
+    if not totals["accidents"]:
+        raise LookupError("Rollups are empty")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Accidents", f"{int(totals['accidents']):,}")
+    col2.metric("Weather Coverage", f"{(totals['weather_coverage'] or 0):.1%}")
+    col3.metric(
+        "Avg Max Temp (°C)",
+        f"{totals['avg_tmax_c']:.1f}" if totals["avg_tmax_c"] is not None else "—"
+    )
+
+    st.markdown("#### Accidents per Month")
+    st.line_chart(kpis["by_month"], x="month", y="accidents")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### Top States")
+        st.bar_chart(kpis["by_state"], x="state", y="accidents")
+
+    with col2:
+        st.markdown("#### By Precipitation")
+        st.bar_chart(kpis["by_prcp"], x="prcp_band", y="accidents")
+
+except Exception:
+    st.info(
+        """
+        Analytics dashboards and KPIs will appear here  
+        after successful pipeline execution.
+        """
+    )
@@ -0,0 +1,238 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import contextvars
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import text
+
+from components.tuning import apply_tuning
+from components.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# DEFAULTS
+# ==================================
+DEFAULT_PARALLELISM = 4
+
+
+# ==================================
+# INDEX CATALOG
+# ==================================
+
+def capture_secondary_indexes(conn, table_name: str) -> list[tuple[str, str]]:
+    """
+    Returns (qualified_index_name, indexdef) for every
+    non-unique index on `table_name` that does not back a constraint.
+
+    Primary keys, constraints and unique indexes are kept:
+    ON CONFLICT and REFRESH ... CONCURRENTLY depend on them.
+    """
+
+    query = text("""
+        SELECT
+            format('%I.%I', n.nspname, i.relname) AS index_name,
+            pg_get_indexdef(ix.indexrelid) AS indexdef
+        FROM pg_index ix
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        JOIN pg_namespace n ON n.oid = i.relnamespace
+        WHERE ix.indrelid = CAST(:table AS regclass)
+          AND NOT ix.indisunique
+          AND NOT EXISTS (
+              SELECT 1
+              FROM pg_constraint c
+              WHERE c.conindid = ix.indexrelid
+          )
+        ORDER BY i.relname
+    """)
+
+    return [
+        (row[0], row[1])
+        for row in conn.execute(query, {"table": table_name})
+    ]
+
+
+def pending_indexes(conn, table_name: str) -> list[tuple[str, str]]:
+    """
+    Returns index definitions left in meta.pending_indexes
+    by an earlier bulk load that never finished rebuilding.
+    """
+
+    query = text("""
+        SELECT index_name, indexdef
+        FROM meta.pending_indexes
+        WHERE table_name = :table
+        ORDER BY index_name
+    """)
+
+    return [
+        (row[0], row[1])
+        for row in conn.execute(query, {"table": table_name})
+    ]
+
+
+# ==================================
+# DROP / REBUILD
+# ==================================
+
+def drop_secondary_indexes(engine, table_names: list[str]) -> list[tuple[str, str, str]]:
+    """
+    Records and drops the secondary indexes of the given tables.
+
+    Definitions are written to meta.pending_indexes in the
+    same transaction as the DROP, so a crash mid-load never
+    loses an index definition.
+
+    Returns:
+        List of (table_name, index_name, indexdef) to rebuild.
+    """
+
+    dropped = []
+
+    with engine.begin() as conn:
+        for table_name in table_names:
+
+            # Leftovers from a crashed run are rebuilt with this one
+            for index_name, indexdef in pending_indexes(conn, table_name):
+                dropped.append((table_name, index_name, indexdef))
+
+            for index_name, indexdef in capture_secondary_indexes(conn, table_name):
+                conn.execute(
+                    text("""
+                        INSERT INTO meta.pending_indexes (
+                            index_name,
+                            table_name,
+                            indexdef
+                        )
+                        VALUES (:index_name, :table, :indexdef)
+                        ON CONFLICT (index_name)
+                        DO UPDATE SET indexdef = EXCLUDED.indexdef
+                    """),
+                    {
+                        "index_name": index_name,
+                        "table": table_name,
+                        "indexdef": indexdef,
+                    },
+                )
+                conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                dropped.append((table_name, index_name, indexdef))
+
+                logger.info(f"Dropped {index_name} for bulk load")
+
+    return dropped
+
+
+def rebuild_indexes(
+    engine,
+    indexes: list[tuple[str, str, str]],
+    parallelism: int = DEFAULT_PARALLELISM,
+    maintenance_work_mem: str | None = None,
+) -> dict:
+    """
+    Recreates dropped indexes, several at a time.
+
+    Each build runs on its own connection under the
+    "index_build" tuning profile (raised maintenance_work_mem;
+    `maintenance_work_mem` overrides it). CREATE INDEX takes a
+    SHARE lock, so builds on the same table do not block each other.
+    """
+
+    if not indexes:
+        return {"rebuilt": 0, "seconds": 0.0}
+
+    start_time = time.perf_counter()
+
+    def worker(table_name: str, index_name: str, indexdef: str):
+        t0 = time.perf_counter()
+
+        with engine.begin() as conn:
+            overrides = (
+                {"maintenance_work_mem": maintenance_work_mem}
+                if maintenance_work_mem else {}
+            )
+            apply_tuning(conn, "index_build", **overrides)
+
+            # Partitioned parents report "ON ONLY"; rebuild on every partition
+            conn.execute(text(
+                indexdef
+                .replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1)
+                .replace(" ON ONLY ", " ON ", 1)
+            ))
+            conn.execute(
+                text("DELETE FROM meta.pending_indexes WHERE index_name = :name"),
+                {"name": index_name},
+            )
+
+        logger.info(
+            f"Rebuilt {index_name} on {table_name} "
+            f"in {time.perf_counter() - t0:.2f} seconds"
+        )
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, worker, *idx)
+            for idx in indexes
+        ]
+        for f in as_completed(futures):
+            f.result()
+
+    elapsed = time.perf_counter() - start_time
+
+    return {"rebuilt": len(indexes), "seconds": round(elapsed, 2)}
+
+
+# ==================================
+# BULK LOAD CONTEXT
+# ==================================
+
+@contextmanager
+def bulk_load(
+    engine,
+    table_names: list[str],
+    enabled: bool = True,
+    parallelism: int = DEFAULT_PARALLELISM,
+    maintenance_work_mem: str | None = None,
+):
+    """
+    Drops secondary indexes on `table_names` for the duration
+    of the block and rebuilds them afterwards.
+
+    Indexes are rebuilt even if the load fails, so the table
+    is never left without them.
+
+    Intended usage:
+        with bulk_load(engine, ["bronze.weather_daily"], enabled=bulk):
+            ... COPY / INSERT ... SELECT ...
+
+    With enabled=False the block runs unchanged, so callers
+    can wrap their load unconditionally.
+    """
+
+    if not enabled:
+        yield
+        return
+
+    dropped = drop_secondary_indexes(engine, table_names)
+
+    logger.info(
+        f"Bulk load mode: dropped {len(dropped)} index(es) "
+        f"on {', '.join(table_names)}"
+    )
+
+    try:
+        yield
+    finally:
+        result = rebuild_indexes(
+            engine,
+            dropped,
+            parallelism=parallelism,
+            maintenance_work_mem=maintenance_work_mem,
+        )
+
+        logger.info(
+            f"Bulk load mode: rebuilt {result['rebuilt']} index(es) "
+            f"in {result['seconds']:.2f} seconds"
+        )
@@ -0,0 +1,146 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import threading
+import time
+from sqlalchemy import text
+
+
+# ----------------------------------
+# Catalog Cache
+# ----------------------------------
+# Positive answers (exists, columns, has rows) are reused for
+# this long; missing tables and empty tables are always
+# re-checked. Writers call invalidate() for tables they change.
+CACHE_TTL_SECONDS = 30
+
+_cache: dict[str, tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+# One pg_catalog round trip for any number of tables.
+#
+# - relkind covers tables, partitioned tables, views,
+#   materialized views and foreign tables.
+# - Non-emptiness needs a dynamic "SELECT ... LIMIT 1";
+#   query_to_xml runs it inline and returns '' for no rows.
+#   The CASE keeps it from running for missing tables or
+#   when the caller did not ask.
+CATALOG_QUERY = text("""
+    SELECT
+        t.name,
+        c.oid IS NOT NULL AS exists,
+        ARRAY(
+            SELECT a.attname::TEXT
+            FROM pg_attribute a
+            WHERE a.attrelid = c.oid
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+        ) AS columns,
+        CASE
+            WHEN c.oid IS NOT NULL AND :check_rows THEN
+                query_to_xml(
+                    format('SELECT 1 AS present FROM %s LIMIT 1', c.oid::regclass),
+                    false, true, ''
+                )::TEXT <> ''
+        END AS has_rows
+    FROM unnest(CAST(:tables AS TEXT[])) AS t(name)
+    LEFT JOIN pg_namespace n
+        ON n.nspname = split_part(t.name, '.', 1)
+    LEFT JOIN pg_class c
+        ON c.relnamespace = n.oid
+        AND c.relname = split_part(t.name, '.', 2)
+        AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+""")
+
+
+# ==================================
+# BATCH CATALOG LOOKUP
+# ==================================
+
+def invalidate(*table_names: str):
+    """
+    Drops cached catalog answers for `table_names`
+    (every table when called without arguments).
+
+    Call after writing, truncating or altering a table.
+    """
+
+    with _cache_lock:
+        if not table_names:
+            _cache.clear()
+        for name in table_names:
+            _cache.pop(name, None)
+
+
+def describe_tables(engine, table_names: list[str], check_rows: bool = False) -> dict:
+    """
+    Returns {table: {"exists", "columns", "has_rows"}} for
+    `table_names`, querying only tables not answered by the cache.
+
+    has_rows is None when it was not checked.
+    """
+
+    now = time.monotonic()
+    info, missing = {}, []
+
+    with _cache_lock:
+        for name in dict.fromkeys(table_names):
+            cached = _cache.get(name)
+            if (
+                cached is not None
+                and cached[0] > now
+                and (not check_rows or cached[1]["has_rows"])
+            ):
+                info[name] = cached[1]
+            else:
+                missing.append(name)
+
+    if missing:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                CATALOG_QUERY,
+                {"tables": missing, "check_rows": check_rows},
+            ).fetchall()
+
+        with _cache_lock:
+            for name, exists, columns, has_rows in rows:
+                info[name] = {
+                    "exists": exists,
+                    "columns": set(columns),
+                    "has_rows": has_rows,
+                }
+                # Negative answers are never cached
+                if exists:
+                    previous = _cache.get(name)
+                    if has_rows is None and previous and previous[0] > now:
+                        info[name]["has_rows"] = previous[1]["has_rows"]
+                    _cache[name] = (now + CACHE_TTL_SECONDS, info[name])
+
+    return info
+
+
+# ==================================
+# TABLE VERSIONS
+# ==================================
+
+def table_versions(conn, table_names: list[str]) -> dict:
+    """
+    Returns {table: version} from meta.table_changes.
+
+    A version is bumped by every committed write to the table,
+    so equal versions mean the table is unchanged. Tables that
+    were never written report 0.
+    """
+
+    rows = conn.execute(
+        text("""
+            SELECT t.name, COALESCE(MAX(c.id), 0)
+            FROM unnest(CAST(:tables AS TEXT[])) AS t(name)
+            LEFT JOIN meta.table_changes c
+                ON c.table_name = t.name
+            GROUP BY t.name
+        """),
+        {"tables": list(table_names)},
+    ).fetchall()
+
+    return {name: version for name, version in rows}
@@ -1,21 +1,27 @@
 # ----------------------------------
 # Imports
 # ----------------------------------
+import csv
 import os
-from sqlalchemy import create_engine, text
-import streamlit as st
-from pathlib import Path
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
 
 
 # ==================================
 # DATABASE ENGINE
 # ==================================
 
-@st.cache_resource
-def get_engine():
+def create_db_engine(**engine_kwargs):
     """
-    Returns a cached SQLAlchemy engine
-    using environment variables.
+    Builds a new SQLAlchemy engine from environment variables.
+
+    Plain factory with no caching and no Streamlit dependency,
+    so CLI and batch jobs can create their own engines.
     """
 
     user = os.getenv("POSTGRES_USER")
@@ -33,134 +39,428 @@ def get_engine():
         f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db}"
     )
 
-    return create_engine(connection_string)
+    return create_engine(connection_string, **engine_kwargs)
 
 
 # ==================================
-# SQL DIRECTORY CONFIGURATION
+# ENGINE PROFILES
 # ==================================
-
-# This path assumes docker-compose mounts:
-#   ./sql  →  /sql
 #
-# Both:
-#   - Postgres container (bootstrap)
-#   - Streamlit container (runtime repair)
-# share the same SQL source of truth.
-SQL_DIR = Path("/sql")
+# One pool per workload, so a 4-thread COPY ingest or a
+# partitioned gold build cannot starve UI queries (and the
+# other way round).
+#
+#   ui         Streamlit pages: small pool, fail fast, and a
+#              statement timeout so a runaway query cannot
+#              pin a connection.
+#   bulk       COPY ingest: sized for the ingest thread pools,
+#              no statement timeout.
+#   transform  Long INSERT ... SELECT / rebuild steps and
+#              full-table checks, no statement timeout.
+#
+# statement_timeout_ms = 0 disables the timeout.
+# Pool sizes can be overridden with DB_<PROFILE>_POOL_SIZE.
+#
+ENGINE_PROFILES = {
+    "ui": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "statement_timeout_ms": 60_000,
+    },
+    "bulk": {
+        "pool_size": 8,
+        "max_overflow": 4,
+        "pool_timeout": 120,
+        "statement_timeout_ms": 0,
+    },
+    "transform": {
+        "pool_size": 4,
+        "max_overflow": 4,
+        "pool_timeout": 300,
+        "statement_timeout_ms": 0,
+    },
+}
 
+DEFAULT_PROFILE = "ui"
 
-# ==================================
-# OBJECT → SQL FILE MAPPING
-# ==================================
 
-"""
-Mapping between logical database objects and their
-corresponding SQL definition files.
-
-This allows:
-- Targeted recreation of missing tables/views
-- Self-healing during validation
-- No full database reset required
-- Single source of truth for schema definitions
-"""
-OBJECT_SQL_MAP = {
-    "bronze.weather_daily": "10_weather_daily.sql",
-    "bronze.stations": "11_bronze_stations.sql",
-    "bronze.us_accidents": "12_bronze_us_accidents.sql",
-    "silver.us_accidents": "20_us_accidents.sql",
-    "silver.stations": "21_silver_stations.sql",
-    "silver.weather_daily": "22_silver_weather_daily.sql",
-    "silver.accident_station_map": "23_silver_accident_station_map.sql",
-    "silver.weather_daily_pivot": "24_silver_weather_daily_pivot.sql",
-    "gold.accident_weather": "30_gold_accident_weather.sql",
-}
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait for a
+    connection (queueing plus connect and pre-ping).
+    """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_checked_out = 0
+
+    def connect(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+
+        waited = time.perf_counter() - t0
+
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+
+        return conn
+
+
+_engines: dict = {}
+_engine_lock = threading.Lock()
+
+
+def _profile_kwargs(profile: str) -> dict:
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown engine profile: {profile}. Known: {list(ENGINE_PROFILES)}")
+
+    settings = ENGINE_PROFILES[profile]
+    kwargs = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": int(os.getenv(f"DB_{profile.upper()}_POOL_SIZE", settings["pool_size"])),
+        "max_overflow": settings["max_overflow"],
+        "pool_timeout": settings["pool_timeout"],
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "connect_args": {"application_name": f"weather-accidents:{profile}"},
+    }
+
+    if settings["statement_timeout_ms"]:
+        kwargs["connect_args"]["options"] = (
+            f"-c statement_timeout={settings['statement_timeout_ms']}"
+        )
 
-# ==================================
-# RUN SINGLE SQL FILE
-# ==================================
+    return kwargs
+
+
+def get_engine(profile: str = DEFAULT_PROFILE):
+    """
+    Returns the process-wide SQLAlchemy engine for `profile`
+    (see ENGINE_PROFILES), created on first use.
+
+    Shared by Streamlit reruns and pipeline threads alike.
+    """
+
+    engine = _engines.get(profile)
+
+    if engine is None:
+        with _engine_lock:
+            engine = _engines.get(profile)
+            if engine is None:
+                engine = create_db_engine(**_profile_kwargs(profile))
+                _engines[profile] = engine
 
-def run_sql_file(filename: str):
+    return engine
+
+
+def all_engines() -> list:
+    """
+    Engines created so far in this process.
     """
-    Executes a single SQL file inside a transaction.
 
-    Used for:
-    - Recreating missing tables
-    - Recreating materialized views
-    - Repairing schema drift
+    return list(_engines.values())
 
-    Execution is wrapped in engine.begin()
-    so it runs inside a transaction.
+
+def pool_stats() -> dict:
+    """
+    Utilization and checkout-wait metrics per engine profile
+    created in this process.
     """
 
-    engine = get_engine()
-    file_path = SQL_DIR / filename
+    stats = {}
 
-    if not file_path.exists():
-        raise FileNotFoundError(
-            f"SQL file not found: {file_path}"
-        )
+    for profile, engine in list(_engines.items()):
+        pool = engine.pool
+        capacity = pool.size() + ENGINE_PROFILES[profile]["max_overflow"]
 
-    sql = file_path.read_text()
+        stats[profile] = {
+            "pool_size": pool.size(),
+            "max_overflow": ENGINE_PROFILES[profile]["max_overflow"],
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "utilization": round(pool.checkedout() / capacity, 2) if capacity else None,
+            "peak_checked_out": pool.peak_checked_out,
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "avg_wait_ms": (
+                round(1000 * pool.wait_seconds / pool.checkouts, 2)
+                if pool.checkouts else None
+            ),
+            "max_wait_ms": round(1000 * pool.max_wait_seconds, 2),
+        }
 
-    # Transactional execution
-    with engine.begin() as conn:
-        conn.execute(text(sql))
+    return stats
 
 
 # ==================================
-# ENSURE OBJECT EXISTS
+# COPY LOADER
 # ==================================
+#
+# Two ways to stream rows into Postgres:
+#
+#   "csv"     psycopg2 copy_expert, CSV text. The server
+#             parses every value. Works everywhere and is
+#             what the resilient (reject-file) path uses.
+#
+#   "binary"  psycopg 3 cursor.copy() in FORMAT BINARY with
+#             typed rows written by write_row. Values cross
+#             the wire in their internal representation, so
+#             the server skips text parsing; Python pays for
+#             the conversion instead. Needs the optional
+#             `psycopg` package and falls back to "csv" when
+#             it is not installed.
+#
+# Use `python -m pipeline bench-copy` to compare both on
+# real landing files before switching a load over.
+#
+COPY_FORMATS = ("csv", "binary")
+
+TRUE_VALUES = {"true", "t", "1", "yes", "y", "on"}
+FALSE_VALUES = {"false", "f", "0", "no", "n", "off"}
+
+
+def _to_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean: {value!r}")
+
+
+# Postgres type name → parser of its CSV text form
+CSV_CONVERTERS = {
+    "int2": int,
+    "int4": int,
+    "int8": int,
+    "float4": float,
+    "float8": float,
+    "numeric": Decimal,
+    "bool": _to_bool,
+    "date": date.fromisoformat,
+    "timestamp": datetime.fromisoformat,
+    "timestamptz": datetime.fromisoformat,
+}
+
+
+def binary_copy_available() -> bool:
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_copy_format(copy_format: str) -> str:
+    """
+    Validates `copy_format`, downgrading "binary" to "csv"
+    when psycopg 3 is not installed.
+    """
+
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"Unknown copy format: {copy_format}. Use one of {COPY_FORMATS}")
+
+    if copy_format == "binary" and not binary_copy_available():
+        from components.logger import get_logger
+        get_logger(__name__).warning("psycopg 3 not installed; using CSV COPY")
+        return "csv"
+
+    return copy_format
 
-def ensure_object_exists(object_name: str):
+
+@contextmanager
+def copy_connection(engine, copy_format: str = "csv"):
+    """
+    Yields a DBAPI connection able to run COPY in `copy_format`.
+
+    "csv" borrows a psycopg2 connection from the engine pool;
+    "binary" opens a dedicated psycopg 3 connection with the
+    same credentials. Either way the caller commits; the
+    connection is closed (rolling back anything uncommitted)
+    on exit.
     """
-    Ensures a specific database object exists.
 
-    Workflow:
-    1. Check if table exists.
-    2. If it exists → do nothing.
-    3. If missing → recreate using mapped SQL file.
+    if copy_format == "binary":
+        import psycopg
+
+        url = engine.url
+        conn = psycopg.connect(
+            host=url.host,
+            port=url.port,
+            dbname=url.database,
+            user=url.username,
+            password=url.password,
+        )
+    else:
+        conn = engine.raw_connection()
+
+    try:
+        yield conn
+    finally:
+        conn.close()
 
-    This function:
-    - Does NOT drop existing objects
-    - Does NOT validate contents
-    - Only repairs missing schema objects
 
-    Intended usage:
-        ensure_object_exists("silver.weather_daily")
+def _column_types(conn, table_name: str, columns: tuple[str, ...]) -> list[tuple[int, str]]:
     """
+    Returns [(type oid, type name)] for `columns` of `table_name`.
+    """
+
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT a.attname, t.oid::INT, t.typname
+            FROM pg_attribute a
+            JOIN pg_type t ON t.oid = a.atttypid
+            WHERE a.attrelid = CAST(%s AS REGCLASS)
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+            """,
+            (table_name,),
+        )
+        by_name = {name: (oid, typname) for name, oid, typname in cur.fetchall()}
+    finally:
+        cur.close()
 
-    engine = get_engine()
+    missing = [c for c in columns if c not in by_name]
+    if missing:
+        raise RuntimeError(f"{table_name} missing columns for COPY: {missing}")
 
-    # Expect format: schema.object
-    schema, name = object_name.split(".")
+    return [by_name[c] for c in columns]
 
-    # Check for existence using information_schema
-    query = text("""
-        SELECT EXISTS (
-            SELECT 1
-            FROM information_schema.tables
-            WHERE table_schema = :schema
-              AND table_name = :name
+
+def typed_rows(records, type_names: list[str]):
+    """
+    Converts CSV text records into typed tuples for binary COPY.
+
+    Empty fields become NULL, as with unquoted empties in
+    COPY CSV (a quoted "" into a text column also becomes
+    NULL here; the csv module cannot tell them apart).
+    """
+
+    converters = [CSV_CONVERTERS.get(t, str) for t in type_names]
+
+    for record in records:
+        yield tuple(
+            None if value == "" else convert(value)
+            for convert, value in zip(converters, record)
         )
-    """)
-
-    with engine.begin() as conn:
-        exists = conn.execute(
-            query,
-            {"schema": schema, "name": name}
-        ).scalar()
-
-    # If object already exists, nothing to do
-    if exists:
-        return
-
-    # If object missing but no SQL mapping found → fail clearly
-    if object_name not in OBJECT_SQL_MAP:
-        raise ValueError(
-            f"No SQL mapping found for {object_name}"
+
+
+def copy_rows(conn, table_name: str, columns: tuple[str, ...], rows) -> int:
+    """
+    Binary COPY of typed `rows` into `table_name` over a
+    psycopg 3 connection. Returns rows written.
+    """
+
+    types = _column_types(conn, table_name, columns)
+    count = 0
+
+    with conn.cursor() as cur:
+        with cur.copy(
+            f"COPY {table_name} ({', '.join(columns)}) FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            copy.set_types([oid for oid, _ in types])
+
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+
+    return count
+
+
+def copy_csv_stream(
+    conn,
+    table_name: str,
+    columns: tuple[str, ...],
+    stream,
+    copy_format: str = "csv",
+) -> int:
+    """
+    Loads a CSV text stream (with header) into `table_name`
+    over a copy_connection(). Returns rows written.
+
+    "csv" hands the stream to COPY as-is; "binary" parses
+    it into typed rows first (see typed_rows).
+    """
+
+    if copy_format == "binary":
+        reader = csv.reader(stream)
+        next(reader, None)
+
+        types = [name for _, name in _column_types(conn, table_name, columns)]
+        return copy_rows(conn, table_name, columns, typed_rows(reader, types))
+
+    cur = conn.cursor()
+    try:
+        cur.copy_expert(
+            f"""
+            COPY {table_name} ({", ".join(columns)})
+            FROM STDIN
+            WITH (FORMAT CSV, HEADER TRUE)
+            """,
+            stream,
         )
+        return cur.rowcount
+    finally:
+        cur.close()
+
+
+def benchmark_copy(engine, table_name: str, columns: tuple[str, ...], open_streams) -> dict:
+    """
+    Times CSV vs binary COPY of the same input.
+
+    Each format loads into a temporary copy of `table_name`
+    (same columns, no indexes) that is rolled back, so the
+    target table is untouched. `open_streams` is a callable
+    returning an iterable of CSV text streams; it is called
+    once per format.
+
+    Returns:
+        {format: {"rows", "seconds", "rows_per_second"}}
+    """
+
+    results = {}
+
+    for copy_format in COPY_FORMATS:
+        if copy_format == "binary" and not binary_copy_available():
+            results[copy_format] = {"skipped": "psycopg 3 not installed"}
+            continue
+
+        with copy_connection(engine, copy_format) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"CREATE TEMP TABLE copy_bench (LIKE {table_name} INCLUDING DEFAULTS)"
+            )
+            cur.close()
+
+            rows = 0
+            t0 = time.perf_counter()
+
+            for stream in open_streams():
+                rows += copy_csv_stream(conn, "copy_bench", columns, stream, copy_format)
+
+            elapsed = time.perf_counter() - t0
+            conn.rollback()
+
+        results[copy_format] = {
+            "rows": rows,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(rows / elapsed) if elapsed else None,
+        }
 
-    # Recreate object from SQL definition
-    run_sql_file(OBJECT_SQL_MAP[object_name])
+    return results
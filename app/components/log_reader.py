@@ -0,0 +1,211 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import json
+import os
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+# ==================================
+# DEFAULTS
+# ==================================
+BLOCK_SIZE = 64 * 1024
+
+# Backward scan budget when filtering, so a filter matching
+# nothing cannot read a multi-GB log end to end
+MAX_SCAN_BYTES = 32 * 1024 ** 2
+
+# Max bytes read per refresh; further behind than this the
+# cursor jumps to the end and re-tails instead
+MAX_READ_BYTES = 8 * 1024 ** 2
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Pre-JSON text lines: "ts | LEVEL | logger | message"
+TEXT_LINE = re.compile(r"^(?P<ts>[\d\- :]+) \| (?P<level>\w+) \| (?P<logger>[^|]+) \| (?P<msg>.*)$")
+
+
+# ==================================
+# PARSING / FILTERING
+# ==================================
+def parse_line(line: str) -> dict:
+    """
+    Parses one log line: a JSON record (components.logger)
+    or a legacy text line. Anything else (e.g. traceback
+    lines) becomes a bare message.
+    """
+
+    if line.startswith("{"):
+        try:
+            return json.loads(line)
+        except ValueError:
+            pass
+
+    match = TEXT_LINE.match(line)
+    if match:
+        return {**match.groupdict(), "logger": match["logger"].strip()}
+
+    return {"msg": line}
+
+
+def format_entry(entry: dict) -> str:
+    """
+    Renders a parsed record as one text line (plus traceback).
+    """
+
+    if "level" not in entry:
+        return entry["msg"]
+
+    text = f"{entry.get('ts', '')} | {entry['level']} | {entry.get('logger', '')} | {entry['msg']}"
+
+    context = " ".join(f"{key}={entry[key]}" for key in ("run_id", "step") if key in entry)
+    if context:
+        text += f"  [{context}]"
+    if "exc" in entry:
+        text += "\n" + entry["exc"]
+
+    return text
+
+
+@dataclass(frozen=True)
+class LogFilter:
+    """
+    min_level: Lowest level shown (e.g. "WARNING").
+    module:    Substring of the logger name (e.g. "weather").
+    run_id:    Only records logged during this pipeline run.
+    """
+
+    min_level: str = "DEBUG"
+    module: str = ""
+    run_id: int | None = None
+
+    def matches(self, entry: dict) -> bool:
+        level = entry.get("level")
+
+        # Continuation lines of legacy tracebacks only
+        # pass an unfiltered view
+        if level is None:
+            return self == LogFilter()
+
+        if level in LEVELS and LEVELS.index(level) < LEVELS.index(self.min_level):
+            return False
+        if self.module and self.module not in entry.get("logger", ""):
+            return False
+        if self.run_id is not None and entry.get("run_id") != self.run_id:
+            return False
+
+        return True
+
+
+# ==================================
+# CURSOR
+# ==================================
+@dataclass
+class LogCursor:
+    """
+    Position in a log file plus the last `limit` matching
+    entries. Keep one per viewer (e.g. in session state) and
+    refresh() it: only bytes appended since the last call
+    are read.
+    """
+
+    path: Path
+    log_filter: LogFilter = LogFilter()
+    limit: int = 200
+    offset: int = 0
+    inode: int | None = None
+    entries: deque = field(default_factory=deque)
+    bytes_read: int = 0
+
+
+def _parse_chunk(data: bytes, log_filter: LogFilter) -> list[dict]:
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return [e for e in map(parse_line, lines) if log_filter.matches(e)]
+
+
+def tail(path: Path, log_filter: LogFilter = LogFilter(), limit: int = 200) -> LogCursor:
+    """
+    Reads the last `limit` matching entries by scanning
+    backwards from the end of `path` in blocks.
+    """
+
+    cursor = LogCursor(path, log_filter, limit, entries=deque(maxlen=limit))
+
+    if not path.exists():
+        return cursor
+
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        end = stat.st_size
+
+        # Stop at the last complete line; a partial one is
+        # still being written and is picked up by refresh()
+        f.seek(max(0, end - BLOCK_SIZE))
+        last_block = f.read(end - f.tell())
+        end -= len(last_block) - (last_block.rfind(b"\n") + 1)
+
+        found, pos, partial = [], end, b""
+
+        while pos > 0 and len(found) < limit and end - pos < MAX_SCAN_BYTES:
+            size = min(BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size) + partial
+
+            # The first line of the block may continue further back
+            if pos > 0:
+                newline = block.find(b"\n")
+                if newline == -1:
+                    partial, block = block, b""
+                else:
+                    partial, block = block[: newline + 1], block[newline + 1:]
+
+            found = _parse_chunk(block, log_filter) + found
+
+        cursor.bytes_read = end - pos
+
+    cursor.entries.extend(found[-limit:])
+    cursor.offset = end
+    cursor.inode = stat.st_ino
+
+    return cursor
+
+
+def refresh(cursor: LogCursor) -> LogCursor:
+    """
+    Appends entries written since the last read.
+
+    Re-tails instead when the file was rotated or truncated,
+    or when it grew by more than MAX_READ_BYTES.
+    """
+
+    try:
+        stat = cursor.path.stat()
+    except FileNotFoundError:
+        return tail(cursor.path, cursor.log_filter, cursor.limit)
+
+    if (
+        stat.st_ino != cursor.inode
+        or stat.st_size < cursor.offset
+        or stat.st_size - cursor.offset > MAX_READ_BYTES
+    ):
+        return tail(cursor.path, cursor.log_filter, cursor.limit)
+
+    if stat.st_size == cursor.offset:
+        cursor.bytes_read = 0
+        return cursor
+
+    with open(cursor.path, "rb") as f:
+        f.seek(cursor.offset)
+        data = f.read(stat.st_size - cursor.offset)
+
+    complete = data[: data.rfind(b"\n") + 1]
+
+    cursor.entries.extend(_parse_chunk(complete, cursor.log_filter))
+    cursor.offset += len(complete)
+    cursor.bytes_read = len(complete)
+
+    return cursor
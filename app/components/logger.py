@@ -1,8 +1,18 @@
 # ----------------------------------
 # Imports
 # ----------------------------------
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 
@@ -17,18 +27,246 @@ from pathlib import Path
 #   Runs relative to project root
 #
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 LOG_FILE = LOG_DIR / "pipeline.log"
 
 
+# ----------------------------------
+# Settings
+# ----------------------------------
+# Size-based rotation by default; LOG_ROTATE_WHEN (e.g.
+# "midnight", "H") switches to time-based rotation.
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 20 * 1024 ** 2))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", 5))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN")
+
+# Records waiting for the writer thread. When full, INFO and
+# DEBUG records are dropped (and counted) instead of blocking.
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10_000))
+
+# Max records per rate_key per minute (per-file messages)
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", 20))
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+# Structured fields copied into each JSON record when set,
+# either by log_context() or per call via extra={...}
+CONTEXT_FIELDS = ("run_id", "step", "rows", "seconds", "suppressed")
+
+_context = contextvars.ContextVar("log_context", default={})
+
+_handler = None
+_handler_lock = threading.Lock()
+
+
+# ==================================
+# CONTEXT
+# ==================================
+@contextmanager
+def log_context(**fields):
+    """
+    Attaches fields (e.g. run_id, step) to every record logged
+    on this thread, and on worker threads started with
+    contextvars.copy_context(), until the block exits.
+    """
+
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class _ContextFilter(logging.Filter):
+    """
+    Copies log_context() fields onto the record. Runs on the
+    calling thread, before the record crosses the queue.
+    """
+
+    def filter(self, record):
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class _RateLimitFilter(logging.Filter):
+    """
+    Lets at most `per_minute` INFO / DEBUG records through per
+    rate_key. WARNING and above always pass, so every failure
+    stays in the log.
+
+    Usage:
+        logger.info(f"Loaded {file.name}", extra={"rate_key": "weather.ingest"})
+
+    The next record let through reports how many were
+    suppressed in between.
+    """
+
+    def __init__(self, per_minute: int):
+        super().__init__()
+        self.per_minute = per_minute
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "rate_key", None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+
+        with self._lock:
+            # [window start, passed in window, suppressed since last pass]
+            window = self._windows.setdefault(key, [now, 0, 0])
+
+            if now - window[0] >= 60:
+                window[0], window[1] = now, 0
+
+            if window[1] >= self.per_minute:
+                window[2] += 1
+                return False
+
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed:,} similar suppressed)"
+            record.args = None
+            record.suppressed = suppressed
+
+        return True
+
+
+# ==================================
+# FORMATTERS / HANDLERS
+# ==================================
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, msg and
+    any CONTEXT_FIELDS present on the record.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Never blocks the caller on INFO/DEBUG: when the queue is
+    full those records are dropped and counted. WARNING and
+    above wait for room so errors are never lost.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Render args and traceback here: they may not survive
+        # the hop to the listener thread. The traceback stays
+        # separate (exc_text) so the JSON formatter can keep it.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record):
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler() -> logging.Handler:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+    if LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def _queue_handler() -> logging.Handler:
+    """
+    Process-wide handler shared by every logger. A single
+    listener thread does the console and file I/O, so worker
+    threads only pay for a queue put.
+    """
+
+    global _handler
+
+    with _handler_lock:
+        if _handler is None:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+
+            handler = _QueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+            handler.addFilter(_ContextFilter())
+            handler.addFilter(_RateLimitFilter(LOG_RATE_LIMIT))
+
+            listener = logging.handlers.QueueListener(
+                handler.queue,
+                console_handler,
+                _file_handler(),
+                respect_handler_level=True,
+            )
+            listener.start()
+
+            # Flush queued records on interpreter exit
+            atexit.register(listener.stop)
+
+            _handler = handler
+
+    return _handler
+
+
+def dropped_records() -> int:
+    """
+    INFO/DEBUG records dropped because the queue was full.
+    """
+
+    return _handler.dropped if _handler is not None else 0
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Returns a configured logger instance.
 
     Features:
-    - Logs to stdout (Docker console)
-    - Logs to logs/pipeline.log
+    - Non-blocking: records go through a queue to one writer thread
+    - Logs to stdout (Docker console) as text
+    - Logs to logs/pipeline.log as JSON lines, rotated
     - Prevents duplicate handlers
     - Safe for repeated imports
     """
@@ -42,23 +280,6 @@ def get_logger(name: str) -> logging.Logger:
     logger.setLevel(logging.INFO)
     logger.propagate = False  # Prevent double logging
 
-    formatter = logging.Formatter(
-        fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # ----------------------------------
-    # Console Handler (Docker logs)
-    # ----------------------------------
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # ----------------------------------
-    # File Handler (Persistent logs)
-    # ----------------------------------
-    file_handler = logging.FileHandler(LOG_FILE)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(_queue_handler())
 
     return logger
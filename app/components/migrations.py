@@ -0,0 +1,462 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import hashlib
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from sqlalchemy import exc, text
+
+from components.catalog import invalidate
+from components.db import get_engine
+from components.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# SQL DIRECTORY CONFIGURATION
+# ==================================
+
+# docker-compose mounts ./sql at /sql in both containers:
+#   - Postgres: initdb bootstrap of a fresh volume
+#   - Streamlit / CLI: migrations at startup
+# Override with SQL_DIR when running outside Docker.
+SQL_DIR = Path(os.getenv("SQL_DIR", "/sql"))
+
+
+# ==================================
+# OBJECT → SQL FILE MAPPING
+# ==================================
+
+"""
+Objects each SQL file defines. After migrating, all of them
+are checked in one catalog query, and repair() re-applies the
+files of any that are missing.
+"""
+OBJECT_SQL_MAP = {
+    "bronze.weather_daily": "10_weather_daily.sql",
+    "bronze.stations": "11_bronze_stations.sql",
+    "bronze.us_accidents": "12_bronze_us_accidents.sql",
+    "bronze.weather_daily_wide": "13_bronze_weather_daily_wide.sql",
+    "silver.us_accidents": "20_us_accidents.sql",
+    "silver.stations": "21_silver_stations.sql",
+    "silver.weather_daily": "22_silver_weather_daily.sql",
+    "silver.accident_station_map": "23_silver_accident_station_map.sql",
+    "silver.weather_daily_pivot": "24_silver_weather_daily_pivot.sql",
+    "gold.accident_weather": "30_gold_accident_weather.sql",
+    "gold.rollup_accident_weather": "31_gold_accident_rollups.sql",
+    "gold.rollup_state_month_severity": "31_gold_accident_rollups.sql",
+    "gold.rollup_state_month": "31_gold_accident_rollups.sql",
+    "gold.rollup_retired_slices": "32_gold_rollup_retired_slices.sql",
+    "meta.watermarks": "40_meta_watermarks.sql",
+    "meta.pending_indexes": "41_meta_pending_indexes.sql",
+    "meta.table_changes": "42_meta_table_changes.sql",
+    "meta.step_fingerprints": "43_meta_step_fingerprints.sql",
+    "meta.pipeline_runs": "44_meta_pipeline_runs.sql",
+    "meta.step_runs": "44_meta_pipeline_runs.sql",
+    "meta.data_fixes": "45_meta_data_fixes.sql",
+}
+
+
+# ==================================
+# MIGRATION LEDGER
+# ==================================
+#
+# Every file in SQL_DIR is a migration, applied in file name
+# order. Files are written to be idempotent (IF NOT EXISTS,
+# ADD COLUMN IF NOT EXISTS), so an edited file is simply
+# applied again: its checksum no longer matches the ledger.
+#
+# A database bootstrapped by Postgres initdb has no ledger
+# yet; the first startup applies every file once to adopt it.
+#
+# One-shot data changes (resetting watermarks, backfills) do
+# not belong here: they live in pipeline.data_fixes, which
+# records each run in meta.data_fixes.
+#
+LEDGER_SQL = """
+CREATE SCHEMA IF NOT EXISTS meta;
+
+CREATE TABLE IF NOT EXISTS meta.schema_migrations (
+    version     TEXT PRIMARY KEY,
+    checksum    TEXT NOT NULL,
+    applied_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    seconds     DOUBLE PRECISION
+);
+"""
+
+# Serialises migrations across processes (Streamlit, CLI, cron)
+LOCK_SQL = "SELECT pg_advisory_lock(hashtext('meta.schema_migrations'))"
+UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtext('meta.schema_migrations'))"
+
+INDEX_PATTERN = re.compile(
+    r"^CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?!CONCURRENTLY)"
+    r"(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>\w+)\s+ON\s+(?:ONLY\s+)?(?P<table>[\w.]+)",
+    re.IGNORECASE,
+)
+
+# Set once this process has seen a current schema
+_schema_current = False
+_schema_lock = threading.Lock()
+
+
+@dataclass
+class Migration:
+    version: str
+    path: Path
+    checksum: str
+
+
+# ==================================
+# DISCOVERY
+# ==================================
+
+def discover(sql_dir: Path = SQL_DIR) -> list[Migration]:
+    """
+    Lists the migrations in `sql_dir`, in apply order.
+    """
+
+    if not sql_dir.exists():
+        raise FileNotFoundError(f"SQL directory not found: {sql_dir} (set SQL_DIR)")
+
+    return [
+        Migration(
+            version=path.name,
+            path=path,
+            checksum=hashlib.sha256(path.read_bytes()).hexdigest(),
+        )
+        for path in sorted(sql_dir.glob("*.sql"))
+    ]
+
+
+def applied_versions(engine) -> dict[str, str]:
+    """
+    Returns {version: checksum} from meta.schema_migrations,
+    or {} when the ledger does not exist yet.
+    """
+
+    try:
+        with engine.connect() as conn:
+            return dict(conn.execute(
+                text("SELECT version, checksum FROM meta.schema_migrations")
+            ).fetchall())
+    except exc.ProgrammingError:
+        return {}
+
+
+def pending(migrations: list[Migration], applied: dict[str, str]) -> list[Migration]:
+    """
+    Migrations that are new or whose file changed since applied.
+    """
+
+    return [m for m in migrations if applied.get(m.version) != m.checksum]
+
+
+def missing_objects(engine, names: list[str]) -> list[str]:
+    """
+    Returns the relations in `names` that do not exist,
+    in a single catalog query.
+    """
+
+    with engine.connect() as conn:
+        return [
+            row[0]
+            for row in conn.execute(
+                text("""
+                    SELECT name
+                    FROM unnest(CAST(:names AS TEXT[])) AS name
+                    WHERE to_regclass(name) IS NULL
+                """),
+                {"names": list(names)},
+            )
+        ]
+
+
+# ==================================
+# STATEMENT SPLITTING
+# ==================================
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Splits a SQL script on top-level semicolons, keeping
+    quoted strings, comments and $tag$ bodies intact.
+    """
+
+    statements, start, i, n = [], 0, 0, len(sql)
+
+    while i < n:
+        ch = sql[i]
+
+        if sql.startswith("--", i):
+            i = sql.find("\n", i)
+            i = n if i == -1 else i
+        elif sql.startswith("/*", i):
+            i = sql.find("*/", i + 2)
+            i = n if i == -1 else i + 2
+            continue
+        elif ch in ("'", '"'):
+            end = sql.find(ch, i + 1)
+            while end != -1 and sql.startswith(ch * 2, end):
+                end = sql.find(ch, end + 2)
+            i = n if end == -1 else end
+        elif ch == "$":
+            tag = re.match(r"\$\w*\$", sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                i = n if end == -1 else end + len(tag.group(0))
+                continue
+        elif ch == ";":
+            statements.append(sql[start:i])
+            start = i + 1
+
+        i += 1
+
+    statements.append(sql[start:])
+
+    return [s.strip() for s in statements if _strip_comments(s)]
+
+
+def _strip_comments(statement: str) -> str:
+    return re.sub(r"^(\s*--[^\n]*\n?)+", "", statement).strip()
+
+
+# ==================================
+# APPLY
+# ==================================
+
+@contextmanager
+def _migration_lock(engine):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(LOCK_SQL))
+        try:
+            yield
+        finally:
+            conn.execute(text(UNLOCK_SQL))
+
+
+def _build_index(engine, statement: str):
+    """
+    Builds an index CONCURRENTLY so writers are not blocked.
+    Falls back to a plain build where Postgres cannot build
+    concurrently (partitioned parents).
+    """
+
+    statement = _strip_comments(statement)
+    match = INDEX_PATTERN.match(statement)
+    concurrent = re.sub(r"INDEX\s+", "INDEX CONCURRENTLY ", statement, count=1, flags=re.IGNORECASE)
+    schema = match.group("table").rpartition(".")[0] or "public"
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            conn.execute(text(concurrent))
+
+        except exc.NotSupportedError:
+            conn.execute(text(statement))
+
+        except Exception:
+            # A failed concurrent build leaves an INVALID index
+            # that IF NOT EXISTS would then silently accept
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {schema}.{match.group('name')}"))
+            raise
+
+
+def apply_migration(engine, migration: Migration) -> float:
+    """
+    Applies one migration file and records it in the ledger.
+
+    Statements run in file order. CREATE INDEX statements run
+    CONCURRENTLY, outside any transaction; the statements
+    between two index builds run together in one transaction.
+    Returns the seconds taken.
+    """
+
+    t0 = time.perf_counter()
+
+    batch = []
+
+    def flush():
+        if batch:
+            with engine.begin() as conn:
+                for statement in batch:
+                    conn.execute(text(statement))
+            batch.clear()
+
+    for statement in split_statements(migration.path.read_text()):
+        if INDEX_PATTERN.match(_strip_comments(statement)):
+            flush()
+            _build_index(engine, statement)
+        else:
+            batch.append(statement)
+
+    flush()
+
+    elapsed = time.perf_counter() - t0
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO meta.schema_migrations (version, checksum, seconds)
+                VALUES (:version, :checksum, :seconds)
+                ON CONFLICT (version) DO UPDATE
+                SET checksum = EXCLUDED.checksum,
+                    applied_at = now(),
+                    seconds = EXCLUDED.seconds
+            """),
+            {"version": migration.version, "checksum": migration.checksum, "seconds": round(elapsed, 3)},
+        )
+
+    logger.info(f"Applied migration {migration.version} in {elapsed:.2f} seconds")
+
+    return elapsed
+
+
+def migrate(engine=None) -> dict:
+    """
+    Applies pending migrations under a cross-process lock,
+    then checks every mapped object exists (one query).
+
+    Returns:
+        dict with the applied versions and seconds.
+    """
+
+    engine = engine or get_engine("transform")
+    t0 = time.perf_counter()
+
+    with _migration_lock(engine):
+        # Another process may have migrated while we waited
+        todo = pending(discover(), applied_versions(engine))
+        applied = []
+
+        if todo:
+            with engine.begin() as conn:
+                conn.execute(text(LEDGER_SQL))
+
+        for migration in todo:
+            apply_migration(engine, migration)
+            applied.append(migration.version)
+
+    missing = missing_objects(engine, list(OBJECT_SQL_MAP))
+    if missing:
+        raise RuntimeError(f"Schema objects missing after migrations: {missing}")
+
+    if applied:
+        invalidate()
+
+    return {
+        "applied": applied,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def ensure_schema(engine=None) -> dict:
+    """
+    Startup hook: migrates only when something is pending.
+
+    A current schema costs one ledger query per process and
+    no catalog lookups; later calls return immediately.
+    """
+
+    global _schema_current
+
+    if _schema_current:
+        return {"applied": [], "seconds": 0.0}
+
+    with _schema_lock:
+        if _schema_current:
+            return {"applied": [], "seconds": 0.0}
+
+        engine = engine or get_engine("transform")
+        t0 = time.perf_counter()
+
+        if pending(discover(), applied_versions(engine)):
+            result = migrate(engine)
+        else:
+            result = {"applied": [], "seconds": round(time.perf_counter() - t0, 2)}
+
+        _schema_current = True
+
+    return result
+
+
+# ==================================
+# STATUS / REPAIR
+# ==================================
+
+def status(engine=None) -> list[dict]:
+    """
+    One row per migration file: applied, pending or changed.
+    """
+
+    engine = engine or get_engine("transform")
+    applied = applied_versions(engine)
+
+    return [
+        {
+            "version": m.version,
+            "status": (
+                "pending" if m.version not in applied
+                else "applied" if applied[m.version] == m.checksum
+                else "changed"
+            ),
+        }
+        for m in discover()
+    ]
+
+
+def repair(engine=None) -> dict:
+    """
+    Re-applies the files of mapped objects that are missing
+    (e.g. a table dropped by hand). Never drops anything.
+    """
+
+    engine = engine or get_engine("transform")
+    t0 = time.perf_counter()
+
+    missing = missing_objects(engine, list(OBJECT_SQL_MAP))
+    files = sorted({OBJECT_SQL_MAP[name] for name in missing})
+
+    by_version = {m.version: m for m in discover()}
+
+    with _migration_lock(engine):
+        with engine.begin() as conn:
+            conn.execute(text(LEDGER_SQL))
+
+        for filename in files:
+            apply_migration(engine, by_version[filename])
+
+    if files:
+        invalidate(*missing)
+
+    return {
+        "missing": missing,
+        "reapplied": files,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+# ==================================
+# INIT.SQL
+# ==================================
+
+def render_init_sql(sql_dir: Path = SQL_DIR) -> str:
+    """
+    Concatenates the migrations into a single bootstrap
+    script, so init.sql is generated and cannot drift.
+    """
+
+    parts = [
+        "-- ============================================================\n"
+        "-- GENERATED from sql/*.sql by `python -m pipeline migrate --write-init`.\n"
+        "-- Do not edit by hand: change the files in sql/ instead.\n"
+        "-- ============================================================\n"
+    ]
+
+    for migration in discover(sql_dir):
+        parts.append(f"\n-- >>> {migration.version}\n\n{migration.path.read_text().rstrip()}\n")
+
+    return "".join(parts)
@@ -0,0 +1,378 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from components.catalog import table_versions
+from components.db import copy_connection, get_engine
+from components.logger import get_logger
+from components.migrations import split_statements
+
+logger = get_logger(__name__)
+
+
+# ----------------------------------
+# Settings
+# ----------------------------------
+PAGE_SIZES = (10, 50, 100, 500, 1000)
+MAX_PAGE_SIZE = PAGE_SIZES[-1]
+
+# Pages kept in memory across reruns and sessions (LRU).
+# Keys include the versions of every table the query reads,
+# so a write to any of them retires its pages; the TTL covers
+# tables without a version trigger.
+PAGE_CACHE_SIZE = 64
+PAGE_CACHE_TTL_SECONDS = 300
+
+# Full-result CSV exports (gzip), streamed by COPY ... TO STDOUT.
+# Kept under Streamlit's static folder (.streamlit/config.toml),
+# so downloads stream from disk through EXPORT_URL instead of
+# passing through the Streamlit process.
+EXPORT_DIR = Path(os.getenv("QUERY_EXPORT_DIR", "static/exports"))
+EXPORT_URL = os.getenv("QUERY_EXPORT_URL", "app/static/exports")
+
+# Exports (and abandoned .tmp files) older than this are deleted
+EXPORT_TTL_SECONDS = int(os.getenv("QUERY_EXPORT_TTL_HOURS", 6)) * 3600
+
+READ_KEYWORDS = ("SELECT", "WITH", "VALUES", "TABLE")
+
+TABLE_REFERENCE = re.compile(r"\b(bronze|silver|gold|meta)\.(\w+)\b", re.IGNORECASE)
+
+# Keyset paging re-orders the query by its key, so it is only
+# used when the query has no ordering or row limits of its own
+KEYSET_BLOCKERS = re.compile(
+    r"\b(ORDER\s+BY|LIMIT|OFFSET|FETCH|GROUP\s+BY|DISTINCT|UNION|INTERSECT|EXCEPT)\b",
+    re.IGNORECASE,
+)
+
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+_primary_keys: dict[str, list[str]] = {}
+
+
+@dataclass
+class Page:
+    """
+    One page of a query result.
+
+    strategy: "keyset" (WHERE key > last key, index-friendly)
+              or "cursor" (server-side cursor, earlier pages
+              skipped on the server connection, never held
+              in memory).
+    next_key: Key of the last row, where the next keyset page starts.
+    """
+
+    rows: pd.DataFrame
+    number: int
+    page_size: int
+    has_next: bool
+    strategy: str
+    next_key: tuple | None = None
+    seconds: float = 0.0
+    cached: bool = False
+
+
+# ==================================
+# QUERY INSPECTION
+# ==================================
+def read_query(sql: str) -> str | None:
+    """
+    Returns `sql` as a single read statement (no trailing
+    semicolon), or None for anything else (DML, DDL, scripts).
+    """
+
+    statements = split_statements(sql)
+    if len(statements) != 1:
+        return None
+
+    body = re.sub(r"^(\s*--[^\n]*\n?)+", "", statements[0]).strip()
+    first = body.split(None, 1)[0].upper() if body else ""
+
+    return body if first in READ_KEYWORDS else None
+
+
+def referenced_tables(sql: str) -> list[str]:
+    """
+    Pipeline tables named in `sql` (schema-qualified).
+    """
+
+    return sorted({f"{s}.{t}".lower() for s, t in TABLE_REFERENCE.findall(sql)})
+
+
+def is_table_read(query: str, table: str) -> bool:
+    """
+    True for a plain read of `table` alone (SELECT * / TABLE,
+    optional WHERE): every output row is one table row, so its
+    primary key is unique in the result.
+    """
+
+    pattern = rf"(SELECT\s+\*\s+FROM|TABLE)\s+{re.escape(table)}(\s+WHERE\s.*)?"
+
+    return (
+        re.fullmatch(pattern, query.strip(), re.IGNORECASE | re.DOTALL) is not None
+        and not KEYSET_BLOCKERS.search(query)
+    )
+
+
+def primary_key(engine, table: str) -> list[str]:
+    """
+    Primary key columns of `table`, in index order ([] if none).
+    """
+
+    if table not in _primary_keys:
+        with engine.connect() as conn:
+            _primary_keys[table] = list(conn.execute(
+                text("""
+                    SELECT a.attname
+                    FROM pg_index i
+                    JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, position) ON true
+                    JOIN pg_attribute a
+                        ON a.attrelid = i.indrelid
+                        AND a.attnum = k.attnum
+                    WHERE i.indrelid = to_regclass(:table)
+                      AND i.indisprimary
+                    ORDER BY k.position
+                """),
+                {"table": table},
+            ).scalars())
+
+    return _primary_keys[table]
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+# ==================================
+# PAGE FETCHING
+# ==================================
+def _fetch_keyset(conn, query: str, key_columns: list[str], after: tuple | None, page_size: int):
+    keys = ", ".join(_quote(c) for c in key_columns)
+    params = {"limit": page_size + 1}
+    where = ""
+
+    if after is not None:
+        placeholders = ", ".join(f":k{i}" for i in range(len(key_columns)))
+        where = f"WHERE ({keys}) > ({placeholders})"
+        params.update({f"k{i}": value for i, value in enumerate(after)})
+
+    result = conn.execute(
+        text(f"SELECT * FROM ({query}) AS q {where} ORDER BY {keys} LIMIT :limit"),
+        params,
+    )
+
+    return list(result.keys()), result.fetchall()
+
+
+def _fetch_cursor(conn, query: str, offset: int, page_size: int):
+    # Server-side cursor: rows before the page are fetched and
+    # dropped in page-sized batches, so memory stays bounded
+    result = conn.execution_options(
+        stream_results=True,
+        max_row_buffer=page_size + 1,
+    ).execute(text(query))
+
+    skipped = 0
+    while skipped < offset:
+        batch = result.fetchmany(min(page_size, offset - skipped))
+        if not batch:
+            break
+        skipped += len(batch)
+
+    rows = result.fetchmany(page_size + 1)
+    columns = list(result.keys())
+    result.close()
+
+    return columns, rows
+
+
+def _cache_key(query: str, page_size: int, keyset, versions: dict, number: int, after) -> str:
+    return hashlib.sha256(
+        json.dumps([query, page_size, keyset, versions, number, after], default=str).encode()
+    ).hexdigest()
+
+
+def fetch_page(
+    sql: str,
+    number: int = 0,
+    page_size: int = 100,
+    table: str | None = None,
+    after: tuple | None = None,
+) -> Page:
+    """
+    Fetches page `number` (0-based) of a read query, at most
+    `page_size` rows, without ever materializing the full result.
+
+    A plain read of `table` (see is_table_read) is paged by
+    keyset on its primary key; any other query (joins, column
+    lists, ordering) by a server-side cursor.
+
+    Keyset pages after the first start at `after`, the previous
+    page's next_key; callers keep it (e.g. in session state).
+    Without it the page falls back to the cursor. Pages are cached
+    by query text, page size and the versions of the tables the
+    query reads (meta.table_changes).
+    """
+
+    query = read_query(sql)
+    if query is None:
+        raise ValueError("Only single SELECT / WITH / VALUES / TABLE queries can be paged")
+
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    engine = get_engine()
+
+    keyset = primary_key(engine, table) if table and is_table_read(query, table) else []
+
+    # Keyset pages past the first need the previous page's key
+    if number == 0 or not keyset:
+        after = None
+    elif after is None:
+        keyset = []
+
+    with engine.connect() as conn:
+        versions = table_versions(conn, referenced_tables(query))
+
+    key = _cache_key(query, page_size, keyset, versions, number, after)
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and time.monotonic() - entry[0] < PAGE_CACHE_TTL_SECONDS:
+            _cache.move_to_end(key)
+            return replace(entry[1], cached=True)
+
+    t0 = time.perf_counter()
+
+    with engine.connect() as conn:
+        conn.execute(text("SET TRANSACTION READ ONLY"))
+
+        if keyset:
+            columns, rows = _fetch_keyset(conn, query, keyset, after, page_size)
+        else:
+            columns, rows = _fetch_cursor(conn, query, number * page_size, page_size)
+
+    page_rows = rows[:page_size]
+
+    page = Page(
+        rows=pd.DataFrame(page_rows, columns=columns),
+        number=number,
+        page_size=page_size,
+        has_next=len(rows) > page_size,
+        strategy="keyset" if keyset else "cursor",
+        next_key=(
+            tuple(page_rows[-1][columns.index(c)] for c in keyset)
+            if keyset and page_rows else None
+        ),
+        seconds=round(time.perf_counter() - t0, 2),
+    )
+
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), page)
+        _cache.move_to_end(key)
+        while len(_cache) > PAGE_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return page
+
+
+# ==================================
+# FULL RESULT EXPORT
+# ==================================
+def prune_exports(max_age_seconds: int = EXPORT_TTL_SECONDS) -> int:
+    """
+    Deletes exports (and leftover .tmp files) in EXPORT_DIR
+    older than `max_age_seconds`. Returns files deleted.
+    """
+
+    if not EXPORT_DIR.exists():
+        return 0
+
+    cutoff = time.time() - max_age_seconds
+    deleted = 0
+
+    for file in EXPORT_DIR.glob("query_*"):
+        try:
+            if file.stat().st_mtime < cutoff:
+                file.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            # Pruned concurrently by another session
+            pass
+
+    return deleted
+
+
+def export_csv(sql: str, path: Path | None = None) -> dict:
+    """
+    Streams the full result of a read query to a gzipped CSV
+    with COPY (...) TO STDOUT. Rows go straight from the
+    server to disk; memory use does not depend on result size.
+
+    Each export gets its own file name, so concurrent exports
+    of the same query never share a file. Exports older than
+    EXPORT_TTL_SECONDS are pruned first.
+
+    Returns:
+        dict with path, url (None outside EXPORT_DIR), rows,
+        bytes and seconds.
+    """
+
+    query = read_query(sql)
+    if query is None:
+        raise ValueError("Only single SELECT / WITH / VALUES / TABLE queries can be exported")
+
+    prune_exports()
+
+    if path is None:
+        digest = hashlib.sha256(query.encode()).hexdigest()[:12]
+        path = EXPORT_DIR / f"query_{digest}_{uuid.uuid4().hex[:8]}.csv.gz"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+    t0 = time.perf_counter()
+
+    # No statement timeout: a full export can run long
+    try:
+        with copy_connection(get_engine("transform")) as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SET TRANSACTION READ ONLY")
+                with gzip.open(tmp_path, "wb") as f:
+                    cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+                rows = cur.rowcount
+            finally:
+                cur.close()
+            conn.rollback()
+
+        tmp_path.replace(path)
+
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    elapsed = time.perf_counter() - t0
+
+    logger.info(f"Exported {rows:,} query rows to {path} in {elapsed:.2f} seconds")
+
+    served = path.parent.resolve() == EXPORT_DIR.resolve()
+
+    return {
+        "path": str(path),
+        "url": f"{EXPORT_URL}/{path.name}" if served else None,
+        "rows": rows,
+        "bytes": path.stat().st_size,
+        "seconds": round(elapsed, 2),
+    }
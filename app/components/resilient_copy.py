@@ -0,0 +1,218 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import csv
+import io
+from collections import deque
+from pathlib import Path
+
+from components.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# DEFAULTS
+# ==================================
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Longest a quoted record may run before its opening quote
+# is treated as stray (multi-line fields are short in
+# practice; a stray quote would otherwise swallow the file)
+MAX_RECORD_LINES = 100
+MAX_RECORD_BYTES = 1024 ** 2
+
+REJECT_COLUMNS = ["line_number", "reason", "raw_record"]
+
+
+# ==================================
+# RECORD SPLITTING
+# ==================================
+
+def iter_raw_records(
+    stream,
+    max_lines: int = MAX_RECORD_LINES,
+    max_bytes: int = MAX_RECORD_BYTES,
+):
+    """
+    Yields (line_number, raw_text) for every CSV record in `stream`.
+
+    A record ends at the first line break outside quotes
+    (an even number of quote characters so far, as in
+    Postgres' CSV parser); quoted fields may span lines. The
+    raw text is passed to COPY unchanged, so NULL vs
+    empty-string semantics are preserved exactly.
+
+    A record still open after `max_lines` lines or
+    `max_bytes` characters (a stray quote) is cut back to its
+    first physical line, which COPY then rejects, and the
+    following lines are scanned again as new records. One
+    bad quote therefore costs one line, not the rest of the file.
+    """
+
+    lines = enumerate(stream, 1)
+    pending = deque()
+    record, quotes, size = [], 0, 0
+
+    while True:
+        if pending:
+            item = pending.popleft()
+        else:
+            item = next(lines, None)
+
+        if item is not None:
+            record.append(item)
+            quotes += item[1].count('"')
+            size += len(item[1])
+
+            if quotes % 2 == 0:
+                yield record[0][0], "".join(line for _, line in record)
+                record, quotes, size = [], 0, 0
+                continue
+
+            if len(record) <= max_lines and size <= max_bytes:
+                continue
+
+        elif not record:
+            return
+
+        # Runaway (or unterminated at end of file)
+        yield record[0]
+        pending.extendleft(reversed(record[1:]))
+        record, quotes, size = [], 0, 0
+
+
+# ==================================
+# REJECT FILE
+# ==================================
+
+class RejectWriter:
+    """
+    Lazily-created per-file reject log.
+
+    The file is only created on the first rejected row,
+    so clean loads leave nothing behind.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, line_number: int, reason: str, raw: str):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(REJECT_COLUMNS)
+
+        self._writer.writerow([line_number, reason, raw.rstrip("\r\n")])
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+# ==================================
+# RESILIENT COPY
+# ==================================
+
+def copy_csv_resilient(
+    raw_conn,
+    table_name: str,
+    columns: list[str] | tuple[str, ...],
+    stream,
+    reject_path: Path,
+    header: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> dict:
+    """
+    COPY a CSV stream into `table_name`, diverting bad rows.
+
+    The stream is loaded in chunks of `chunk_rows` records,
+    each under its own SAVEPOINT. A chunk that fails is
+    rolled back and bisected until the offending records
+    are isolated; those go to `reject_path` with their
+    source line number and the Postgres error, and the
+    rest of the chunk is loaded.
+
+    Does NOT commit. The caller owns the transaction, so
+    accepted rows commit (or roll back) together.
+
+    Returns:
+        dict with accepted / rejected counts and the reject
+        file path (None if every row loaded).
+    """
+
+    copy_sql = (
+        f"COPY {table_name} ({', '.join(columns)}) "
+        f"FROM STDIN WITH (FORMAT CSV)"
+    )
+
+    cur = raw_conn.cursor()
+    rejects = RejectWriter(reject_path)
+    accepted = 0
+
+    def copy_chunk(records: list[tuple[int, str]]) -> int:
+        """
+        Loads `records`, bisecting on failure.
+        Returns rows accepted.
+        """
+
+        cur.execute("SAVEPOINT resilient_copy")
+
+        try:
+            cur.copy_expert(
+                copy_sql,
+                io.StringIO("".join(raw for _, raw in records)),
+            )
+            cur.execute("RELEASE SAVEPOINT resilient_copy")
+            return len(records)
+
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT resilient_copy")
+            cur.execute("RELEASE SAVEPOINT resilient_copy")
+
+            if len(records) == 1:
+                line_number, raw = records[0]
+                reason = (getattr(e, "pgerror", None) or str(e)).strip()
+                rejects.write(line_number, reason, raw)
+                return 0
+
+            mid = len(records) // 2
+            return copy_chunk(records[:mid]) + copy_chunk(records[mid:])
+
+    try:
+        records = iter_raw_records(stream)
+
+        if header:
+            next(records, None)
+
+        chunk = []
+        for record in records:
+            chunk.append(record)
+
+            if len(chunk) >= chunk_rows:
+                accepted += copy_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            accepted += copy_chunk(chunk)
+
+    finally:
+        rejects.close()
+        cur.close()
+
+    if rejects.count:
+        logger.warning(
+            f"{table_name}: rejected {rejects.count:,} row(s) "
+            f"→ {reject_path}"
+        )
+
+    return {
+        "accepted": accepted,
+        "rejected": rejects.count,
+        "reject_file": str(reject_path) if rejects.count else None,
+    }
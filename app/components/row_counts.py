@@ -0,0 +1,201 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+from components.catalog import table_versions
+from components.db import get_engine
+from components.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ----------------------------------
+# Settings
+# ----------------------------------
+# Tables estimated at or below this are counted exactly
+# inline; the scan is cheaper than a background round trip.
+EXACT_INLINE_ROWS = 50_000
+
+# Tables without a meta.table_changes trigger always report
+# version 0; their exact counts are trusted for this long.
+UNVERSIONED_TTL_SECONDS = 300
+
+# Matches pipeline.quality.ROWS_PER_PAGE_GUESS for never-analyzed tables
+ROWS_PER_PAGE_GUESS = 50
+
+# Exact counts: {table: {"version", "rows", "counted_at", "seconds"}}
+_exact: dict[str, dict] = {}
+_running: dict[str, object] = {}
+_lock = threading.Lock()
+
+# Few workers: each one is a full scan
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="row-count")
+
+# One catalog round trip, partition-aware.
+#
+# - n_live_tup (statistics collector) follows every write;
+#   reltuples only moves on VACUUM / ANALYZE.
+# - reltuples = -1 means never analyzed: fall back to pages.
+ESTIMATE_QUERY = text("""
+    WITH rels AS (
+        SELECT c.oid, c.reltuples
+        FROM pg_class c
+        WHERE c.oid = CAST(:table AS REGCLASS)
+           OR c.oid IN (
+               SELECT inhrelid
+               FROM pg_inherits
+               WHERE inhparent = CAST(:table AS REGCLASS)
+           )
+    )
+    SELECT
+        SUM(s.n_live_tup) AS live_rows,
+        SUM(s.n_mod_since_analyze) AS modified,
+        MAX(GREATEST(s.last_analyze, s.last_autoanalyze)) AS analyzed_at,
+        SUM(CASE
+                WHEN r.reltuples >= 0 THEN r.reltuples
+                ELSE pg_relation_size(r.oid) / current_setting('block_size')::INT
+                     * :rows_per_page
+            END) AS catalog_rows,
+        BOOL_OR(GREATEST(s.last_analyze, s.last_autoanalyze,
+                         s.last_vacuum, s.last_autovacuum) IS NOT NULL
+                OR s.n_tup_ins > 0) AS has_stats
+    FROM rels r
+    LEFT JOIN pg_stat_user_tables s
+        ON s.relid = r.oid
+""")
+
+
+# ==================================
+# ESTIMATES
+# ==================================
+def estimate(conn, table: str) -> dict:
+    """
+    Instant row estimate from the catalog. Never scans.
+
+    Returns:
+        dict with rows, source ("stats" or "catalog"), the
+        last analyze time and rows modified since then.
+    """
+
+    row = conn.execute(
+        ESTIMATE_QUERY,
+        {"table": table, "rows_per_page": ROWS_PER_PAGE_GUESS},
+    ).mappings().one()
+
+    if row["has_stats"]:
+        rows, source = row["live_rows"], "stats"
+    else:
+        rows, source = row["catalog_rows"], "catalog"
+
+    return {
+        "rows": int(rows or 0),
+        "source": source,
+        "analyzed_at": row["analyzed_at"],
+        "modified_since_analyze": int(row["modified"] or 0),
+    }
+
+
+# ==================================
+# EXACT COUNTS
+# ==================================
+def _count(engine, table: str) -> dict:
+    """
+    COUNT(*) and the table version read from one snapshot,
+    so the count is exact for exactly that version.
+    """
+
+    t0 = time.perf_counter()
+
+    with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+        version = table_versions(conn, [table])[table]
+        rows = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+    return {
+        "version": version,
+        "rows": rows,
+        "counted_at": datetime.now(timezone.utc),
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def _count_in_background(engine, table: str):
+    try:
+        result = _count(engine, table)
+        with _lock:
+            _exact[table] = result
+        logger.info(f"Exact count of {table}: {result['rows']:,} rows in {result['seconds']:.2f} seconds")
+
+    except Exception:
+        logger.exception(f"Exact count of {table} failed")
+
+    finally:
+        with _lock:
+            _running.pop(table, None)
+
+
+def _is_current(cached: dict | None, version: int) -> bool:
+    if cached is None or cached["version"] != version:
+        return False
+
+    if version == 0:
+        age = (datetime.now(timezone.utc) - cached["counted_at"]).total_seconds()
+        return age < UNVERSIONED_TTL_SECONDS
+
+    return True
+
+
+def counts(table: str, exact: bool = False) -> dict:
+    """
+    Row counts for `table`, never blocking on a big scan.
+
+    Args:
+        exact: Also provide an exact count. Small tables are
+               counted inline; larger ones in the background,
+               cached per meta.table_changes version.
+
+    Returns:
+        dict with:
+            estimate: see estimate()
+            exact:    last exact count (rows, counted_at,
+                      seconds) or None
+            exact_current: True when the table has not changed
+                           since that count
+            counting: a background count is in progress
+    """
+
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        est = estimate(conn, table)
+        version = table_versions(conn, [table])[table]
+
+    with _lock:
+        cached = _exact.get(table)
+        counting = table in _running
+
+    current = _is_current(cached, version)
+
+    if exact and not current and not counting:
+        count_engine = get_engine("transform")
+
+        if est["rows"] <= EXACT_INLINE_ROWS:
+            cached, current = _count(count_engine, table), True
+            with _lock:
+                _exact[table] = cached
+        else:
+            with _lock:
+                if table not in _running:
+                    _running[table] = _executor.submit(_count_in_background, count_engine, table)
+            counting = True
+
+    return {
+        "estimate": est,
+        "exact": cached,
+        "exact_current": current,
+        "counting": counting,
+    }
@@ -1,7 +1,79 @@
 import streamlit as st
+from datetime import datetime, timezone
 import pandas as pd
+from pathlib import Path
 from sqlalchemy import text
 from components.db import get_engine
+from components.catalog import invalidate
+from components.row_counts import counts
+from components.paged_query import (
+    MAX_PAGE_SIZE,
+    PAGE_SIZES,
+    export_csv,
+    fetch_page,
+    read_query,
+)
+
+
+def _age(moment) -> str:
+    if moment is None:
+        return "never"
+
+    seconds = (datetime.now(timezone.utc) - moment).total_seconds()
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit} ago"
+    return "just now"
+
+
+def render_row_count(table_name: str, session_key: str, metric_label: str | None = None):
+    """
+    Shows the catalog estimate at once, and on request an
+    exact count computed in the background and cached per
+    table version (components.row_counts).
+    """
+
+    exact = st.checkbox("Exact count", key=f"exact_count_{session_key}")
+    result = counts(table_name, exact=exact)
+
+    estimate = result["estimate"]
+    label = metric_label or f"Rows in {table_name}"
+
+    col1, col2 = st.columns(2)
+
+    col1.metric(
+        f"{label} (estimate)",
+        f"~{estimate['rows']:,}",
+        help="From pg_stat_user_tables / pg_class; no table scan.",
+    )
+    col1.caption(
+        f"Source: {estimate['source']} · analyzed {_age(estimate['analyzed_at'])} · "
+        f"{estimate['modified_since_analyze']:,} rows modified since"
+    )
+
+    if not exact:
+        return
+
+    cached = result["exact"]
+
+    if cached is None:
+        col2.metric(f"{label} (exact)", "…")
+        col2.caption("Counting in the background; refresh to update.")
+        return
+
+    col2.metric(f"{label} (exact)", f"{cached['rows']:,}")
+
+    if result["exact_current"]:
+        status = "✅ current"
+    elif result["counting"]:
+        status = "⏳ table changed; recounting"
+    else:
+        status = "⚠️ stale"
+
+    col2.caption(
+        f"{status} · counted {_age(cached['counted_at'])} "
+        f"in {cached['seconds']:.2f}s"
+    )
 
 
 def render_table_explorer(
@@ -17,13 +89,7 @@ def render_table_explorer(
     # Row Count
     # ----------------------------------
     try:
-        row_count = pd.read_sql(
-            text(f"SELECT COUNT(*) AS count FROM {table_name};"),
-            engine
-        )["count"][0]
-
-        label = metric_label or f"Rows in {table_name}"
-        st.metric(label, f"{row_count:,}")
+        render_row_count(table_name, session_key, metric_label)
 
     except Exception as e:
         st.error(f"Row count failed: {e}")
@@ -34,31 +100,83 @@ def render_table_explorer(
     # ----------------------------------
     query_key = f"query_{session_key}"
     editor_key = f"editor_{session_key}"
+    page_key = f"page_{session_key}"
+    page_starts_key = f"page_starts_{session_key}"
+    export_key = f"export_{session_key}"
 
     if query_key not in st.session_state:
-        st.session_state[query_key] = (
-            f"SELECT * FROM {table_name} LIMIT {default_limit};"
-        )
+        st.session_state[query_key] = f"SELECT * FROM {table_name};"
+
+    st.session_state.setdefault(page_key, 0)
+
+    # Keyset start of each visited page: {page number: previous page's next_key}
+    st.session_state.setdefault(page_starts_key, {})
+
+    query = st.session_state[query_key]
 
     # ----------------------------------
     # AUTO PREVIEW (FIRST)
     # ----------------------------------
+    # Read queries are paged (components.paged_query), so an
+    # unbounded SELECT never lands in this process in full
     try:
-        with engine.begin() as conn:
-            result = conn.execute(text(st.session_state[query_key]))
+        if read_query(query) is not None:
+            sizes = sorted(set(PAGE_SIZES) | {default_limit})
+            page_size = st.selectbox(
+                "Rows per page",
+                sizes,
+                index=sizes.index(default_limit),
+                key=f"page_size_{session_key}",
+                on_change=lambda: st.session_state.update({page_key: 0, page_starts_key: {}}),
+            )
+
+            page = fetch_page(
+                query,
+                st.session_state[page_key],
+                page_size,
+                table=table_name,
+                after=st.session_state[page_starts_key].get(st.session_state[page_key]),
+            )
+
+            st.dataframe(page.rows, width="stretch")
+
+            col1, col2, col3 = st.columns([1, 3, 1])
+
+            with col1:
+                if st.button("◀ Prev", key=f"prev_{session_key}", disabled=page.number == 0):
+                    st.session_state[page_key] -= 1
+                    st.rerun()
 
-            if result.returns_rows:
-                df = pd.DataFrame(
-                    result.fetchall(),
-                    columns=result.keys()
-                )
-                st.dataframe(df, width="stretch")
-            else:
-                st.success(
-                    f"Query executed successfully. "
-                    f"{result.rowcount} rows affected."
+            with col2:
+                first_row = page.number * page.page_size + 1
+                st.caption(
+                    f"Page {page.number + 1} · rows {first_row:,}–{first_row + len(page.rows) - 1:,} · "
+                    f"{page.strategy} · "
+                    + ("cached" if page.cached else f"{page.seconds:.2f}s")
                 )
 
+            with col3:
+                if st.button("Next ▶", key=f"next_{session_key}", disabled=not page.has_next):
+                    st.session_state[page_starts_key][page.number + 1] = page.next_key
+                    st.session_state[page_key] += 1
+                    st.rerun()
+
+        else:
+            with engine.begin() as conn:
+                result = conn.execute(text(query))
+
+                if result.returns_rows:
+                    df = pd.DataFrame(
+                        result.fetchmany(MAX_PAGE_SIZE),
+                        columns=result.keys()
+                    )
+                    st.dataframe(df, width="stretch")
+                else:
+                    st.success(
+                        f"Query executed successfully. "
+                        f"{result.rowcount} rows affected."
+                    )
+
     except Exception as e:
         st.warning(f"Query failed: {e}")
 
@@ -74,7 +192,7 @@ def render_table_explorer(
         label_visibility="collapsed",
     )
 
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
 
     # ----------------------------------
     # RUN BUTTON
@@ -82,11 +200,39 @@ def render_table_explorer(
     with col1:
         if st.button("Run Query", key=f"run_{session_key}", width="stretch"):
             st.session_state[query_key] = edited_query
+            st.session_state[page_key] = 0
+            st.session_state[page_starts_key] = {}
+            st.session_state.pop(export_key, None)
 
     # ----------------------------------
-    # TRUNCATE BUTTON
+    # EXPORT BUTTON
     # ----------------------------------
     with col2:
+        if read_query(query) is not None:
+            if st.button("Export Full Result (CSV)", key=f"export_btn_{session_key}", width="stretch"):
+                try:
+                    with st.spinner("Streaming result to CSV..."):
+                        st.session_state[export_key] = export_csv(query)
+                except Exception as e:
+                    st.error(f"Export failed: {e}")
+
+            exported = st.session_state.get(export_key)
+
+            # Served by Streamlit's static file route, streamed
+            # from disk; the file never enters this process
+            if exported and exported["url"] and Path(exported["path"]).exists():
+                st.markdown(
+                    f'<a href="{exported["url"]}" download="{Path(exported["path"]).name}">'
+                    f'⬇ Download {exported["rows"]:,} rows ({exported["bytes"] / 1024 ** 2:,.1f} MB)</a>',
+                    unsafe_allow_html=True,
+                )
+            elif exported:
+                st.caption(f"{exported['rows']:,} rows written to {exported['path']}")
+
+    # ----------------------------------
+    # TRUNCATE BUTTON
+    # ----------------------------------
+    with col3:
         if allow_truncate:
             if st.button(
                 "Truncate Table",
@@ -97,6 +243,8 @@ def render_table_explorer(
                     with engine.begin() as conn:
                         conn.execute(text(f"TRUNCATE TABLE {table_name};"))
 
+                    invalidate(table_name)
+
                     st.success(f"{table_name} truncated.")
                     st.rerun()
 
@@ -0,0 +1,178 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import json
+import os
+import threading
+from pathlib import Path
+from sqlalchemy import text
+
+from components.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# DEFAULT PROFILES
+# ==================================
+#
+# Session settings applied per step with set_config(..., true),
+# i.e. SET LOCAL: they last until the end of the step's
+# transaction and never leak into pooled connections.
+#
+# synchronous_commit=off is only used for layers that can be
+# rebuilt from landing/bronze. A crash can lose the last few
+# commits but never corrupts data, and watermarks are committed
+# in the same transactions, so a lost commit is simply redone.
+#
+DEFAULT_PROFILES = {
+    "default": {},
+    "bulk_load": {
+        "synchronous_commit": "off",
+        "work_mem": "64MB",
+    },
+    "heavy_transform": {
+        "synchronous_commit": "off",
+        "work_mem": "256MB",
+        "max_parallel_workers_per_gather": "4",
+        "jit": "off",
+    },
+    "knn_join": {
+        "synchronous_commit": "off",
+        "work_mem": "128MB",
+        "max_parallel_workers_per_gather": "4",
+        "parallel_setup_cost": "100",
+        "jit": "off",
+    },
+    "index_build": {
+        "maintenance_work_mem": "1GB",
+        "max_parallel_maintenance_workers": "2",
+    },
+}
+
+# YAML (or JSON) file overriding DEFAULT_PROFILES:
+#
+#   heavy_transform:
+#     work_mem: 512MB
+#   knn_join:
+#     max_parallel_workers_per_gather: 8
+#
+TUNING_FILE_ENV = "PIPELINE_TUNING_FILE"
+
+# Single settings can also be overridden from the environment:
+#   PIPELINE_TUNING__HEAVY_TRANSFORM__WORK_MEM=512MB
+ENV_PREFIX = "PIPELINE_TUNING__"
+
+_profiles = None
+_profiles_lock = threading.Lock()
+
+# Callables (profile, settings) told about every applied profile
+_listeners = []
+
+
+# ==================================
+# CONFIGURATION
+# ==================================
+
+def _read_file(path: Path) -> dict:
+    if path.suffix.lower() in (".yaml", ".yml"):
+        import yaml
+        return yaml.safe_load(path.read_text()) or {}
+
+    return json.loads(path.read_text())
+
+
+def load_profiles() -> dict[str, dict[str, str]]:
+    """
+    Builds the tuning profiles: defaults, then the file named
+    by PIPELINE_TUNING_FILE, then PIPELINE_TUNING__* variables.
+    """
+
+    profiles = {name: dict(settings) for name, settings in DEFAULT_PROFILES.items()}
+
+    file_name = os.getenv(TUNING_FILE_ENV)
+    if file_name:
+        for name, settings in _read_file(Path(file_name)).items():
+            profiles.setdefault(name, {}).update(
+                {key: str(value) for key, value in (settings or {}).items()}
+            )
+
+    for key, value in os.environ.items():
+        if key.startswith(ENV_PREFIX):
+            profile, _, setting = key[len(ENV_PREFIX):].partition("__")
+            if setting:
+                profiles.setdefault(profile.lower(), {})[setting.lower()] = value
+
+    return profiles
+
+
+def get_profile(name: str) -> dict[str, str]:
+    """
+    Returns the settings of tuning profile `name`.
+    Profiles are loaded once per process.
+    """
+
+    global _profiles
+
+    if _profiles is None:
+        with _profiles_lock:
+            if _profiles is None:
+                _profiles = load_profiles()
+
+    if name not in _profiles:
+        raise ValueError(f"Unknown tuning profile: {name}. Known: {list(_profiles)}")
+
+    return _profiles[name]
+
+
+# ==================================
+# APPLY
+# ==================================
+
+def add_tuning_listener(listener):
+    """
+    Registers `listener(profile, settings)`, called after each
+    apply_tuning() on the applying thread (e.g. to attach the
+    settings to the running step's metrics).
+    """
+
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def apply_tuning(conn, profile: str, **overrides) -> dict[str, str]:
+    """
+    Applies tuning `profile` (plus `overrides`) to the current
+    transaction of `conn` and returns the settings applied.
+
+    `conn` is a SQLAlchemy Connection or a raw DBAPI
+    connection (psycopg2 or psycopg 3, e.g. for COPY).
+    Must be called inside the transaction it should affect.
+
+    Registered listeners are notified (pipeline.run_history
+    attaches the settings to the running step's metrics, so
+    they land in meta.step_runs).
+    """
+
+    settings = {**get_profile(profile), **{k: str(v) for k, v in overrides.items()}}
+
+    for name, value in settings.items():
+        if hasattr(conn, "exec_driver_sql"):
+            conn.execute(
+                text("SELECT set_config(:name, :value, true)"),
+                {"name": name, "value": value},
+            )
+        else:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT set_config(%s, %s, true)", (name, value))
+            finally:
+                cur.close()
+
+    if settings:
+        logger.debug(f"Applied tuning profile {profile}: {settings}")
+
+    for listener in _listeners:
+        listener(profile, settings)
+
+    return settings
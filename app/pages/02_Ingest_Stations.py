@@ -51,13 +51,22 @@ truncate = st.checkbox(
     help="Clears bronze.stations before loading new data."
 )
 
+binary = st.checkbox(
+    "Binary COPY (psycopg 3)",
+    value=False,
+    help="Sends typed rows in Postgres binary format instead of CSV text. Falls back to CSV if psycopg 3 is not installed."
+)
+
 if st.button("Ingest Stations into Bronze", type="primary", use_container_width=True):
 
     try:
         start_time = time.perf_counter()
 
         with st.spinner("Ingesting stations into bronze..."):
-            result = ingest(truncate=truncate)
+            result = ingest(
+                truncate=truncate,
+                copy_format="binary" if binary else "csv",
+            )
 
         elapsed = time.perf_counter() - start_time
 
@@ -51,6 +51,18 @@ max_workers = st.slider(
     help="Number of threads to speed up ingestion"
 )
 
+resilient = st.checkbox(
+    "Resilient mode (divert bad rows to reject files)",
+    value=False,
+    help="Loads in chunks and writes malformed rows to /data/rejects/weather instead of failing the file."
+)
+
+binary = st.checkbox(
+    "Binary COPY (psycopg 3)",
+    value=False,
+    help="Sends typed rows in Postgres binary format instead of CSV text. Falls back to CSV if psycopg 3 is not installed. Ignored in resilient mode."
+)
+
 if st.button("Ingest Weather into Bronze", type="primary", use_container_width=True):
 
     files_before = list(LANDING_DIR.glob("*.csv"))
@@ -66,7 +78,11 @@ if st.button("Ingest Weather into Bronze", type="primary", use_container_width=T
     result_container = {}
 
     def run_ingest():
-        result_container["result"] = ingest(max_workers=max_workers)
+        result_container["result"] = ingest(
+            max_workers=max_workers,
+            resilient=resilient,
+            copy_format="binary" if binary else "csv",
+        )
 
     start_time = time.perf_counter()
 
@@ -96,6 +112,7 @@ if st.button("Ingest Weather into Bronze", type="primary", use_container_width=T
     st.success("Weather ingest completed successfully")
 
     st.write(f"📦 Rows inserted: {rows:,}")
+    st.write(f"🚫 Rows rejected: {result.get('rows_rejected', 0):,}")
     st.write(f"⏱ Time: {elapsed:.2f} sec")
 
     if elapsed > 0:
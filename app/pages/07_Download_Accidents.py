@@ -44,6 +44,12 @@ st.divider()
 # ----------------------------------
 st.subheader("⬇️ Download Controls")
 
+keep_compressed = st.checkbox(
+    "Keep archive compressed (stream zip into COPY)",
+    value=False,
+    help="Skips extracting the ~3GB CSV. Ingest reads it straight out of the zip."
+)
+
 col1, col2 = st.columns(2)
 
 with col1:
@@ -51,7 +57,7 @@ with col1:
 
         try:
             with st.spinner("Downloading dataset from Kaggle..."):
-                result = download()
+                result = download(unzip=not keep_compressed)
 
             st.success(f"Download status: {result['status']}")
             st.rerun()
@@ -82,6 +88,13 @@ st.divider()
 # Status Check
 # ----------------------------------
 files = list(LANDING_DIR.glob("*.csv"))
+archives = list(LANDING_DIR.glob("*.zip"))
+
+if archives:
+    st.success(
+        f"Detected {len(archives)} zip archive(s). "
+        f"Ready for streaming ingest."
+    )
 
 if files:
     st.success(f"Detected {len(files)} CSV file(s). Ready for ingest.")
@@ -94,5 +107,5 @@ if files:
     except Exception as e:
         st.warning(f"Preview failed: {e}")
 
-else:
-    st.warning("No CSV files detected in landing directory.")
+elif not archives:
+    st.warning("No CSV or zip files detected in landing directory.")
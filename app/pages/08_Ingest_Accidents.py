@@ -52,6 +52,24 @@ truncate = st.checkbox(
     help="Clear bronze table before loading."
 )
 
+bulk = st.checkbox(
+    "Bulk-load mode (drop + rebuild indexes)",
+    value=False,
+    help="Drops secondary indexes during COPY and rebuilds them in parallel afterwards. Best for full loads."
+)
+
+resilient = st.checkbox(
+    "Resilient mode (divert bad rows to reject files)",
+    value=False,
+    help="Loads in chunks and writes malformed rows to /data/rejects/accidents instead of aborting the load."
+)
+
+binary = st.checkbox(
+    "Binary COPY (psycopg 3)",
+    value=False,
+    help="Sends typed rows in Postgres binary format instead of CSV text. Falls back to CSV if psycopg 3 is not installed. Ignored in resilient mode."
+)
+
 if st.button(
     "Ingest Accidents into Bronze",
     type="primary",
@@ -62,7 +80,12 @@ if st.button(
 
     try:
         with st.spinner("Ingesting accident files..."):
-            result = ingest(truncate=truncate)
+            result = ingest(
+                truncate=truncate,
+                bulk=bulk,
+                resilient=resilient,
+                copy_format="binary" if binary else "csv",
+            )
 
         rows = result["rows_inserted"]
         seconds = result["seconds"]
@@ -70,6 +93,7 @@ if st.button(
         st.success("Ingest completed successfully")
 
         st.write(f"📦 Rows inserted: {rows:,}")
+        st.write(f"🚫 Rows rejected: {result['rows_rejected']:,}")
         st.write(f"⏱ Time: {seconds:.2f} seconds")
 
         if seconds > 0:
@@ -73,6 +73,12 @@ restrict_weather = st.checkbox(
     help="Only process accidents within min/max dates of silver.weather_daily"
 )
 
+incremental = st.checkbox(
+    "Incremental (only bronze batches newer than last run)",
+    value=True,
+    help="Uses the watermark in meta.watermarks. Uncheck to rescan all of bronze."
+)
+
 
 # ==================================
 # Execution
@@ -87,7 +93,8 @@ if run_clicked:
             result = transform(
                 truncate=truncate_silver,
                 states=selected_states,
-                restrict_to_weather_range=restrict_weather
+                restrict_to_weather_range=restrict_weather,
+                incremental=incremental,
             )
 
         elapsed = time.perf_counter() - start_time
@@ -105,6 +112,11 @@ if run_clicked:
             f"{rows / seconds:,.0f}" if seconds > 0 else "—"
         )
 
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Inserted", f"{result['rows_inserted']:,}")
+        c2.metric("Updated", f"{result['rows_updated']:,}")
+        c3.metric("Skipped (unchanged)", f"{result['rows_skipped']:,}")
+
     except Exception:
         import traceback
         status_placeholder.error("❌ Transform failed")
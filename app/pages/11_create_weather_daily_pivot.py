@@ -14,7 +14,7 @@ from components.table_explorer import render_table_explorer
 st.set_page_config(layout="wide")
 
 st.title("🌤 Weather: Daily Pivot (Silver)")
-st.caption("Build / refresh silver.weather_daily_pivot materialized view")
+st.caption("Build / refresh silver.weather_daily_pivot (incrementally maintained table)")
 
 st.divider()
 
@@ -27,10 +27,17 @@ st.subheader("⚙️ Build Controls")
 col1, col2 = st.columns([2, 1])
 
 with col1:
+    incremental = st.checkbox(
+        "Incremental (only station-days changed since last build)",
+        value=True,
+        help="Re-aggregates only pairs whose silver.weather_daily rows changed. Falls back to a full build the first time."
+    )
+
     concurrent = st.checkbox(
-        "Use CONCURRENT refresh (requires unique index)",
+        "Non-blocking full refresh",
         value=False,
-        help="Allows reads during refresh but requires unique index on the materialized view."
+        help="Full builds upsert in place instead of TRUNCATE + INSERT, so reads are not blocked.",
+        disabled=incremental,
     )
 
 with col2:
@@ -51,17 +58,19 @@ if run_clicked:
 
     try:
         with st.spinner("Refreshing weather_daily_pivot..."):
-            result = build(concurrent=concurrent)
+            result = build(concurrent=concurrent, incremental=incremental)
 
         elapsed = time.perf_counter() - start_time
 
         rows = result["rows_refreshed"]
         seconds = result["seconds"]
 
-        status_placeholder.success("✅ Pivot refreshed successfully")
+        status_placeholder.success(
+            f"✅ Pivot refreshed successfully ({result['mode']})"
+        )
 
         m1, m2, m3 = st.columns(3)
-        m1.metric("Rows in Pivot", f"{rows:,}")
+        m1.metric("Rows Refreshed", f"{rows:,}")
         m2.metric("Execution Time (sec)", f"{seconds:.2f}")
         m3.metric(
             "Rows / Sec",
@@ -86,5 +95,5 @@ render_table_explorer(
     table_name="silver.weather_daily_pivot",
     session_key="silver_weather_daily_pivot",
     metric_label="Weather Daily Pivot Rows",
-    # can not truncate matterialize view, utilize refresh
+    # no truncate: the incremental watermark would go stale, use a full build
 )
\ No newline at end of file
@@ -3,6 +3,7 @@
 # ----------------------------------
 import streamlit as st
 import time
+from datetime import date
 
 from pipeline.accident_weather import build
 from components.table_explorer import render_table_explorer
@@ -28,11 +29,54 @@ truncate = st.checkbox(
     help="Clears gold table before rebuilding."
 )
 
+incremental = st.checkbox(
+    "Incremental (only accidents whose inputs changed)",
+    value=False,
+    help="Upserts accidents whose silver row, station mapping or weather pivot row changed since the last build. Ignores truncate."
+)
+
+staged = st.checkbox(
+    "Staged partition swap",
+    value=True,
+    help="Rebuilds each yearly partition in a staging table and swaps it in with DETACH/ATTACH. Readers are not blocked during the build."
+)
+
+years = st.multiselect(
+    "Years to rebuild (empty = all)",
+    options=list(range(2016, date.today().year + 1)),
+    default=[],
+    disabled=not staged or incremental,
+    help="Backfills the yearly partitions from the earliest to the latest selected year."
+)
+
+workers = st.slider(
+    "Partitions built in parallel",
+    min_value=1,
+    max_value=8,
+    value=2,
+    disabled=not staged or incremental,
+)
+
+bulk = st.checkbox(
+    "Bulk-load mode (drop + rebuild indexes)",
+    value=False,
+    disabled=staged and not incremental,
+    help="Drops secondary indexes during an in-place build and rebuilds them in parallel afterwards."
+)
+
 if st.button("🚀 Build Gold Accident Weather", type="primary", use_container_width=True):
 
     try:
         with st.spinner("Building gold.accident_weather..."):
-            result = build(truncate=truncate)
+            result = build(
+                truncate=truncate,
+                bulk=bulk,
+                incremental=incremental,
+                staged=staged,
+                start_date=date(min(years), 1, 1) if years else None,
+                end_date=date(max(years), 12, 31) if years else None,
+                max_workers=workers,
+            )
 
         rows = result["rows_written"]
         seconds = result["seconds"]
@@ -40,7 +84,10 @@ if st.button("🚀 Build Gold Accident Weather", type="primary", use_container_w
         st.success("Gold table built successfully")
 
         col1, col2, col3 = st.columns(3)
-        col1.metric("Rows Written", f"{rows:,}")
+        col1.metric(
+            "Rows Changed" if incremental or years else "Rows Written",
+            f"{rows:,}"
+        )
         col2.metric("Time (sec)", f"{seconds:.2f}")
 
         if seconds > 0:
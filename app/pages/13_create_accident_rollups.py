@@ -0,0 +1,67 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import streamlit as st
+
+from pipeline.rollups import build, ROLLUPS
+from components.table_explorer import render_table_explorer
+
+
+# ----------------------------------
+# Page Title
+# ----------------------------------
+st.title("Gold: Build Dashboard Rollups")
+st.caption("Maintain pre-aggregated gold.rollup_* tables for analytics")
+
+st.divider()
+
+
+# ----------------------------------
+# Controls Section
+# ----------------------------------
+st.subheader("⚙️ Build Options")
+
+incremental = st.checkbox(
+    "Incremental (only state-months whose gold rows changed)",
+    value=True,
+    help="Recomputes the (state, month) slices touched since the last build. Falls back to a full build the first time."
+)
+
+if st.button("🚀 Build Rollups", type="primary", use_container_width=True):
+
+    try:
+        with st.spinner("Building gold rollups..."):
+            result = build(incremental=incremental)
+
+        st.success(f"Rollups built successfully ({result['mode']})")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric(
+            "Slices Refreshed",
+            "all" if result["slices_refreshed"] is None else f"{result['slices_refreshed']:,}"
+        )
+        col2.metric("Rollup Rows Written", f"{result['rows_refreshed']:,}")
+        col3.metric("Time (sec)", f"{result['seconds']:.2f}")
+
+    except Exception:
+        import traceback
+        st.error("Build failed")
+        st.code(traceback.format_exc())
+
+
+st.divider()
+
+
+# ----------------------------------
+# Rollup Explorer
+# ----------------------------------
+st.subheader("📊 Rollup Preview")
+
+table_name = st.selectbox("Rollup", list(ROLLUPS))
+
+render_table_explorer(
+    table_name=table_name,
+    session_key=f"rollup_{table_name.split('.')[1]}",
+    metric_label="Rollup Rows",
+    # no truncate: the rollup watermark would go stale, use a full build
+)
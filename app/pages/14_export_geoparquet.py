@@ -0,0 +1,80 @@
+# ----------------------------------
+# Imports
+# ----------------------------------
+import streamlit as st
+
+from pipeline.export import export_table, EXPORT_SPECS, EXPORT_DIR
+
+
+# ----------------------------------
+# Page Config
+# ----------------------------------
+st.set_page_config(layout="wide")
+
+st.title("📦 Export: GeoParquet")
+st.caption(f"Stream silver/gold tables to partitioned GeoParquet under {EXPORT_DIR}")
+
+st.divider()
+
+
+# ----------------------------------
+# Controls Section
+# ----------------------------------
+st.subheader("⚙️ Export Controls")
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    table_name = st.selectbox("Table", list(EXPORT_SPECS))
+
+    incremental = st.checkbox(
+        "Incremental (only partitions changed since last export)",
+        value=True,
+        help="Compares each partition's row count and latest update with the export manifest."
+    )
+
+    row_group_rows = st.number_input(
+        "Rows per row group",
+        min_value=10_000,
+        max_value=1_000_000,
+        value=100_000,
+        step=10_000,
+        help="Also the server-side cursor batch size; bounds memory per worker."
+    )
+
+    max_workers = st.slider("Partitions exported in parallel", 1, 8, 2)
+
+with col2:
+    run_clicked = st.button(
+        "🚀 Export",
+        type="primary",
+        use_container_width=True
+    )
+
+
+# ----------------------------------
+# Execution
+# ----------------------------------
+if run_clicked:
+
+    try:
+        with st.spinner(f"Exporting {table_name}..."):
+            result = export_table(
+                table_name,
+                incremental=incremental,
+                row_group_rows=int(row_group_rows),
+                max_workers=max_workers,
+            )
+
+        st.success(f"Exported to {result['export_dir']}")
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Partitions Exported", f"{result['partitions_exported']:,}")
+        m2.metric("Partitions Skipped", f"{result['partitions_skipped']:,}")
+        m3.metric("Rows Written", f"{result['rows_written']:,}")
+        m4.metric("Time (sec)", f"{result['seconds']:.2f}")
+
+    except Exception:
+        import traceback
+        st.error("❌ Export failed")
+        st.code(traceback.format_exc())
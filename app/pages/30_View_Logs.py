@@ -1,9 +1,12 @@
 # ==================================
 # Imports
 # ==================================
+import time
 import streamlit as st
 from pathlib import Path
 
+from components.log_reader import LEVELS, LogFilter, format_entry, refresh, tail
+
 # ==================================
 # Config
 # ==================================
@@ -11,30 +14,45 @@ st.set_page_config(page_title="View Logs", layout="wide")
 
 LOG_FILE = Path("logs") / "pipeline.log"
 
+FOLLOW_SECONDS = 2
+
 # ==================================
 # Header
 # ==================================
 st.title("📜 Pipeline Logs")
-st.caption("Showing last 200 log entries")
+st.caption("Reads from the end of the log; refreshes only read new lines")
 
 # ==================================
 # Helper Functions
 # ==================================
-def read_logs():
-    if not LOG_FILE.exists():
-        return f"No log file found at: {LOG_FILE.resolve()}"
-
-    lines = LOG_FILE.read_text().splitlines()
-    return "\n".join(lines[-200:])
-
 def clear_logs():
     if LOG_FILE.exists():
         LOG_FILE.write_text("")
+    st.session_state.pop("log_cursor", None)
+
+# ==================================
+# Filters
+# ==================================
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    min_level = st.selectbox("Min level", LEVELS, index=LEVELS.index("INFO"))
+
+with col2:
+    module = st.text_input("Module contains", placeholder="e.g. weather")
+
+with col3:
+    run_id = st.number_input("Run ID (0 = any)", min_value=0, step=1, value=0)
+
+with col4:
+    limit = st.select_slider("Entries", options=[100, 200, 500, 1000, 2000], value=200)
+
+log_filter = LogFilter(min_level, module.strip(), int(run_id) or None)
 
 # ==================================
 # Controls
 # ==================================
-col1, col2 = st.columns(2)
+col1, col2, col3 = st.columns(3)
 
 with col1:
     if st.button("🔄 Refresh Logs"):
@@ -46,10 +64,38 @@ with col2:
         st.success("Logs cleared.")
         st.rerun()
 
+with col3:
+    follow = st.checkbox("Live follow", value=False)
+
+# ==================================
+# Read
+# ==================================
+# The cursor (byte offset + last entries) lives in session
+# state; a changed filter or size starts a fresh tail
+cursor = st.session_state.get("log_cursor")
+
+if cursor is None or cursor.log_filter != log_filter or cursor.limit != limit:
+    cursor = tail(LOG_FILE, log_filter, limit)
+else:
+    cursor = refresh(cursor)
+
+st.session_state["log_cursor"] = cursor
+
 # ==================================
 # Display
 # ==================================
 st.divider()
 
-logs = read_logs()
-st.code(logs if logs else "Log file is empty.", language="bash")
+if not LOG_FILE.exists():
+    st.info(f"No log file found at: {LOG_FILE.resolve()}")
+else:
+    st.caption(
+        f"{len(cursor.entries)} entries · offset {cursor.offset:,} bytes · "
+        f"read {cursor.bytes_read:,} bytes this refresh"
+    )
+    logs = "\n".join(format_entry(e) for e in cursor.entries)
+    st.code(logs if logs else "No matching log entries.", language="bash")
+
+if follow:
+    time.sleep(FOLLOW_SECONDS)
+    st.rerun()
@@ -0,0 +1,216 @@
+# ==================================
+# Imports
+# ==================================
+import streamlit as st
+import pandas as pd
+from sqlalchemy import text
+
+from components.db import get_engine, pool_stats
+
+
+# ==================================
+# Config
+# ==================================
+st.set_page_config(page_title="Pipeline Runs", layout="wide")
+
+engine = get_engine()
+
+
+# ==================================
+# Header
+# ==================================
+st.title("⏱ Pipeline Runs")
+st.caption("Run history, per-step trends and regressions (meta.pipeline_runs / meta.step_runs)")
+
+col1, col2 = st.columns([1, 3])
+
+with col1:
+    history = st.number_input("Runs to show", min_value=5, max_value=500, value=30, step=5)
+
+with col2:
+    threshold = st.slider(
+        "Regression threshold (× median of previous runs)",
+        min_value=1.1,
+        max_value=3.0,
+        value=1.5,
+        step=0.1,
+    )
+
+if st.button("🔄 Refresh"):
+    st.rerun()
+
+
+# ==================================
+# Load
+# ==================================
+runs = pd.read_sql(
+    text("""
+        SELECT run_id, started_at, ended_at, status, seconds,
+               critical_path_seconds, critical_path, resumes, error
+        FROM meta.pipeline_runs
+        ORDER BY run_id DESC
+        LIMIT :limit
+    """),
+    engine,
+    params={"limit": int(history)},
+)
+
+if runs.empty:
+    st.info("No pipeline runs recorded yet.")
+    st.stop()
+
+steps = pd.read_sql(
+    text("""
+        SELECT run_id, step, status, started_at, seconds, rows_in, rows_out,
+               bytes_read, peak_rss_mb, db_seconds, tuning, error
+        FROM meta.step_runs
+        WHERE run_id >= :min_run
+        ORDER BY started_at
+    """),
+    engine,
+    params={"min_run": int(runs["run_id"].min())},
+)
+
+
+# ==================================
+# Recent Runs
+# ==================================
+st.divider()
+st.subheader("🗂 Recent Runs")
+
+latest = runs.iloc[0]
+
+m1, m2, m3 = st.columns(3)
+m1.metric("Latest Run", f"#{latest['run_id']}", latest["status"])
+m2.metric("Wall-Clock (sec)", f"{latest['seconds']:.0f}" if pd.notna(latest["seconds"]) else "—")
+m3.metric(
+    "Critical Path (sec)",
+    f"{latest['critical_path_seconds']:.0f}" if pd.notna(latest["critical_path_seconds"]) else "—",
+)
+
+st.dataframe(
+    runs.drop(columns=["critical_path"]),
+    use_container_width=True,
+    hide_index=True,
+)
+
+
+# ==================================
+# Regressions
+# ==================================
+st.divider()
+st.subheader("🚨 Regressions")
+
+executed = steps[steps["status"] == "success"]
+
+rows = []
+for step, group in executed.groupby("step"):
+    if len(group) < 2:
+        continue
+
+    last = group.iloc[-1]
+    baseline = group.iloc[:-1].tail(10)["seconds"].median()
+
+    if baseline and last["seconds"] / baseline >= threshold:
+        rows.append({
+            "step": step,
+            "run_id": last["run_id"],
+            "seconds": last["seconds"],
+            "baseline_median": round(baseline, 2),
+            "ratio": round(last["seconds"] / baseline, 2),
+        })
+
+if rows:
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+else:
+    st.success("No step slower than the threshold in its latest run.")
+
+
+# ==================================
+# Trends
+# ==================================
+st.divider()
+st.subheader("📈 Step Duration Trends")
+
+selected = st.multiselect(
+    "Steps",
+    sorted(executed["step"].unique()),
+    default=sorted(executed["step"].unique()),
+)
+
+metric = st.selectbox(
+    "Metric",
+    ["seconds", "db_seconds", "peak_rss_mb", "rows_out", "bytes_read"],
+)
+
+trend = (
+    executed[executed["step"].isin(selected)]
+    .pivot_table(index="run_id", columns="step", values=metric, aggfunc="sum")
+)
+
+if not trend.empty:
+    st.line_chart(trend)
+
+
+# ==================================
+# Run Detail
+# ==================================
+st.divider()
+st.subheader("🔍 Run Detail")
+
+run_id = st.selectbox("Run", runs["run_id"].tolist())
+
+detail = steps[steps["run_id"] == run_id].drop(columns=["run_id"])
+st.dataframe(detail, use_container_width=True, hide_index=True)
+
+path = runs.loc[runs["run_id"] == run_id, "critical_path"].iloc[0]
+if path:
+    st.caption("Critical path: " + " → ".join(path))
+
+
+# ==================================
+# Connection Pools
+# ==================================
+st.divider()
+st.subheader("🔌 Connection Pools")
+st.caption(
+    "Per-workload pools of this Streamlit process (components.db.ENGINE_PROFILES). "
+    "Waits include connecting and the pre-ping."
+)
+
+pools = pd.DataFrame.from_dict(pool_stats(), orient="index")
+
+if pools.empty:
+    st.info("No pools created yet in this process.")
+else:
+    st.dataframe(pools, use_container_width=True)
+
+
+# ==================================
+# Resume
+# ==================================
+status = runs.loc[runs["run_id"] == run_id, "status"].iloc[0]
+
+if status != "success":
+    st.caption(
+        "Steps that already succeeded in this run are kept; "
+        "the remaining steps run again with the run's original parameters."
+    )
+
+    if st.button(f"▶️ Resume run #{run_id}"):
+        try:
+            from pipeline.orchestrator import resume
+
+            with st.spinner(f"Resuming run #{run_id}..."):
+                result = resume(int(run_id))
+
+            st.success(f"Run #{run_id} completed")
+
+            c1, c2 = st.columns(2)
+            c1.metric("Steps Resumed From Checkpoint", len(result["resumed"]))
+            c2.metric("Time (s)", result.get("seconds", 0))
+
+        except Exception:
+            import traceback
+            st.error("Resume failed")
+            st.code(traceback.format_exc())
@@ -0,0 +1,348 @@
+# ==================================
+# Imports
+# ==================================
+#
+# Headless entry point:
+#
+#   python -m pipeline list
+#   python -m pipeline run [--states CA TX] [--wide] [--parallelism 4] [--force [STEP ...]]
+#   python -m pipeline resume RUN_ID [--parallelism 4]
+#   python -m pipeline step gold [--force]
+#   python -m pipeline quality [TABLE ...] [--full]
+#   python -m pipeline migrate [--status | --repair | --write-init PATH]
+#   python -m pipeline data-fixes [--status]
+#   python -m pipeline bench-copy {weather,weather_wide,accidents,stations} [--files 20]
+#   python -m pipeline startup [--budget 2.0]
+#
+# Only the standard library is imported at module level;
+# pipeline modules (and their heavy dependencies) load
+# when a command needs them.
+#
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+
+# ==================================
+# Constants
+# ==================================
+# Cold start (fresh interpreter → first query) must stay under this
+STARTUP_BUDGET_SECONDS = 2.0
+
+# Modules a cold start must not pull in
+HEAVY_MODULES = ("streamlit", "pandas", "geopandas", "kaggle", "pyarrow")
+
+STARTUP_PROBE = f"""
+import sys
+from pipeline.orchestrator import build_steps
+from components.db import get_engine
+from sqlalchemy import text
+
+build_steps()
+with get_engine().connect() as conn:
+    conn.execute(text("SELECT 1"))
+
+print([m for m in {HEAVY_MODULES!r} if m in sys.modules])
+"""
+
+
+# ==================================
+# COMMANDS
+# ==================================
+def _print(result):
+    print(json.dumps(result, indent=2, default=str))
+
+
+def _failed(error) -> int:
+    """
+    Prints the partial report of a failed DAG run (DagError)
+    and returns the command's exit code.
+    """
+
+    print(error, file=sys.stderr)
+    _print(error.report)
+
+    return 1
+
+
+def cmd_list(args) -> int:
+    from pipeline.orchestrator import build_steps
+
+    for step in build_steps(wide=args.wide):
+        deps = ", ".join(step.deps) or "-"
+        resources = ", ".join(step.resources) or "-"
+        print(f"{step.name:<22} deps: {deps:<45} resources: {resources}")
+
+    return 0
+
+
+def cmd_run(args) -> int:
+    from pipeline.dag import DagError
+    from pipeline.orchestrator import run_full
+
+    resource_limits = {"heavy_db": args.heavy_db} if args.heavy_db else None
+
+    try:
+        _print(run_full(
+            states=args.states,
+            wide=args.wide,
+            parallelism=args.parallelism,
+            resource_limits=resource_limits,
+            force=_force(args.force),
+        ))
+    except DagError as e:
+        return _failed(e)
+
+    return 0
+
+
+def cmd_resume(args) -> int:
+    from pipeline.dag import DagError
+    from pipeline.orchestrator import resume
+
+    resource_limits = {"heavy_db": args.heavy_db} if args.heavy_db else None
+
+    try:
+        _print(resume(
+            args.run_id,
+            parallelism=args.parallelism,
+            resource_limits=resource_limits,
+        ))
+    except DagError as e:
+        return _failed(e)
+
+    return 0
+
+
+def cmd_step(args) -> int:
+    from dataclasses import replace
+    from pipeline.orchestrator import build_steps
+    from pipeline.dag import DagError, run_dag
+
+    steps = {s.name: s for s in build_steps(args.states, wide=args.wide)}
+
+    if args.name not in steps:
+        print(f"Unknown step: {args.name}. Known: {', '.join(steps)}", file=sys.stderr)
+        return 2
+
+    # Dependencies are assumed satisfied when running one step
+    step = replace(steps[args.name], deps=())
+
+    try:
+        report = run_dag([step], parallelism=1, force=args.force)
+    except DagError as e:
+        return _failed(e)
+
+    _print(report["results"][step.name])
+
+    return 0
+
+
+def cmd_quality(args) -> int:
+    from components.db import get_engine
+    from pipeline.quality import RULES, check
+
+    # Full checks scan whole tables: no UI statement timeout
+    engine = get_engine("transform")
+    failed = False
+
+    for table in args.tables or list(RULES):
+        results = check(engine, table, full=args.full)
+        failed = failed or any(
+            r["status"] == "fail" and r["severity"] == "error" for r in results
+        )
+        _print({table: results})
+
+    return 1 if failed else 0
+
+
+def cmd_migrate(args) -> int:
+    from pathlib import Path
+    from components import migrations
+
+    if args.write_init:
+        Path(args.write_init).write_text(migrations.render_init_sql())
+        print(f"Wrote {args.write_init}")
+        return 0
+
+    if args.status:
+        _print(migrations.status())
+        return 0
+
+    _print(migrations.repair() if args.repair else migrations.migrate())
+    return 0
+
+
+def cmd_bench_copy(args) -> int:
+    """
+    Compares CSV and binary COPY on landing (or archived) files.
+    Loads into a rolled-back temp table; nothing is persisted.
+    """
+
+    from itertools import islice
+    from components.db import get_engine, benchmark_copy
+
+    if args.dataset == "accidents":
+        from pipeline import accidents as module
+        table, columns = "bronze.us_accidents", module.BRONZE_COLUMNS
+        dirs, pattern = (module.LANDING_DIR, module.ARCHIVE_DIR), "*.*"
+    elif args.dataset == "stations":
+        from pipeline import stations as module
+        table, columns = "bronze.stations", module.BRONZE_COLUMNS
+        dirs, pattern = (module.OUT_DIR, module.ARCHIVE_DIR), "*.csv"
+    else:
+        from pipeline import weather as module
+        wide = args.dataset == "weather_wide"
+        table = "bronze.weather_daily_wide" if wide else "bronze.weather_daily"
+        columns = module.WIDE_COLUMNS if wide else module.BRONZE_COLUMNS
+        dirs = (
+            (module.LANDING_WIDE_DIR, module.ARCHIVE_WIDE_DIR) if wide
+            else (module.LANDING_DIR, module.ARCHIVE_DIR)
+        )
+        pattern = "*.csv"
+
+    files = list(islice(
+        (p for d in dirs if d.exists() for p in sorted(d.glob(pattern))
+         if p.suffix.lower() in (".csv", ".zip")),
+        args.files,
+    ))
+
+    if not files:
+        print(f"No {args.dataset} files found in {', '.join(map(str, dirs))}", file=sys.stderr)
+        return 2
+
+    def open_streams():
+        for path in files:
+            if args.dataset == "accidents":
+                for _, stream in module._open_csv_streams(path):
+                    yield stream
+            else:
+                with open(path, "r", newline="") as f:
+                    yield f
+
+    _print({
+        "table": table,
+        "files": len(files),
+        "results": benchmark_copy(get_engine("bulk"), table, columns, open_streams),
+    })
+
+    return 0
+
+
+def cmd_startup(args) -> int:
+    """
+    Measures cold start in a fresh interpreter:
+    import the pipeline, build the DAG, run the first query.
+    """
+
+    t0 = time.perf_counter()
+    probe = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - t0
+
+    if probe.returncode != 0:
+        print(probe.stderr, file=sys.stderr)
+        return 1
+
+    heavy = probe.stdout.strip().splitlines()[-1]
+    within = elapsed <= args.budget and heavy == "[]"
+
+    _print({
+        "seconds": round(elapsed, 3),
+        "budget_seconds": args.budget,
+        "heavy_modules_loaded": heavy,
+        "within_budget": within,
+    })
+
+    return 0 if within else 1
+
+
+def cmd_data_fixes(args) -> int:
+    from pipeline import data_fixes
+
+    _print(data_fixes.status() if args.status else data_fixes.apply_pending())
+    return 0
+
+
+def _force(value):
+    # --force alone → every step; --force a b → those steps
+    if value is None:
+        return False
+    return value or True
+
+
+# ==================================
+# ARGUMENTS
+# ==================================
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipeline",
+        description="Run the weather + accidents pipeline without Streamlit.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--states", nargs="*", default=None, help="State codes for weather download")
+    common.add_argument("--wide", action="store_true", help="Use the wide weather format")
+
+    p = sub.add_parser("list", parents=[common], help="List DAG steps")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("run", parents=[common], help="Run the full DAG")
+    p.add_argument("--parallelism", type=int, default=4)
+    p.add_argument("--heavy-db", type=int, default=None, help="Max concurrent heavy_db steps")
+    p.add_argument("--force", nargs="*", default=None, metavar="STEP",
+                   help="Ignore fingerprints (all steps, or only those listed)")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("resume", help="Resume a failed run from its completed steps")
+    p.add_argument("run_id", type=int)
+    p.add_argument("--parallelism", type=int, default=None, help="Default: the run's own")
+    p.add_argument("--heavy-db", type=int, default=None, help="Max concurrent heavy_db steps")
+    p.set_defaults(func=cmd_resume)
+
+    p = sub.add_parser("step", parents=[common], help="Run a single step")
+    p.add_argument("name")
+    p.add_argument("--force", action="store_true", help="Ignore the step's fingerprint")
+    p.set_defaults(func=cmd_step)
+
+    p = sub.add_parser("quality", help="Check data-quality rules (sampled unless --full)")
+    p.add_argument("tables", nargs="*", metavar="TABLE")
+    p.add_argument("--full", action="store_true", help="Scan whole tables for exact rates")
+    p.set_defaults(func=cmd_quality)
+
+    p = sub.add_parser("migrate", help="Apply pending schema migrations from SQL_DIR")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--status", action="store_true", help="List applied / pending / changed files")
+    mode.add_argument("--repair", action="store_true", help="Re-apply files of missing tables")
+    mode.add_argument("--write-init", metavar="PATH", help="Regenerate init.sql from sql/")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("data-fixes", help="Apply pending one-shot data fixes (also run by run / resume)")
+    p.add_argument("--status", action="store_true", help="List applied / pending fixes")
+    p.set_defaults(func=cmd_data_fixes)
+
+    p = sub.add_parser("bench-copy", help="Compare CSV and binary COPY on landing files")
+    p.add_argument("dataset", choices=["weather", "weather_wide", "accidents", "stations"])
+    p.add_argument("--files", type=int, default=20, help="Max files to load")
+    p.set_defaults(func=cmd_bench_copy)
+
+    p = sub.add_parser("startup", help="Measure cold-start-to-first-query time")
+    p.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    p.set_defaults(func=cmd_startup)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,9 @@ import time
 from sqlalchemy import text
 
 from components.db import get_engine
-from pipeline.validators import validate_table
+from components.tuning import apply_tuning
+from components.bulk_load import bulk_load
+from pipeline.validators import validate_tables, invalidate
 from components.logger import get_logger
 
 
@@ -15,40 +17,46 @@ logger = get_logger(__name__)
 # ==================================
 # BUILD ACCIDENT → STATION MAP
 # ==================================
-def build(truncate: bool = True) -> dict:
+def build(truncate: bool = True, bulk: bool = False) -> dict:
     """
     Populate silver.accident_station_map by mapping
     each accident to its nearest station.
 
+    Existing mappings are only rewritten (and updated_at
+    bumped) when the nearest station or distance changed,
+    so gold can rebuild just the affected accidents.
+
     Args:
         truncate: If True, clears table before rebuild.
+        bulk: If True, drops secondary indexes during the load
+              and rebuilds them afterwards.
 
     Returns:
         dict with row count and execution time.
     """
 
-    engine = get_engine()
+    engine = get_engine("transform")
 
     # ----------------------------------
     # Validate Dependencies
     # ----------------------------------
-    validate_table(
-        engine,
-        "silver.us_accidents",
-        not_empty=True,
-        required_columns=["accident_id", "geom"],
-    )
-
-    validate_table(
+    validate_tables(
         engine,
-        "silver.stations",
+        ["silver.us_accidents", "silver.stations"],
         not_empty=True,
-        required_columns=["station_id", "geom"],
+        required_columns={
+            "silver.us_accidents": ["accident_id", "geom"],
+            "silver.stations": ["station_id", "geom"],
+        },
     )
 
     start_time = time.perf_counter()
 
-    with engine.begin() as conn:
+    with (
+        bulk_load(engine, ["silver.accident_station_map"], enabled=bulk),
+        engine.begin() as conn,
+    ):
+        apply_tuning(conn, "knn_join")
 
         if truncate:
             logger.info("Truncating silver.accident_station_map")
@@ -57,7 +65,7 @@ def build(truncate: bool = True) -> dict:
         logger.info("Building accident_station_map (nearest station mapping)")
 
         conn.execute(text("""
-            INSERT INTO silver.accident_station_map (
+            INSERT INTO silver.accident_station_map AS m (
                 accident_id,
                 station_id,
                 distance_km
@@ -77,9 +85,14 @@ def build(truncate: bool = True) -> dict:
             ON CONFLICT (accident_id)
             DO UPDATE SET
                 station_id = EXCLUDED.station_id,
-                distance_km = EXCLUDED.distance_km;
+                distance_km = EXCLUDED.distance_km,
+                updated_at = now()
+            WHERE (m.station_id, m.distance_km)
+                IS DISTINCT FROM (EXCLUDED.station_id, EXCLUDED.distance_km);
         """))
 
+    invalidate("silver.accident_station_map")
+
     elapsed = time.perf_counter() - start_time
 
     # ----------------------------------
@@ -1,21 +1,378 @@
 # ==================================
 # Imports
 # ==================================
+import contextvars
+import re
 import time
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from sqlalchemy import text
 
 from components.db import get_engine
-from pipeline.validators import validate_table
+from components.tuning import apply_tuning
+from components.bulk_load import bulk_load, capture_secondary_indexes
+from pipeline.validators import validate_tables, invalidate
+from pipeline.watermarks import get_watermark, set_watermark
 from components.logger import get_logger
 
 
 logger = get_logger(__name__)
 
 
+# ==================================
+# Constants
+# ==================================
+GOLD_TABLE = "gold.accident_weather"
+
+WATERMARK_PREFIX = "gold.accident_weather"
+
+# Yearly RANGE partitions on obs_date: gold.accident_weather_y<YYYY>
+PARTITION_PATTERN = re.compile(r"^accident_weather_y(\d{4})$")
+
+# Max wait for the brief lock taken by a partition swap
+SWAP_LOCK_TIMEOUT = "10s"
+
+# Upstream tables whose updated_at marks a change set
+CHANGE_SOURCES = (
+    "silver.us_accidents",
+    "silver.accident_station_map",
+    "silver.weather_daily_pivot",
+)
+
+# gold.accident_weather columns (excluding the accident_id key),
+# in the same order as the SELECT list in GOLD_SELECT.
+GOLD_COLUMNS = (
+    "station_id",
+    "distance_km",
+    "obs_date",
+    "severity",
+    "start_time",
+    "latitude",
+    "longitude",
+    "geom",
+    "state",
+    "darkness_level",
+    "tmax_c",
+    "tmin_c",
+    "prcp_mm",
+    "snow_mm",
+)
+
+# Three-way join producing gold rows.
+# {scope} restricts the accidents considered (empty for a full build),
+# {where} adds extra predicates (e.g. a partition's date range).
+GOLD_SELECT = """
+    SELECT
+        a.accident_id,
+        m.station_id,
+        m.distance_km,
+        DATE(a.start_time) AS obs_date,
+        a.severity,
+        a.start_time,
+        a.latitude,
+        a.longitude,
+        a.geom::GEOMETRY(Point, 4326),
+        a.state,
+        a.darkness_level,
+        w.tmax_c,
+        w.tmin_c,
+        w.prcp_mm,
+        w.snow_mm
+    FROM silver.us_accidents a
+    {scope}
+    JOIN silver.accident_station_map m
+        ON a.accident_id = m.accident_id
+    LEFT JOIN silver.weather_daily_pivot w
+        ON w.station_id = m.station_id
+        AND w.obs_date = DATE(a.start_time)
+    WHERE a.geom IS NOT NULL
+    {where}
+"""
+
+# Accidents whose accident row, map row or matching pivot row
+# changed inside each source's (low, high] updated_at window.
+CHANGED_ACCIDENTS = """
+    SELECT accident_id
+    FROM silver.us_accidents
+    WHERE updated_at > :acc_low AND updated_at <= :acc_high
+
+    UNION
+
+    SELECT accident_id
+    FROM silver.accident_station_map
+    WHERE updated_at > :map_low AND updated_at <= :map_high
+
+    UNION
+
+    SELECT g.accident_id
+    FROM silver.weather_daily_pivot p
+    JOIN gold.accident_weather g
+        ON g.station_id = p.station_id
+        AND g.obs_date = p.obs_date
+    WHERE p.updated_at > :pivot_low AND p.updated_at <= :pivot_high
+"""
+
+# Held in a temp table: the stale-row delete and the upsert
+# must work on the same set, and the pivot branch reads gold.
+CHANGED_ACCIDENTS_TABLE = f"""
+    CREATE TEMP TABLE gold_changed_accidents ON COMMIT DROP AS
+    {CHANGED_ACCIDENTS}
+"""
+
+# Old (state, month) rollup slices of accidents about to move
+# to another day or state; nothing else marks them for the
+# incremental rollups once the old row is deleted or rewritten.
+RETIRE_OLD_SLICES = """
+    INSERT INTO gold.rollup_retired_slices (state, month)
+    SELECT DISTINCT g.state, DATE_TRUNC('month', g.obs_date)::DATE
+    FROM gold.accident_weather g
+    JOIN gold_changed_accidents c
+        ON c.accident_id = g.accident_id
+    JOIN silver.us_accidents a
+        ON a.accident_id = g.accident_id
+    WHERE g.obs_date <> DATE(a.start_time)
+       OR g.state IS DISTINCT FROM a.state
+"""
+
+# obs_date is part of the key: an accident whose start_time moved
+# to another day would otherwise keep its row for the old day.
+DELETE_MOVED_ACCIDENTS = """
+    DELETE FROM gold.accident_weather g
+    USING gold_changed_accidents c, silver.us_accidents a
+    WHERE g.accident_id = c.accident_id
+      AND a.accident_id = c.accident_id
+      AND g.obs_date <> DATE(a.start_time)
+"""
+
+# Minimum timestamp, used when a source has no watermark yet
+EPOCH = "-infinity"
+
+
+# ==================================
+# CHANGE SET WINDOWS
+# ==================================
+def _change_windows(conn) -> dict:
+    """
+    Returns {source: (low, high)} updated_at windows per change source.
+
+    low is the source's stored watermark (None if never built),
+    high is its current MAX(updated_at), fixed up front so rows
+    changed mid-build are picked up by the next run.
+    """
+
+    windows = {}
+
+    for source in CHANGE_SOURCES:
+        high = conn.execute(
+            text(f"SELECT MAX(updated_at) FROM {source}")
+        ).scalar()
+        low = get_watermark(conn, f"{WATERMARK_PREFIX}:{source}")
+
+        windows[source] = (low, high)
+
+    return windows
+
+
+def _advance_watermarks(conn, windows: dict):
+    """
+    Stores each source's high mark. Must run in the build transaction.
+    """
+
+    for source, (_, high) in windows.items():
+        if high is not None:
+            set_watermark(conn, f"{WATERMARK_PREFIX}:{source}", high)
+
+
+# ==================================
+# PARTITIONS
+# ==================================
+def _partition_name(year: int) -> str:
+    return f"gold.accident_weather_y{year}"
+
+
+def _year_bounds(year: int) -> tuple[date, date]:
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def _existing_partition_years(conn) -> set[int]:
+    """
+    Years that currently have a partition attached to gold.
+    """
+
+    rows = conn.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:parent AS regclass)
+    """), {"parent": GOLD_TABLE}).fetchall()
+
+    years = set()
+    for (relname,) in rows:
+        match = PARTITION_PATTERN.match(relname)
+        if match:
+            years.add(int(match.group(1)))
+
+    return years
+
+
+def _silver_years(
+    conn,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list[int]:
+    """
+    Years spanned by silver.us_accidents, clipped to the requested range.
+    Uses the start_time index, so it never scans the table.
+    """
+
+    min_time, max_time = conn.execute(text("""
+        SELECT MIN(start_time), MAX(start_time)
+        FROM silver.us_accidents
+    """)).one()
+
+    if min_time is None:
+        return []
+
+    first = min_time.year if start_date is None else max(min_time.year, start_date.year)
+    last = max_time.year if end_date is None else min(max_time.year, end_date.year)
+
+    return list(range(first, last + 1))
+
+
+def ensure_partitions(conn, years: list[int]):
+    """
+    Creates any missing yearly partitions of gold.accident_weather.
+    """
+
+    existing = _existing_partition_years(conn)
+
+    for year in years:
+        if year in existing:
+            continue
+
+        lo, hi = _year_bounds(year)
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {_partition_name(year)}
+            PARTITION OF {GOLD_TABLE}
+            FOR VALUES FROM ('{lo}') TO ('{hi}')
+        """))
+
+        logger.info(f"Created partition {_partition_name(year)}")
+
+
+def _build_partition(engine, year: int) -> int:
+    """
+    Rebuilds one year of gold into a standalone staging table,
+    indexes it, then swaps it in with DETACH/ATTACH.
+
+    Readers keep querying the old partition while the staging
+    table loads; the swap itself is a short catalog-only
+    transaction. Returns the number of rows loaded.
+    """
+
+    lo, hi = _year_bounds(year)
+    partition = _partition_name(year)
+    # Index and constraint names derive from the staging table's name
+    # and stay with it after the swap; a per-build suffix keeps them
+    # from colliding with the partition being replaced.
+    stage = f"{partition}_stage_{time.time_ns():x}"
+    stage_name = stage.split(".")[1]
+    partition_name = partition.split(".")[1]
+
+    t0 = time.perf_counter()
+
+    # ----------------------------------
+    # Stage: load + index (no locks on gold)
+    # ----------------------------------
+    with engine.begin() as conn:
+        apply_tuning(conn, "heavy_transform")
+        apply_tuning(conn, "index_build")
+
+        index_defs = [d for _, d in capture_secondary_indexes(conn, GOLD_TABLE)]
+
+        conn.execute(text(f"""
+            CREATE TABLE {stage}
+            (LIKE {GOLD_TABLE} INCLUDING DEFAULTS)
+        """))
+
+        rows = conn.execute(text(f"""
+            INSERT INTO {stage} (
+                accident_id,
+                {", ".join(GOLD_COLUMNS)}
+            )
+            {GOLD_SELECT.format(
+                scope="",
+                where="AND a.start_time >= CAST(:lo AS DATE) "
+                      "AND a.start_time < CAST(:hi AS DATE)",
+            )}
+        """), {"lo": lo, "hi": hi}).rowcount
+
+        # Bounds constraint lets ATTACH skip its validation scan
+        conn.execute(text(f"""
+            ALTER TABLE {stage}
+            ADD PRIMARY KEY (accident_id, obs_date),
+            ADD CONSTRAINT {stage_name}_bounds
+                CHECK (obs_date >= DATE '{lo}' AND obs_date < DATE '{hi}')
+        """))
+
+        # Matching indexes are attached to the parent's, not rebuilt
+        for indexdef in index_defs:
+            conn.execute(text(re.sub(
+                r"^CREATE INDEX \S+ ON (ONLY )?\S+ ",
+                f"CREATE INDEX ON {stage} ",
+                indexdef,
+            )))
+
+        conn.execute(text(f"ANALYZE {stage}"))
+
+    # ----------------------------------
+    # Swap: DETACH old, ATTACH staged
+    # ----------------------------------
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT set_config('lock_timeout', :timeout, true)"),
+            {"timeout": SWAP_LOCK_TIMEOUT},
+        )
+
+        if year in _existing_partition_years(conn):
+            conn.execute(text(
+                f"ALTER TABLE {GOLD_TABLE} DETACH PARTITION {partition}"
+            ))
+            conn.execute(text(f"DROP TABLE {partition}"))
+
+        conn.execute(text(f"ALTER TABLE {stage} RENAME TO {partition_name}"))
+        conn.execute(text(f"""
+            ALTER TABLE {GOLD_TABLE}
+            ATTACH PARTITION {partition}
+            FOR VALUES FROM ('{lo}') TO ('{hi}')
+        """))
+
+        # ATTACH fires no DML triggers; record the change explicitly
+        conn.execute(
+            text("SELECT meta.bump_table_version(:table)"),
+            {"table": GOLD_TABLE},
+        )
+
+    logger.info(
+        f"Swapped in {partition}: {rows:,} rows "
+        f"in {time.perf_counter() - t0:.2f} seconds"
+    )
+
+    return rows
+
+
 # ==================================
 # BUILD GOLD: accident_weather
 # ==================================
-def build(truncate: bool = True) -> dict:
+def build(
+    truncate: bool = True,
+    bulk: bool = False,
+    incremental: bool = False,
+    staged: bool = True,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    max_workers: int = 1,
+) -> dict:
     """
     Build gold.accident_weather fact table.
 
@@ -23,87 +380,190 @@ def build(truncate: bool = True) -> dict:
     - silver.us_accidents
     - silver.accident_station_map
     - silver.weather_daily_pivot
+
+    Modes:
+        incremental=True
+            Upserts only the accidents whose silver row, station
+            mapping or matching weather pivot row changed
+            (updated_at) since the last build. Late-arriving
+            weather therefore fills in existing gold rows.
+            An accident whose start date moved has its row for
+            the old obs_date deleted.
+            Without stored watermarks every accident is
+            considered once. Rows deleted upstream are not
+            tracked; use a full build after deleting silver data.
+
+        staged=True (default full build)
+            Rebuilds each yearly partition in [start_date, end_date]
+            (default: every year) into a staging table and swaps
+            it in with DETACH/ATTACH. Readers are never blocked
+            for the length of the build, and a one-year backfill
+            only reads one year of silver. `max_workers` partitions
+            build at once. `truncate` is implied.
+
+        staged=False
+            Legacy in-place build: optional TRUNCATE of the whole
+            table, then INSERT ... SELECT in one transaction.
+            bulk=True drops the gold secondary indexes for the
+            load and rebuilds them in parallel afterwards.
     """
 
-    engine = get_engine()
+    engine = get_engine("transform")
 
     # ----------------------------------
     # Validate Dependencies
     # ----------------------------------
-    validate_table(engine, "silver.us_accidents", not_empty=True)
-    validate_table(engine, "silver.accident_station_map", not_empty=True)
-    validate_table(engine, "silver.weather_daily_pivot", not_empty=True)
+    validate_tables(
+        engine,
+        [
+            "silver.us_accidents",
+            "silver.accident_station_map",
+            "silver.weather_daily_pivot",
+        ],
+        not_empty=True,
+    )
 
     start_time = time.perf_counter()
+    full_range = start_date is None and end_date is None
 
-    with engine.begin() as conn:
+    # ----------------------------------
+    # Staged Partition Build
+    # ----------------------------------
+    if staged and not incremental:
+        with engine.begin() as conn:
+            windows = _change_windows(conn)
+            years = _silver_years(conn, start_date, end_date)
 
-        if truncate:
-            logger.info("Truncating gold.accident_weather")
-            conn.execute(text("TRUNCATE TABLE gold.accident_weather"))
+            # A full rebuild also empties partitions silver no longer covers
+            if full_range:
+                years = sorted(set(years) | _existing_partition_years(conn))
 
-        logger.info("Building gold.accident_weather")
+        logger.info(
+            f"Building gold.accident_weather (staged, years={years})"
+        )
 
-        conn.execute(text("""
-            INSERT INTO gold.accident_weather (
-                accident_id,
-                station_id,
-                distance_km,
-                obs_date,
-                severity,
-                start_time,
-                latitude,
-                longitude,
-                geom,
-                state,
-                darkness_level,
-                tmax_c,
-                tmin_c,
-                prcp_mm,
-                snow_mm
-            )
-            SELECT
-                a.accident_id,
-                m.station_id,
-                m.distance_km,
-                DATE(a.start_time) AS obs_date,
-                a.severity,
-                a.start_time,
-                a.latitude,
-                a.longitude,
-                a.geom::GEOMETRY(Point, 4326),
-                a.state,
-                a.darkness_level,
-                w.tmax_c,
-                w.tmin_c,
-                w.prcp_mm,
-                w.snow_mm
-            FROM silver.us_accidents a
-            JOIN silver.accident_station_map m
-                ON a.accident_id = m.accident_id
-            LEFT JOIN silver.weather_daily_pivot w
-                ON w.station_id = m.station_id
-                AND w.obs_date = DATE(a.start_time)
-            WHERE a.geom IS NOT NULL
-            ON CONFLICT (accident_id) DO NOTHING;
-        """))
+        inserted, updated = 0, 0
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _build_partition, engine, year)
+                for year in years
+            ]
+            for f in as_completed(futures):
+                inserted += f.result()
+
+        # Only a full rebuild consumes the change sets
+        if full_range:
+            with engine.begin() as conn:
+                _advance_watermarks(conn, windows)
+
+    else:
+        with (
+            bulk_load(engine, [GOLD_TABLE], enabled=bulk and not incremental),
+            engine.begin() as conn,
+        ):
+            apply_tuning(conn, "heavy_transform")
+
+            windows = _change_windows(conn)
+            ensure_partitions(conn, _silver_years(conn))
+
+            # ----------------------------------
+            # Incremental (change sets)
+            # ----------------------------------
+            if incremental:
+                params = {}
+                for source, key in zip(CHANGE_SOURCES, ("acc", "map", "pivot")):
+                    low, high = windows[source]
+                    params[f"{key}_low"] = low if low is not None else EPOCH
+                    params[f"{key}_high"] = high if high is not None else EPOCH
+
+                logger.info("Building gold.accident_weather (incremental)")
+
+                update_set = ",\n".join(
+                    f"{c} = EXCLUDED.{c}" for c in GOLD_COLUMNS
+                )
+                current_row = ", ".join(f"g.{c}" for c in GOLD_COLUMNS)
+                incoming_row = ", ".join(f"EXCLUDED.{c}" for c in GOLD_COLUMNS)
+
+                conn.execute(text(CHANGED_ACCIDENTS_TABLE), params)
+                conn.execute(text(RETIRE_OLD_SLICES))
+
+                moved = conn.execute(text(DELETE_MOVED_ACCIDENTS)).rowcount
+                if moved:
+                    logger.info(f"Deleted {moved:,} gold rows whose accident moved to another day")
+
+                scope = "JOIN gold_changed_accidents c ON c.accident_id = a.accident_id"
+
+                inserted, updated = conn.execute(text(f"""
+                    WITH upserted AS (
+                        INSERT INTO gold.accident_weather AS g (
+                            accident_id,
+                            {", ".join(GOLD_COLUMNS)}
+                        )
+                        {GOLD_SELECT.format(scope=scope, where="")}
+                        ON CONFLICT (accident_id, obs_date) DO UPDATE SET
+                            {update_set},
+                            updated_at = now()
+                        WHERE ({current_row})
+                            IS DISTINCT FROM ({incoming_row})
+                        RETURNING (xmax = 0) AS inserted
+                    )
+                    SELECT
+                        COUNT(*) FILTER (WHERE inserted),
+                        COUNT(*) FILTER (WHERE NOT inserted)
+                    FROM upserted
+                """)).one()
+
+            # ----------------------------------
+            # Legacy In-Place Build
+            # ----------------------------------
+            else:
+                if truncate:
+                    logger.info("Truncating gold.accident_weather")
+                    conn.execute(text("TRUNCATE TABLE gold.accident_weather"))
+
+                logger.info("Building gold.accident_weather")
+
+                result = conn.execute(text(f"""
+                    INSERT INTO gold.accident_weather (
+                        accident_id,
+                        {", ".join(GOLD_COLUMNS)}
+                    )
+                    {GOLD_SELECT.format(scope="", where="")}
+                    ON CONFLICT (accident_id, obs_date) DO NOTHING;
+                """))
+
+                inserted, updated = result.rowcount, 0
+
+            # Change sets are consumed atomically with the gold rows
+            _advance_watermarks(conn, windows)
+
+    invalidate(GOLD_TABLE)
 
     elapsed = time.perf_counter() - start_time
 
     # ----------------------------------
     # Row Count
     # ----------------------------------
-    with engine.connect() as conn:
-        count = conn.execute(
-            text("SELECT COUNT(*) FROM gold.accident_weather")
-        ).scalar()
+    # Incremental and backfill builds report the delta;
+    # a full COUNT(*) would cost as much as the build itself.
+    if incremental or not full_range:
+        count = inserted + updated
+    else:
+        with engine.connect() as conn:
+            count = conn.execute(
+                text("SELECT COUNT(*) FROM gold.accident_weather")
+            ).scalar()
 
     logger.info(
         f"Gold accident_weather built: {count:,} rows "
+        f"({inserted:,} inserted, {updated:,} updated) "
         f"in {elapsed:.2f} seconds"
     )
 
     return {
         "rows_written": count,
+        "rows_inserted": inserted,
+        "rows_updated": updated,
         "seconds": round(elapsed, 2),
     }
@@ -2,15 +2,27 @@
 # Imports
 # ==================================
 from pathlib import Path
+import hashlib
+import io
+import json
 import time
+import zipfile
 from sqlalchemy import text
 
-from components.db import get_engine
-from pipeline.validators import validate_table
+from components.db import get_engine, copy_connection, copy_csv_stream, resolve_copy_format
+from components.bulk_load import bulk_load
+from components.tuning import apply_tuning
+from components.resilient_copy import copy_csv_resilient
+from pipeline.validators import validate_table, invalidate
+from pipeline.watermarks import (
+    get_watermark,
+    lock_for_ingest,
+    reset_watermarks,
+    safe_high_water,
+    set_watermark,
+)
 from components.logger import get_logger
 
-from kaggle.api.kaggle_api_extended import KaggleApi
-
 logger = get_logger(__name__)
 
 
@@ -19,60 +31,275 @@ logger = get_logger(__name__)
 # ==================================
 LANDING_DIR = Path("/data/landing/accidents")
 ARCHIVE_DIR = Path("/data/archive/accidents")
+REJECT_DIR = Path("/data/rejects/accidents")
+
+
+# ==================================
+# Columns
+# ==================================
 
-LANDING_DIR.mkdir(parents=True, exist_ok=True)
-ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+# CSV column order of the Kaggle file.
+# Listed explicitly so COPY leaves ingested_at to its default.
+BRONZE_COLUMNS = (
+    "id", "source", "severity", "start_time", "end_time",
+    "start_lat", "start_lng", "end_lat", "end_lng", "distance_mi",
+    "description", "street", "city", "county", "state", "zipcode",
+    "country", "timezone", "airport_code", "weather_timestamp",
+    "temperature_f", "wind_chill_f", "humidity_pct", "pressure_in",
+    "visibility_mi", "wind_direction", "wind_speed_mph",
+    "precipitation_in", "weather_condition", "amenity", "bump",
+    "crossing", "give_way", "junction", "no_exit", "railway",
+    "roundabout", "station", "stop", "traffic_calming",
+    "traffic_signal", "turning_loop", "sunrise_sunset",
+    "civil_twilight", "nautical_twilight", "astronomical_twilight",
+)
+
+# silver.us_accidents columns (excluding the accident_id key),
+# in the same order as the SELECT list in transform().
+SILVER_COLUMNS = (
+    "severity", "start_time", "end_time", "duration_minutes",
+    "latitude", "longitude", "city", "county", "state", "zipcode",
+    "weather_time", "temperature_f", "wind_chill_f", "humidity_pct",
+    "pressure_in", "visibility_mi", "wind_speed_mph",
+    "precipitation_in", "weather_condition", "is_amenity", "is_bump",
+    "is_crossing", "is_give_way", "is_junction", "is_no_exit",
+    "is_railway", "is_roundabout", "is_station", "is_stop",
+    "is_traffic_calming", "is_traffic_signal", "is_turning_loop",
+    "darkness_level", "geom",
+)
+
+WATERMARK_PREFIX = "accidents.transform"
+
+
+# ==================================
+# ARCHIVE VERIFICATION
+# ==================================
+def _checksum_path(zip_path: Path) -> Path:
+    """
+    Sidecar file caching the verified checksum of a zip archive.
+    """
+
+    return zip_path.with_name(zip_path.name + ".sha256.json")
+
+
+def _is_verified(zip_path: Path) -> bool:
+    """
+    True if the archive has a cached checksum matching its
+    current size and mtime (i.e. it was verified and not touched since).
+    """
+
+    sidecar = _checksum_path(zip_path)
+
+    if not sidecar.exists():
+        return False
+
+    cached = json.loads(sidecar.read_text())
+    stat = zip_path.stat()
+
+    return (
+        cached.get("size") == stat.st_size
+        and cached.get("mtime") == stat.st_mtime
+    )
+
+
+def _verify_archive(zip_path: Path) -> str:
+    """
+    Verify a downloaded zip once and cache the result.
+
+    Verification checks the CRC of every member and computes
+    the archive SHA-256. Later calls return the cached digest
+    without reading the archive again.
+
+    Raises:
+        zipfile.BadZipFile: if any member fails its CRC check.
+    """
+
+    sidecar = _checksum_path(zip_path)
+
+    if _is_verified(zip_path):
+        return json.loads(sidecar.read_text())["sha256"]
+
+    logger.info(f"Verifying archive {zip_path.name}")
+
+    with zipfile.ZipFile(zip_path) as zf:
+        bad_member = zf.testzip()
+
+    if bad_member is not None:
+        raise zipfile.BadZipFile(
+            f"Corrupt member {bad_member} in {zip_path.name}"
+        )
+
+    digest = hashlib.sha256()
+    with open(zip_path, "rb") as f:
+        for chunk in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            digest.update(chunk)
+
+    stat = zip_path.stat()
+    sidecar.write_text(json.dumps({
+        "sha256": digest.hexdigest(),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+    }))
+
+    logger.info(f"Archive verified: {zip_path.name} ({digest.hexdigest()})")
+
+    return digest.hexdigest()
+
+
+def _archive_source(path: Path):
+    """
+    Move an ingested landing file (and its checksum sidecar) to archive.
+    """
+
+    sidecar = _checksum_path(path)
+
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    path.rename(ARCHIVE_DIR / path.name)
+
+    if sidecar.exists():
+        sidecar.rename(ARCHIVE_DIR / sidecar.name)
 
 
 # ==================================
 # DOWNLOAD
 # ==================================
-def download() -> dict:
+def download(unzip: bool = True) -> dict:
     """
     Download US Accidents dataset from Kaggle.
     Uses environment variables for authentication.
+
+    Args:
+        unzip: If False, keep the archive compressed in landing.
+               ingest() then streams the CSV straight out of the
+               zip, so the ~3GB extracted file never hits disk.
+               A verified archive already sitting in the accidents
+               archive directory is restored instead of re-downloaded.
     """
 
     dataset = "sobhanmoosavi/us-accidents"
 
+    LANDING_DIR.mkdir(parents=True, exist_ok=True)
+
     # Skip if CSV already exists
     if list(LANDING_DIR.glob("*.csv")):
         logger.info("Accidents dataset already exists. Skipping download.")
         return {"status": "exists"}
 
+    if not unzip:
+
+        # Skip if a verified archive is already staged
+        if any(_is_verified(z) for z in LANDING_DIR.glob("*.zip")):
+            logger.info("Accidents archive already staged. Skipping download.")
+            return {"status": "exists"}
+
+        # Re-ingest: restore a previously verified archive
+        for zip_path in ARCHIVE_DIR.glob("*.zip"):
+            if _is_verified(zip_path):
+                sidecar = _checksum_path(zip_path)
+                zip_path.rename(LANDING_DIR / zip_path.name)
+                sidecar.rename(LANDING_DIR / sidecar.name)
+
+                logger.info(
+                    f"Restored verified archive {zip_path.name} "
+                    f"from archive. Skipping download."
+                )
+                return {"status": "restored"}
+
     logger.info("Downloading accidents dataset from Kaggle")
 
+    # Imported here: the Kaggle client is slow to import and
+    # authenticates on import, which only downloads need
+    from kaggle.api.kaggle_api_extended import KaggleApi
+
     api = KaggleApi()
     api.authenticate()
 
     api.dataset_download_files(
         dataset,
         path=LANDING_DIR,
-        unzip=True
+        unzip=unzip
     )
 
+    if not unzip:
+        for zip_path in LANDING_DIR.glob("*.zip"):
+            _verify_archive(zip_path)
+
     logger.info("Download complete")
 
     return {"status": "downloaded"}
 
+
+def _open_csv_streams(source: Path):
+    """
+    Yield (name, text stream) for every CSV in a landing source.
+
+    Plain CSV files are opened directly. Zip archives are
+    verified (cached after the first time) and each CSV
+    member is decompressed on the fly, so nothing is
+    extracted to disk.
+    """
+
+    if source.suffix.lower() == ".zip":
+        _verify_archive(source)
+
+        with zipfile.ZipFile(source) as zf:
+            for member in zf.namelist():
+                if not member.lower().endswith(".csv"):
+                    continue
+
+                with zf.open(member) as raw:
+                    yield member, io.TextIOWrapper(
+                        raw, encoding="utf-8", newline=""
+                    )
+    else:
+        with open(source, "r", newline="") as f:
+            yield source.name, f
+
 # ==================================
 # INGEST → BRONZE (COPY BASED)
 # ==================================
-def ingest(truncate: bool = False) -> dict:
+def ingest(
+    truncate: bool = False,
+    bulk: bool = False,
+    resilient: bool = False,
+    copy_format: str = "csv",
+) -> dict:
     """
     Stream large accident CSV(s) into bronze.us_accidents
     using PostgreSQL COPY (memory safe).
+
+    Landing sources can be plain CSVs or zip archives from
+    download(unzip=False); zip members are streamed into COPY
+    without extraction. All CSVs of one source load in a
+    single transaction (one batch).
+
+    bulk=True drops the bronze secondary indexes for the load
+    and rebuilds them afterwards (see components.bulk_load).
+
+    resilient=True loads in savepointed chunks and diverts
+    malformed rows to REJECT_DIR/<member>.rejects.csv, so one
+    bad line never aborts the whole file.
+
+    copy_format="binary" converts rows to typed values and
+    loads them with psycopg 3 binary COPY, so the server skips
+    text parsing of the timestamp, numeric and boolean columns.
+    Resilient loads always use CSV.
     """
 
-    engine = get_engine()
-    files = list(LANDING_DIR.glob("*.csv"))
+    engine = get_engine("bulk")
+    copy_format = "csv" if resilient else resolve_copy_format(copy_format)
+    files = (
+        list(LANDING_DIR.glob("*.csv"))
+        + list(LANDING_DIR.glob("*.zip"))
+    )
 
     if not files:
         raise FileNotFoundError(
-            "No accident CSV files found in landing directory."
+            "No accident CSV or zip files found in landing directory."
         )
 
     total_rows = 0
+    total_rejected = 0
     start_time = time.perf_counter()
 
     # ----------------------------------
@@ -86,47 +313,64 @@ def ingest(truncate: bool = False) -> dict:
     # ----------------------------------
     # COPY Per File (Safe + Resume Friendly)
     # ----------------------------------
-    for file in files:
-        logger.info(f"COPY ingest started: {file.name}")
-
-        raw_conn = engine.raw_connection()
-        try:
-            cur = raw_conn.cursor()
-
-            with open(file, "r") as f:
-                cur.copy_expert(
-                    """
-                    COPY bronze.us_accidents
-                    FROM STDIN
-                    WITH (FORMAT CSV, HEADER TRUE)
-                    """,
-                    f,
-                )
-
-            raw_conn.commit()
-
-            # Fast line count (minus header)
-            with open(file, "r") as f:
-                row_count = sum(1 for _ in f) - 1
+    with bulk_load(engine, ["bronze.us_accidents"], enabled=bulk):
+        for file in files:
+            logger.info(f"COPY ingest started: {file.name}")
+
+            with copy_connection(engine, copy_format) as raw_conn:
+                # First: ingested_at is fixed at transaction start
+                lock_for_ingest(raw_conn, "bronze.us_accidents")
+                apply_tuning(raw_conn, "bulk_load")
+                cur = raw_conn.cursor()
+
+                row_count = 0
+
+                for member, f in _open_csv_streams(file):
+                    if resilient:
+                        stats = copy_csv_resilient(
+                            raw_conn,
+                            "bronze.us_accidents",
+                            BRONZE_COLUMNS,
+                            f,
+                            REJECT_DIR / f"{Path(member).name}.rejects.csv",
+                        )
+                        copied = stats["accepted"]
+                        total_rejected += stats["rejected"]
+                    else:
+                        copied = copy_csv_stream(
+                            raw_conn,
+                            "bronze.us_accidents",
+                            BRONZE_COLUMNS,
+                            f,
+                            copy_format,
+                        )
+
+                    logger.info(f"Copied {member} ({copied:,} rows)")
+                    row_count += copied
+
+                # Every row of this COPY is tagged with the
+                # transaction start time via the ingested_at default
+                cur.execute("SELECT now()")
+                batch_ts = cur.fetchone()[0]
+
+                raw_conn.commit()
+
+                total_rows += row_count
+
+                # Move to archive AFTER successful commit
+                _archive_source(file)
 
-            total_rows += row_count
-
-            # Move to archive AFTER successful commit
-            file.rename(ARCHIVE_DIR / file.name)
-
-            logger.info(
-                f"Finished ingest {file.name} "
-                f"({row_count:,} rows)"
-            )
-
-        finally:
-            raw_conn.close()
+                logger.info(
+                    f"Finished ingest {file.name} "
+                    f"({row_count:,} rows, batch {batch_ts.isoformat()})"
+                )
 
     elapsed = time.perf_counter() - start_time
 
     # ----------------------------------
     # Post-Ingest Validation
     # ----------------------------------
+    invalidate("bronze.us_accidents")
     validate_table(
         engine,
         "bronze.us_accidents",
@@ -142,27 +386,78 @@ def ingest(truncate: bool = False) -> dict:
 
     logger.info(
         f"Inserted {total_rows:,} rows into bronze.us_accidents "
-        f"in {elapsed:.2f} seconds"
+        f"({total_rejected:,} rejected) in {elapsed:.2f} seconds"
     )
 
     return {
         "rows_inserted": total_rows,
+        "rows_rejected": total_rejected,
         "seconds": round(elapsed, 2),
     }
 
 # ==================================
 # TRANSFORM → SILVER
 # ==================================
+def _watermark_name(states: list[str] | None) -> str:
+    """
+    Builds the watermark key for one transform scope.
+
+    The state filter is part of the key: rows of other states
+    were never processed, so a different state set must start
+    from its own (empty) watermark. The weather date range is
+    not; see _range_names.
+    """
+
+    state_key = ",".join(sorted(states)) if states else "*"
+
+    return f"{WATERMARK_PREFIX}[states={state_key}]"
+
+
+def _range_names(watermark_name: str) -> tuple[str, str]:
+    """
+    Watermarks holding the weather date range the scope's
+    last run was restricted to (absent: unrestricted). Bronze
+    rows outside it were skipped, so when the range grows
+    only the newly covered days are rescanned.
+    """
+
+    return f"{watermark_name}:range_from", f"{watermark_name}:range_to"
+
+
 def transform(
     truncate: bool = False,
     states: list[str] | None = None,
     restrict_to_weather_range: bool = True,
+    weather_table: str = "silver.weather_daily",
+    incremental: bool = True,
+    bulk: bool = False,
 ) -> dict:
     """
     Transform bronze.us_accidents → silver.us_accidents
+
+    Incremental mode (default) only reads bronze rows whose
+    ingested_at is newer than the scope's watermark in
+    meta.watermarks. The watermark advances in the same
+    transaction as the upsert.
+
+    restrict_to_weather_range filters accidents to the dates
+    covered by `weather_table` (silver.weather_daily_pivot for
+    the wide weather path). The range is not part of the
+    watermark: when it grows, the newly covered days are
+    read once regardless of ingested_at.
+
+    Existing silver rows are updated only when a column
+    actually changed, so the returned counts are exact:
+        rows_inserted: new accident_ids
+        rows_updated:  existing rows whose values changed
+        rows_skipped:  candidate rows already identical in silver
+
+    bulk=True drops the silver secondary indexes (GiST geom,
+    state/time) for the load and rebuilds them afterwards.
+    Intended for full reloads, not small incremental batches.
     """
 
-    engine = get_engine()
+    engine = get_engine("transform")
 
     # ----------------------------------
     # Pre-Validation
@@ -177,6 +472,7 @@ def transform(
             "end_time",
             "start_lat",
             "start_lng",
+            "ingested_at",
         ],
     )
 
@@ -185,7 +481,11 @@ def transform(
     # ----------------------------------
     # Transaction Block
     # ----------------------------------
-    with engine.begin() as conn:
+    with (
+        bulk_load(engine, ["silver.us_accidents"], enabled=bulk),
+        engine.begin() as conn,
+    ):
+        apply_tuning(conn, "heavy_transform")
 
         # ----------------------------------
         # Optional Truncate
@@ -194,11 +494,15 @@ def transform(
             logger.info("Truncating silver.us_accidents")
             conn.execute(text("TRUNCATE TABLE silver.us_accidents"))
 
+            # Every scope must rescan once silver is empty
+            reset_watermarks(conn, WATERMARK_PREFIX)
+
         # ----------------------------------
         # Build Dynamic Filters
         # ----------------------------------
         filters = ["start_lat IS NOT NULL", "start_lng IS NOT NULL"]
         params = {}
+        weather_range = None
 
         # State Filter
         if states:
@@ -210,15 +514,16 @@ def transform(
 
         # Weather Date Restriction
         if restrict_to_weather_range:
-            weather_result = conn.execute(text("""
+            weather_result = conn.execute(text(f"""
                 SELECT
                     MIN(obs_date) AS min_date,
                     MAX(obs_date) AS max_date
-                FROM silver.weather_daily
+                FROM {weather_table}
             """)).fetchone()
 
             if weather_result and weather_result[0] and weather_result[1]:
                 min_date, max_date = weather_result
+                weather_range = (min_date, max_date)
 
                 filters.append(
                     "start_time::DATE BETWEEN :min_date AND :max_date"
@@ -235,119 +540,190 @@ def transform(
                     "Weather range not found. Skipping restriction."
                 )
 
+        # ----------------------------------
+        # Watermark Window
+        # ----------------------------------
+        # Upper bound is fixed up front, below any batch still
+        # being written, so those rows are picked up next run.
+        watermark_name = _watermark_name(states)
+        range_names = _range_names(watermark_name)
+        high_water = safe_high_water(conn, "bronze.us_accidents")
+
+        low_water = (
+            get_watermark(conn, watermark_name) if incremental else None
+        )
+
+        # Days now in range that the last run filtered out: their
+        # rows may predate the watermark and still need a pass
+        previous_range = None
+        if low_water is not None:
+            range_from, range_to = (get_watermark(conn, n) for n in range_names)
+            if range_from is not None and range_to is not None:
+                previous_range = (range_from.date(), range_to.date())
+
+        range_grew = previous_range is not None and (
+            weather_range is None
+            or weather_range[0] < previous_range[0]
+            or weather_range[1] > previous_range[1]
+        )
+
+        if high_water is None or (
+            low_water is not None and high_water <= low_water and not range_grew
+        ):
+            logger.info(
+                f"No new bronze batches since {low_water}. "
+                f"Skipping transform."
+            )
+
+            elapsed = time.perf_counter() - start_time_perf
+
+            return {
+                "rows_inserted": 0,
+                "rows_updated": 0,
+                "rows_skipped": 0,
+                "rows_written": 0,
+                "watermark": low_water,
+                "seconds": round(elapsed, 2),
+            }
+
+        if low_water is not None and range_grew:
+            filters.append(
+                "(ingested_at > :low_water "
+                "OR start_time::DATE NOT BETWEEN :previous_from AND :previous_to)"
+            )
+            params["low_water"] = low_water
+            params["previous_from"], params["previous_to"] = previous_range
+            logger.info(
+                f"Incremental transform from watermark {low_water}, plus days "
+                f"outside the previous weather range "
+                f"{previous_range[0]} → {previous_range[1]}"
+            )
+
+        elif low_water is not None:
+            filters.append("ingested_at > :low_water")
+            params["low_water"] = low_water
+            logger.info(f"Incremental transform from watermark {low_water}")
+
+        filters.append("ingested_at <= :high_water")
+        params["high_water"] = high_water
+
         where_clause = " AND ".join(filters)
 
         # ----------------------------------
-        # Execute Insert
+        # Execute Upsert
         # ----------------------------------
-        insert_sql = text(f"""
-            INSERT INTO silver.us_accidents (
-                accident_id,
-                severity,
-                start_time,
-                end_time,
-                duration_minutes,
-                latitude,
-                longitude,
-                city,
-                county,
-                state,
-                zipcode,
-                weather_time,
-                temperature_f,
-                wind_chill_f,
-                humidity_pct,
-                pressure_in,
-                visibility_mi,
-                wind_speed_mph,
-                precipitation_in,
-                weather_condition,
-                is_amenity,
-                is_bump,
-                is_crossing,
-                is_give_way,
-                is_junction,
-                is_no_exit,
-                is_railway,
-                is_roundabout,
-                is_station,
-                is_stop,
-                is_traffic_calming,
-                is_traffic_signal,
-                is_turning_loop,
-                darkness_level,
-                geom
+        update_set = ",\n".join(
+            f"{c} = EXCLUDED.{c}" for c in SILVER_COLUMNS
+        )
+        current_row = ", ".join(f"t.{c}" for c in SILVER_COLUMNS)
+        incoming_row = ", ".join(f"EXCLUDED.{c}" for c in SILVER_COLUMNS)
+
+        upsert_sql = text(f"""
+            WITH src AS (
+                SELECT
+                    id,
+                    severity::SMALLINT,
+                    start_time::TIMESTAMPTZ,
+                    end_time::TIMESTAMPTZ,
+                    EXTRACT(EPOCH FROM 
+                        (end_time::TIMESTAMPTZ - start_time::TIMESTAMPTZ)
+                    ) / 60,
+                    start_lat,
+                    start_lng,
+                    city,
+                    county,
+                    state,
+                    zipcode,
+                    weather_timestamp::TIMESTAMPTZ,
+                    temperature_f,
+                    wind_chill_f,
+                    humidity_pct,
+                    pressure_in,
+                    visibility_mi,
+                    wind_speed_mph,
+                    precipitation_in,
+                    weather_condition,
+                    amenity,
+                    bump,
+                    crossing,
+                    give_way,
+                    junction,
+                    no_exit,
+                    railway,
+                    roundabout,
+                    station,
+                    stop,
+                    traffic_calming,
+                    traffic_signal,
+                    turning_loop,
+                    CASE
+                        WHEN sunrise_sunset = 'Night' THEN 3
+                        WHEN civil_twilight = 'Night' THEN 2
+                        WHEN nautical_twilight = 'Night' THEN 1
+                        ELSE 0
+                    END,
+                    ST_SetSRID(
+                        ST_MakePoint(start_lng, start_lat),
+                        4326
+                    )::GEOMETRY(Point, 4326)
+                FROM bronze.us_accidents
+                WHERE {where_clause}
+            ),
+            upserted AS (
+                INSERT INTO silver.us_accidents AS t (
+                    accident_id,
+                    {", ".join(SILVER_COLUMNS)}
+                )
+                SELECT * FROM src
+                ON CONFLICT (accident_id) DO UPDATE SET
+                    {update_set},
+                    updated_at = now()
+                WHERE ({current_row})
+                    IS DISTINCT FROM ({incoming_row})
+                RETURNING (xmax = 0) AS inserted
             )
             SELECT
-                id,
-                severity::SMALLINT,
-                start_time::TIMESTAMPTZ,
-                end_time::TIMESTAMPTZ,
-                EXTRACT(EPOCH FROM 
-                    (end_time::TIMESTAMPTZ - start_time::TIMESTAMPTZ)
-                ) / 60,
-                start_lat,
-                start_lng,
-                city,
-                county,
-                state,
-                zipcode,
-                weather_timestamp::TIMESTAMPTZ,
-                temperature_f,
-                wind_chill_f,
-                humidity_pct,
-                pressure_in,
-                visibility_mi,
-                wind_speed_mph,
-                precipitation_in,
-                weather_condition,
-                amenity,
-                bump,
-                crossing,
-                give_way,
-                junction,
-                no_exit,
-                railway,
-                roundabout,
-                station,
-                stop,
-                traffic_calming,
-                traffic_signal,
-                turning_loop,
-                CASE
-                    WHEN sunrise_sunset = 'Night' THEN 3
-                    WHEN civil_twilight = 'Night' THEN 2
-                    WHEN nautical_twilight = 'Night' THEN 1
-                    ELSE 0
-                END,
-                ST_SetSRID(
-                    ST_MakePoint(start_lng, start_lat),
-                    4326
-                )::GEOMETRY(Point, 4326)
-            FROM bronze.us_accidents
-            WHERE {where_clause}
-            ON CONFLICT (accident_id) DO NOTHING
+                (SELECT COUNT(*) FROM src) AS candidates,
+                COUNT(*) FILTER (WHERE inserted) AS inserted,
+                COUNT(*) FILTER (WHERE NOT inserted) AS updated
+            FROM upserted
         """)
 
-        result = conn.execute(insert_sql, params)
+        candidates, rows_inserted, rows_updated = conn.execute(
+            upsert_sql, params
+        ).one()
+
+        rows_skipped = candidates - rows_inserted - rows_updated
+
+        # Advance watermark atomically with the upsert
+        set_watermark(conn, watermark_name, high_water)
 
-        # ⚠️ rowcount with INSERT + ON CONFLICT can be unreliable in PG
-        rows_written = result.rowcount if result.rowcount else 0
+        if weather_range is not None:
+            for name, bound in zip(range_names, weather_range):
+                set_watermark(conn, name, bound)
+        else:
+            reset_watermarks(conn, f"{watermark_name}:")
 
     # ----------------------------------
     # Post Validation
     # ----------------------------------
+    invalidate("silver.us_accidents")
     validate_table(engine, "silver.us_accidents", not_empty=True)
 
     elapsed = time.perf_counter() - start_time_perf
 
     logger.info(
-        f"Transformed {rows_written:,} rows "
-        f"in {elapsed:.2f} sec"
+        f"Transformed {candidates:,} bronze rows "
+        f"(inserted={rows_inserted:,}, updated={rows_updated:,}, "
+        f"skipped={rows_skipped:,}) in {elapsed:.2f} sec"
     )
 
     return {
-        "rows_written": rows_written,
+        "rows_inserted": rows_inserted,
+        "rows_updated": rows_updated,
+        "rows_skipped": rows_skipped,
+        "rows_written": rows_inserted + rows_updated,
+        "watermark": high_water,
         "seconds": round(elapsed, 2),
     }
 
@@ -0,0 +1,379 @@
+# ==================================
+# Imports
+# ==================================
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from components.db import ENGINE_PROFILES, get_engine
+from components.logger import get_logger, log_context
+from pipeline.fingerprints import fingerprint, get_fingerprint, set_fingerprint
+from pipeline.run_history import StepMetrics, install_db_timer, record_step
+
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# DEFAULTS
+# ==================================
+DEFAULT_PARALLELISM = 4
+
+# Max concurrent steps per resource tag. Untagged steps
+# are only limited by the worker pool.
+DEFAULT_RESOURCE_LIMITS = {
+    "heavy_db": 1,
+    "network": 2,
+}
+
+
+# ==================================
+# STEP
+# ==================================
+@dataclass
+class Step:
+    """
+    One node of the pipeline DAG.
+
+    name:      Unique step name.
+    func:      Zero-argument callable doing the work.
+    deps:      Names of steps that must succeed first.
+    resources: Tags whose concurrency is capped by the
+               scheduler's resource limits (e.g. "heavy_db").
+    inputs:    Optional zero-argument callable describing the
+               step's inputs (table versions, file digests,
+               parameters). When its fingerprint matches the
+               one stored after the last successful run, the
+               step is skipped.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    deps: tuple[str, ...] = ()
+    resources: tuple[str, ...] = ()
+    inputs: Callable[[], dict] | None = None
+
+
+class DagError(RuntimeError):
+    """
+    Raised when a step fails. Carries the partial run report.
+    """
+
+    def __init__(self, step: str, report: dict):
+        super().__init__(f"Pipeline step failed: {step}")
+        self.step = step
+        self.report = report
+
+
+# ==================================
+# VALIDATION
+# ==================================
+def _validate(steps: list[Step]) -> dict[str, Step]:
+    """
+    Checks names are unique, deps exist and there is no cycle.
+    """
+
+    by_name = {}
+
+    for step in steps:
+        if step.name in by_name:
+            raise ValueError(f"Duplicate step name: {step.name}")
+        by_name[step.name] = step
+
+    for step in steps:
+        missing = [d for d in step.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"Step {step.name} depends on unknown step(s): {missing}")
+
+    # Kahn's algorithm: anything left over sits on a cycle
+    remaining = {s.name: set(s.deps) for s in steps}
+    while True:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            break
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    if remaining:
+        raise ValueError(f"Dependency cycle between steps: {sorted(remaining)}")
+
+    return by_name
+
+
+# ==================================
+# CRITICAL PATH
+# ==================================
+def critical_path(steps: list[Step], durations: dict[str, float]) -> tuple[list[str], float]:
+    """
+    Longest chain of dependent steps by measured duration.
+
+    This is the lower bound on wall-clock time for any amount
+    of parallelism; speeding up steps off this path does not
+    shorten the run.
+    """
+
+    by_name = {s.name: s for s in steps}
+    finish, previous = {}, {}
+
+    def visit(name: str) -> float:
+        if name not in finish:
+            start, prev = 0.0, None
+            for dep in by_name[name].deps:
+                if visit(dep) > start:
+                    start, prev = finish[dep], dep
+            finish[name] = start + durations.get(name, 0.0)
+            previous[name] = prev
+        return finish[name]
+
+    for name in by_name:
+        visit(name)
+
+    if not finish:
+        return [], 0.0
+
+    end = max(finish, key=finish.get)
+    path = []
+    node = end
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+
+    return list(reversed(path)), finish[end]
+
+
+# ==================================
+# SCHEDULER
+# ==================================
+def run_dag(
+    steps: list[Step],
+    parallelism: int = DEFAULT_PARALLELISM,
+    resource_limits: dict[str, int] | None = None,
+    force: bool | list[str] = False,
+    run_id: int | None = None,
+    completed: dict[str, Any] | None = None,
+) -> dict:
+    """
+    Runs `steps` on a worker pool as soon as their dependencies
+    have succeeded, subject to `parallelism` and per-tag
+    `resource_limits`.
+
+    Steps declaring `inputs` are skipped when their input
+    fingerprint matches the stored one. force=True reruns
+    every step; a list of names reruns just those steps.
+    The fingerprint is stored from the inputs as they are
+    after the step succeeds, so a step's own effect on its
+    landing files (e.g. archiving) does not trigger a rerun.
+
+    Every invocation (success, skip or failure) is recorded
+    in meta.step_runs under `run_id` with its metrics.
+
+    `completed` maps step names to results from an earlier
+    attempt of the same run; those steps are not run again
+    and release their dependents immediately (resume).
+
+    On the first failure no new steps are started; running
+    steps are allowed to finish, then DagError is raised with
+    the partial report.
+
+    Returns:
+        dict with per-step results and timings, the critical
+        path and total wall-clock seconds.
+    """
+
+    by_name = _validate(steps)
+    limits = {**DEFAULT_RESOURCE_LIMITS, **(resource_limits or {})}
+
+    completed = completed or {}
+
+    pending = [name for name in by_name if name not in completed]
+    running = {}
+    in_use = {tag: 0 for tag in limits}
+
+    results, timings = dict(completed), {}
+
+    if completed:
+        logger.info(f"[dag] Resuming; already completed: {', '.join(completed)}")
+
+    failed = None
+
+    start_time = time.perf_counter()
+
+    def fits(step: Step) -> bool:
+        return all(
+            in_use.get(tag, 0) < limits[tag]
+            for tag in step.resources
+            if tag in limits
+        )
+
+    engine = get_engine()
+
+    # DB time is attributed whichever pool a step draws from
+    for profile in ENGINE_PROFILES:
+        install_db_timer(get_engine(profile))
+
+    def forced(step: Step) -> bool:
+        return force is True or (bool(force) and step.name in force)
+
+    def execute(step: Step) -> tuple[Any, bool, dict | None]:
+        """
+        Runs one step unless its fingerprint matches.
+        Returns (result, skipped, inputs).
+        """
+
+        inputs = None
+
+        # ----------------------------------
+        # Fingerprint check
+        # ----------------------------------
+        if step.inputs is not None and not forced(step):
+            inputs = step.inputs()
+
+            with engine.connect() as conn:
+                stored = get_fingerprint(conn, step.name)
+
+            if fingerprint(inputs) == stored:
+                logger.info(f"[dag] Skipping {step.name} (inputs unchanged)")
+                return {"skipped": True}, True, inputs
+
+        logger.info(f"[dag] Starting {step.name}")
+        result = step.func()
+
+        if step.inputs is not None:
+            inputs = step.inputs()
+            with engine.begin() as conn:
+                set_fingerprint(conn, step.name, fingerprint(inputs), inputs)
+
+        return result, False, inputs
+
+    def timed(step: Step):
+        """
+        Runs a step under StepMetrics and records it in meta.step_runs.
+        """
+
+        t0 = time.perf_counter()
+        metrics = StepMetrics()
+        status, result, inputs, error = "failed", None, None, None
+
+        try:
+            with metrics, log_context(run_id=run_id, step=step.name):
+                result, skipped, inputs = execute(step)
+            status = "skipped" if skipped else "success"
+            return result, t0, time.perf_counter(), skipped
+
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+
+        finally:
+            # Recording must never mask the step's own outcome
+            try:
+                with engine.begin() as conn:
+                    record_step(
+                        conn,
+                        run_id,
+                        step.name,
+                        status,
+                        metrics.as_dict(),
+                        time.perf_counter() - t0,
+                        params=inputs,
+                        fingerprint=fingerprint(inputs) if inputs is not None else None,
+                        result=result,
+                        error=error,
+                    )
+            except Exception:
+                logger.exception(f"[dag] Could not record run of {step.name}")
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        while pending or running:
+
+            # ----------------------------------
+            # Launch every ready step that fits
+            # ----------------------------------
+            if failed is None:
+                for name in list(pending):
+                    step = by_name[name]
+
+                    if len(running) >= parallelism:
+                        break
+                    if not all(d in results for d in step.deps):
+                        continue
+                    if not fits(step):
+                        continue
+
+                    for tag in step.resources:
+                        if tag in in_use:
+                            in_use[tag] += 1
+
+                    running[executor.submit(timed, step)] = step
+                    pending.remove(name)
+
+            if not running:
+                break
+
+            # ----------------------------------
+            # Collect finished steps
+            # ----------------------------------
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                step = running.pop(future)
+
+                for tag in step.resources:
+                    if tag in in_use:
+                        in_use[tag] -= 1
+
+                try:
+                    result, t0, t1, skipped = future.result()
+                except Exception:
+                    logger.exception(f"[dag] {step.name} failed")
+                    failed = failed or step.name
+                    continue
+
+                results[step.name] = result
+                timings[step.name] = {
+                    "start": round(t0 - start_time, 2),
+                    "end": round(t1 - start_time, 2),
+                    "seconds": round(t1 - t0, 2),
+                    "skipped": skipped,
+                }
+
+                if not skipped:
+                    logger.info(
+                        f"[dag] Finished {step.name} in {t1 - t0:.2f} seconds",
+                        extra={"run_id": run_id, "step": step.name, "seconds": round(t1 - t0, 2)},
+                    )
+
+    if pending and failed is None:
+        raise ValueError(f"Steps can never be scheduled: {pending}")
+
+    elapsed = time.perf_counter() - start_time
+
+    path, path_seconds = critical_path(
+        steps,
+        {name: t["seconds"] for name, t in timings.items()},
+    )
+
+    report = {
+        "results": results,
+        "timings": timings,
+        "critical_path": path,
+        "critical_path_seconds": round(path_seconds, 2),
+        "resumed": list(completed),
+        "seconds": round(elapsed, 2),
+    }
+
+    if failed is not None:
+        raise DagError(failed, report)
+
+    skipped = sum(t["skipped"] for t in timings.values())
+
+    logger.info(
+        f"[dag] Completed {len(results)} step(s) ({skipped} skipped) "
+        f"in {elapsed:.2f} seconds; "
+        f"critical path ({path_seconds:.2f}s): {' → '.join(path)}"
+    )
+
+    return report
@@ -0,0 +1,145 @@
+# ==================================
+# Imports
+# ==================================
+import time
+from dataclasses import dataclass
+from sqlalchemy import text
+
+from components.db import get_engine
+from components.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# DATA FIXES
+# ==================================
+#
+# One-shot changes to existing data (resetting watermarks so
+# rows are reprocessed, backfills). Each runs once per
+# database, in list order, and is recorded in meta.data_fixes;
+# editing a fix that already ran does not run it again. Add a
+# new entry instead.
+#
+# Schema changes stay in sql/ (components.migrations).
+#
+
+@dataclass(frozen=True)
+class DataFix:
+    name: str
+    description: str
+    statements: tuple[str, ...]
+
+
+FIXES = (
+    DataFix(
+        "2026_weather_units",
+        "Reprocess weather downstream of bronze after the GHCN "
+        "tenths → °C / mm conversion in the weather transforms",
+        (
+            """
+            DELETE FROM meta.watermarks
+            WHERE name IN ('weather.transform_wide', 'weather_daily_pivot', 'gold.rollups')
+               OR name LIKE 'gold.accident_weather:%'
+            """,
+            """
+            DELETE FROM meta.step_fingerprints
+            WHERE step IN ('weather.transform', 'weather.pivot', 'gold', 'rollups')
+            """,
+        ),
+    ),
+    DataFix(
+        "2026_accident_range_watermarks",
+        "Drop accidents.transform watermarks keyed on the weather "
+        "date range; keys are now the state filter alone",
+        (
+            """
+            DELETE FROM meta.watermarks
+            WHERE name LIKE 'accidents.transform[%;range=%'
+            """,
+        ),
+    ),
+)
+
+# Serialises data fixes across processes
+LOCK_SQL = "SELECT pg_advisory_lock(hashtext('meta.data_fixes'))"
+UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtext('meta.data_fixes'))"
+
+
+# ==================================
+# LEDGER
+# ==================================
+def applied_fixes(conn) -> set[str]:
+    """
+    Names of the fixes already recorded in meta.data_fixes.
+    """
+
+    return set(conn.execute(text("SELECT name FROM meta.data_fixes")).scalars())
+
+
+def status(engine=None) -> list[dict]:
+    """
+    One row per fix: applied or pending.
+    """
+
+    engine = engine or get_engine("transform")
+
+    with engine.connect() as conn:
+        applied = applied_fixes(conn)
+
+    return [
+        {
+            "name": fix.name,
+            "description": fix.description,
+            "status": "applied" if fix.name in applied else "pending",
+        }
+        for fix in FIXES
+    ]
+
+
+# ==================================
+# APPLY
+# ==================================
+def apply_pending(engine=None) -> dict:
+    """
+    Runs every fix not yet in meta.data_fixes, each in one
+    transaction with its ledger row, under a cross-process
+    lock. A no-op when nothing is pending.
+
+    Returns:
+        dict with the applied fix names and seconds.
+    """
+
+    engine = engine or get_engine("transform")
+    t0 = time.perf_counter()
+    applied = []
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text(LOCK_SQL))
+
+        try:
+            with engine.connect() as conn:
+                done = applied_fixes(conn)
+
+            for fix in FIXES:
+                if fix.name in done:
+                    continue
+
+                with engine.begin() as conn:
+                    rows = sum(conn.execute(text(sql)).rowcount for sql in fix.statements)
+                    conn.execute(
+                        text("INSERT INTO meta.data_fixes (name, rows) VALUES (:name, :rows)"),
+                        {"name": fix.name, "rows": rows},
+                    )
+
+                logger.info(f"Applied data fix {fix.name} ({rows:,} rows)")
+                applied.append(fix.name)
+
+        finally:
+            lock_conn.execute(text(UNLOCK_SQL))
+
+    return {
+        "applied": applied,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
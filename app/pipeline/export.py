@@ -0,0 +1,493 @@
+# ==================================
+# Imports
+# ==================================
+import json
+import os
+import shutil
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+from components.db import get_engine
+from pipeline.validators import validate_table
+from components.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# Constants
+# ==================================
+EXPORT_DIR = Path("/data/export")
+
+MANIFEST_NAME = "_manifest.json"
+
+# Rows fetched per server-side cursor round trip;
+# each fetch becomes one Parquet row group.
+DEFAULT_ROW_GROUP_ROWS = 100_000
+
+# Partitioning per exportable table:
+#   time_column   → year=YYYY directories
+#   space_column  → <column>=<value> directories
+#   change_column → change detection for incremental re-export
+EXPORT_SPECS = {
+    "gold.accident_weather": {
+        "time_column": "obs_date",
+        "space_column": "state",
+        "change_column": "updated_at",
+    },
+    "silver.us_accidents": {
+        "time_column": "start_time",
+        "space_column": "state",
+        "change_column": "updated_at",
+    },
+    "silver.weather_daily_pivot": {
+        "time_column": "obs_date",
+        "space_column": None,
+        "change_column": "updated_at",
+    },
+    "silver.accident_station_map": {
+        "time_column": None,
+        "space_column": None,
+        "change_column": "updated_at",
+    },
+    "silver.stations": {
+        "time_column": None,
+        "space_column": "state",
+        "change_column": "last_updated_at",
+    },
+}
+
+# Postgres type → Arrow type. Anything else is exported as text.
+ARROW_TYPES = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "numeric": pa.float64(),
+    "boolean": pa.bool_(),
+    "text": pa.string(),
+    "character": pa.string(),
+    "character varying": pa.string(),
+    "date": pa.date32(),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+    "timestamp without time zone": pa.timestamp("us"),
+}
+
+GEOMETRY_TYPES = ("geometry", "geography")
+
+
+# ==================================
+# TABLE INTROSPECTION
+# ==================================
+def _columns(conn, table_name: str) -> list[tuple[str, str, str]]:
+    """
+    Returns (column, data_type, udt_name) in table order.
+    """
+
+    schema, table = table_name.split(".")
+
+    return [
+        (row[0], row[1], row[2])
+        for row in conn.execute(text("""
+            SELECT column_name, data_type, udt_name
+            FROM information_schema.columns
+            WHERE table_schema = :schema
+              AND table_name = :table
+            ORDER BY ordinal_position
+        """), {"schema": schema, "table": table})
+    ]
+
+
+def _select_and_schema(columns) -> tuple[str, pa.Schema]:
+    """
+    Builds the export SELECT list and the matching Arrow schema.
+
+    Geometry/geography columns are sent as WKB, numerics as
+    float8 and unknown types as text, so every value arrives
+    in a form Arrow can take without per-row conversion.
+    """
+
+    select, fields, geometry_columns = [], [], []
+
+    for name, data_type, udt_name in columns:
+        if udt_name in GEOMETRY_TYPES:
+            select.append(f'ST_AsBinary("{name}"::geometry) AS "{name}"')
+            fields.append(pa.field(name, pa.binary()))
+            geometry_columns.append(name)
+
+        elif data_type in ARROW_TYPES:
+            cast = "::float8" if data_type == "numeric" else ""
+            select.append(f'"{name}"{cast}')
+            fields.append(pa.field(name, ARROW_TYPES[data_type]))
+
+        else:
+            select.append(f'"{name}"::text AS "{name}"')
+            fields.append(pa.field(name, pa.string()))
+
+    schema = pa.schema(fields)
+
+    # GeoParquet 1.0 file metadata (WKB, default CRS OGC:CRS84)
+    if geometry_columns:
+        geo = {
+            "version": "1.0.0",
+            "primary_column": geometry_columns[0],
+            "columns": {
+                name: {"encoding": "WKB", "geometry_types": []}
+                for name in geometry_columns
+            },
+        }
+        schema = schema.with_metadata({"geo": json.dumps(geo)})
+
+    return ", ".join(select), schema
+
+
+# ==================================
+# PARTITIONS
+# ==================================
+def _partition_key(spec: dict, space_value, year) -> str:
+    """
+    Relative Hive-style directory for one partition.
+    """
+
+    parts = []
+
+    if spec.get("space_column"):
+        label = space_value if space_value is not None else "__null__"
+        parts.append(f"{spec['space_column']}={label}")
+
+    if spec.get("time_column"):
+        parts.append(f"year={year if year is not None else '__null__'}")
+
+    return "/".join(parts) or "all"
+
+
+def _list_partitions(conn, table_name: str, spec: dict) -> dict:
+    """
+    Returns {partition_key: {"space_value", "year", "fingerprint"}}
+    for every partition currently in `table_name`.
+
+    The fingerprint (row count + max change timestamp) is what
+    the manifest compares to decide whether to re-export.
+    """
+
+    time_column = spec.get("time_column")
+    space_column = spec.get("space_column")
+    change_column = spec.get("change_column")
+
+    dims = []
+    if space_column:
+        dims.append(f'"{space_column}"')
+    if time_column:
+        dims.append(f'EXTRACT(YEAR FROM "{time_column}")::INT')
+
+    change = f'MAX("{change_column}")' if change_column else "NULL"
+
+    sql = f"""
+        SELECT
+            {"".join(f"{d}, " for d in dims)}COUNT(*) AS row_count,
+            {change} AS changed_at
+        FROM {table_name}
+    """
+    if dims:
+        sql += " GROUP BY " + ", ".join(str(i + 1) for i in range(len(dims)))
+
+    partitions = {}
+
+    for row in conn.execute(text(sql)):
+        values = list(row)
+        space_value = values.pop(0) if space_column else None
+        year = values.pop(0) if time_column else None
+        row_count, changed_at = values
+
+        key = _partition_key(spec, space_value, year)
+
+        partitions[key] = {
+            "space_value": space_value,
+            "year": year,
+            "fingerprint": {
+                "rows": row_count,
+                "changed_at": changed_at.isoformat() if changed_at else None,
+            },
+        }
+
+    return partitions
+
+
+def _partition_where(spec: dict, partition: dict) -> tuple[str, dict]:
+    """
+    WHERE clause selecting one partition (sargable on the time column).
+    """
+
+    clauses, params = [], {}
+
+    if spec.get("space_column"):
+        column = f'"{spec["space_column"]}"'
+
+        if partition["space_value"] is None:
+            clauses.append(f"{column} IS NULL")
+        else:
+            clauses.append(f"{column} = %(space)s")
+            params["space"] = partition["space_value"]
+
+    if spec.get("time_column"):
+        column = f'"{spec["time_column"]}"'
+        year = partition["year"]
+
+        if year is None:
+            clauses.append(f"{column} IS NULL")
+        else:
+            clauses.append(f"{column} >= %(lo)s AND {column} < %(hi)s")
+            params["lo"] = date(year, 1, 1)
+            params["hi"] = date(year + 1, 1, 1)
+
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+# ==================================
+# MANIFEST
+# ==================================
+def _read_manifest(table_dir: Path) -> dict:
+    path = table_dir / MANIFEST_NAME
+
+    if not path.exists():
+        return {"partitions": {}}
+
+    return json.loads(path.read_text())
+
+
+def _write_manifest(table_dir: Path, manifest: dict):
+    """
+    Atomic write, so a crash never leaves a half-written manifest.
+    """
+
+    path = table_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+# ==================================
+# STREAMING WRITE
+# ==================================
+def _export_partition(
+    engine,
+    table_name: str,
+    select_list: str,
+    schema: pa.Schema,
+    where: str,
+    params: dict,
+    target: Path,
+    row_group_rows: int,
+) -> int:
+    """
+    Streams one partition through a server-side cursor into
+    a Parquet file, one row group per fetch.
+
+    Only one row group is held in memory at a time. The file
+    is written next to `target` and renamed into place, so
+    readers never see a partial partition.
+    """
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".parquet.tmp")
+
+    raw_conn = engine.raw_connection()
+    rows = 0
+
+    try:
+        # Named cursor → rows are fetched from the server in batches
+        cur = raw_conn.cursor(name="geoparquet_export")
+        cur.itersize = row_group_rows
+        cur.execute(f"SELECT {select_list} FROM {table_name}{where}", params)
+
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            while True:
+                batch = cur.fetchmany(row_group_rows)
+                if not batch:
+                    break
+
+                columns = [
+                    pa.array(
+                        [
+                            bytes(value) if isinstance(value, memoryview) else value
+                            for value in column
+                        ],
+                        type=field.type,
+                    )
+                    for column, field in zip(zip(*batch), schema)
+                ]
+
+                writer.write_batch(
+                    pa.RecordBatch.from_arrays(columns, schema=schema),
+                    row_group_size=row_group_rows,
+                )
+                rows += len(batch)
+
+        cur.close()
+        raw_conn.rollback()
+
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    finally:
+        raw_conn.close()
+
+    os.replace(tmp, target)
+
+    return rows
+
+
+# ==================================
+# EXPORT TABLE
+# ==================================
+def export_table(
+    table_name: str,
+    incremental: bool = True,
+    export_dir: Path = EXPORT_DIR,
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    max_workers: int = 2,
+) -> dict:
+    """
+    Export a silver/gold table to partitioned GeoParquet.
+
+    Layout:
+        <export_dir>/<schema>/<table>/<space>=<v>/year=<YYYY>/part-0.parquet
+        <export_dir>/<schema>/<table>/_manifest.json
+
+    Partitioning comes from EXPORT_SPECS. Rows are streamed
+    through a server-side cursor in `row_group_rows` batches,
+    so memory stays bounded by one row group per worker
+    regardless of table size.
+
+    incremental=True re-exports only partitions whose row count
+    or latest change timestamp differ from the manifest, and
+    removes partitions that no longer exist in the table.
+
+    Returns:
+        dict with partitions exported / skipped / removed,
+        rows written and execution time.
+    """
+
+    if table_name not in EXPORT_SPECS:
+        raise ValueError(
+            f"No export spec for {table_name}. "
+            f"Known tables: {', '.join(EXPORT_SPECS)}"
+        )
+
+    spec = EXPORT_SPECS[table_name]
+    engine = get_engine("transform")
+
+    # ----------------------------------
+    # Validate Dependencies
+    # ----------------------------------
+    validate_table(engine, table_name, not_empty=True)
+
+    start_time = time.perf_counter()
+
+    schema_name, table = table_name.split(".")
+    table_dir = Path(export_dir) / schema_name / table
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = _read_manifest(table_dir) if incremental else {"partitions": {}}
+
+    with engine.connect() as conn:
+        select_list, arrow_schema = _select_and_schema(_columns(conn, table_name))
+        partitions = _list_partitions(conn, table_name, spec)
+
+    # ----------------------------------
+    # Plan
+    # ----------------------------------
+    previous = manifest["partitions"]
+
+    todo = {
+        key: p for key, p in partitions.items()
+        if previous.get(key, {}).get("fingerprint") != p["fingerprint"]
+    }
+    removed = [key for key in previous if key not in partitions]
+
+    logger.info(
+        f"Exporting {table_name}: {len(todo)} of {len(partitions)} "
+        f"partition(s) changed, {len(removed)} removed"
+    )
+
+    # Full export starts from an empty directory
+    if not incremental:
+        for child in table_dir.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child)
+
+    for key in removed:
+        shutil.rmtree(table_dir / key, ignore_errors=True)
+        previous.pop(key, None)
+
+    if removed:
+        _write_manifest(table_dir, manifest)
+
+    # ----------------------------------
+    # Export changed partitions
+    # ----------------------------------
+    rows_written = 0
+
+    def worker(key: str, partition: dict) -> tuple[str, int]:
+        where, params = _partition_where(spec, partition)
+        rows = _export_partition(
+            engine,
+            table_name,
+            select_list,
+            arrow_schema,
+            where,
+            params,
+            table_dir / key / "part-0.parquet",
+            row_group_rows,
+        )
+        return key, rows
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(worker, key, partition)
+            for key, partition in todo.items()
+        ]
+
+        for f in as_completed(futures):
+            key, rows = f.result()
+            rows_written += rows
+
+            # Record each partition as soon as it lands,
+            # so an interrupted export resumes where it stopped
+            previous[key] = {
+                "fingerprint": todo[key]["fingerprint"],
+                "rows": rows,
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+            }
+            _write_manifest(table_dir, manifest)
+
+            logger.info(
+                f"Exported {table_name} [{key}]: {rows:,} rows",
+                extra={"rate_key": f"export.{table_name}", "rows": rows},
+            )
+
+    elapsed = time.perf_counter() - start_time
+
+    logger.info(
+        f"Export of {table_name} complete: {rows_written:,} rows "
+        f"in {elapsed:.2f} seconds"
+    )
+
+    return {
+        "partitions_exported": len(todo),
+        "partitions_skipped": len(partitions) - len(todo),
+        "partitions_removed": len(removed),
+        "rows_written": rows_written,
+        "export_dir": str(table_dir),
+        "seconds": round(elapsed, 2),
+    }
@@ -0,0 +1,118 @@
+# ==================================
+# Imports
+# ==================================
+import hashlib
+import json
+from pathlib import Path
+from sqlalchemy import text
+
+from components.catalog import table_versions  # noqa: F401  (re-exported)
+from components.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# INPUT PROBES
+# ==================================
+#
+# Cheap descriptions of a step's inputs. Each returns
+# something JSON-serialisable that changes whenever the
+# input changes.
+#
+
+def files_digest(*directories: Path, pattern: str = "*") -> str:
+    """
+    Hash of the (name, size, mtime) listing of landing/archive directories.
+
+    Stat-based, so multi-GB files are never read; any file
+    added, removed, rewritten or touched changes the digest.
+    Pass a landing directory together with its archive: moving
+    a file from one to the other (rename keeps size and mtime)
+    leaves the digest unchanged.
+    """
+
+    entries = []
+
+    for directory in directories:
+        if Path(directory).exists():
+            for p in Path(directory).glob(pattern):
+                if p.is_file():
+                    st = p.stat()
+                    entries.append(f"{p.name}\0{st.st_size}\0{st.st_mtime_ns}\n")
+
+    h = hashlib.sha256()
+    for entry in sorted(entries):
+        h.update(entry.encode())
+
+    return h.hexdigest()
+
+
+# ==================================
+# FINGERPRINT STORE
+# ==================================
+def fingerprint(inputs: dict) -> str:
+    """
+    Stable hash of a step's input description.
+    """
+
+    canonical = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def get_fingerprint(conn, step: str) -> str | None:
+    return conn.execute(
+        text("SELECT fingerprint FROM meta.step_fingerprints WHERE step = :step"),
+        {"step": step},
+    ).scalar()
+
+
+def set_fingerprint(conn, step: str, value: str, inputs: dict):
+    conn.execute(
+        text("""
+            INSERT INTO meta.step_fingerprints (step, fingerprint, inputs, updated_at)
+            VALUES (:step, :fingerprint, CAST(:inputs AS JSONB), now())
+            ON CONFLICT (step)
+            DO UPDATE SET
+                fingerprint = EXCLUDED.fingerprint,
+                inputs = EXCLUDED.inputs,
+                updated_at = now()
+        """),
+        {
+            "step": step,
+            "fingerprint": value,
+            "inputs": json.dumps(inputs, sort_keys=True, default=str),
+        },
+    )
+
+
+def clear_fingerprints(conn, prefix: str = ""):
+    """
+    Forgets stored fingerprints, so matching steps rerun.
+    """
+
+    conn.execute(
+        text("DELETE FROM meta.step_fingerprints WHERE step LIKE :prefix"),
+        {"prefix": f"{prefix}%"},
+    )
+
+
+# ==================================
+# HOUSEKEEPING
+# ==================================
+def prune_table_changes(conn) -> int:
+    """
+    Keeps only the latest meta.table_changes row per table.
+
+    Versions are MAX(id), so older rows carry no information.
+    """
+
+    return conn.execute(text("""
+        DELETE FROM meta.table_changes c
+        WHERE c.id < (
+            SELECT MAX(l.id)
+            FROM meta.table_changes l
+            WHERE l.table_name = c.table_name
+        )
+    """)).rowcount
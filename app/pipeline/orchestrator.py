@@ -1,136 +1,455 @@
 # ==================================
 # Imports
 # ==================================
-from pipeline.stations import run_all as run_stations
-from pipeline.weather import run_all as run_weather
-from pipeline.accidents import run_all as run_accidents
+from pipeline import stations, weather, accidents
 
 from pipeline.weather_daily_pivot import build as build_weather_pivot
 from pipeline.accident_station_map import build as build_station_map
 from pipeline.accident_weather import build as build_gold
+from pipeline.rollups import build as build_rollups
 
-from pipeline.validators import validate_table
-from components.db import get_engine
-from components.logger import get_logger
+from pipeline.dag import Step, DagError, run_dag, DEFAULT_PARALLELISM
+from pipeline.fingerprints import table_versions, files_digest, prune_table_changes
+from pipeline.run_history import (
+    start_run,
+    finish_run,
+    get_run,
+    completed_steps,
+    reopen_run,
+)
+from pipeline.validators import validate_table, invalidate
+from pipeline.quality import enforce as enforce_quality
+from pipeline.data_fixes import apply_pending as apply_data_fixes
+from components.db import get_engine, pool_stats
+from components.migrations import ensure_schema
+from components.logger import get_logger, dropped_records
 
 
 logger = get_logger(__name__)
 
 
+# ==================================
+# STEP HELPERS
+# ==================================
+def _validated(func, table_name: str, required_columns: list[str] | None = None):
+    """
+    Wraps a step so its output table is validated, and its
+    sampled data-quality rules pass, before dependent steps
+    are released.
+    """
+
+    def run():
+        result = func()
+        engine = get_engine("transform")
+
+        invalidate(table_name)
+        validate_table(
+            engine,
+            table_name,
+            not_empty=True,
+            required_columns=required_columns,
+        )
+
+        # Failing "error" rules raise; warnings travel with the result
+        issues = [
+            f"{r['rule']}: {r['status']}"
+            for r in enforce_quality(engine, table_name)
+            if r["status"] in ("warn", "fail")
+        ]
+        if issues and isinstance(result, dict):
+            result = {**result, "quality_issues": issues}
+
+        return result
+
+    return run
+
+
+def _inputs(tables: tuple[str, ...] = (), files: tuple = (), **params):
+    """
+    Builds a Step.inputs callable from upstream tables,
+    landing/archive directories and plain parameters.
+    """
+
+    def probe() -> dict:
+        inputs = {"params": params}
+
+        if tables:
+            with get_engine().connect() as conn:
+                inputs["tables"] = table_versions(conn, list(tables))
+
+        if files:
+            inputs["files"] = files_digest(*files)
+
+        return inputs
+
+    return probe
+
+
+# ==================================
+# PIPELINE DAG
+# ==================================
+def build_steps(states: list[str] | None = None, wide: bool = False) -> list[Step]:
+    """
+    Declares the full pipeline as a DAG.
+
+    The accidents chain only joins the weather chain where it
+    actually reads weather (the transform restricts accidents
+    to the weather date range), so the accidents download and
+    ingest overlap the weather download.
+
+    Dependencies:
+        stations            → weather.download → weather.ingest
+                              → weather.transform → weather.pivot
+        accidents.download  → accidents.ingest → accidents.transform
+        weather.transform   → accidents.transform
+                              (weather.pivot when wide)
+        stations + accidents.transform → station_map
+        station_map + weather.pivot    → gold → rollups
+    """
+
+    # -----------------------------
+    # Weather chain (long or wide)
+    # -----------------------------
+    if wide:
+        weather_steps = [
+            Step(
+                "weather.download",
+                lambda: weather.download(states, wide=True),
+                deps=("stations",),
+                resources=("network",),
+                # Keyed on the requested range (open-ended), not on
+                # today's date: --force picks up new observations
+                inputs=_inputs(
+                    ("silver.stations",),
+                    states=states, wide=True,
+                    start_date=weather.DEFAULT_START_DATE, end_date=None,
+                ),
+            ),
+            Step(
+                "weather.ingest",
+                weather.ingest_wide,
+                deps=("weather.download",),
+                resources=("heavy_db",),
+                inputs=_inputs(files=(weather.LANDING_WIDE_DIR, weather.ARCHIVE_WIDE_DIR)),
+            ),
+            Step(
+                "weather.pivot",
+                _validated(weather.transform_wide, "silver.weather_daily_pivot"),
+                deps=("weather.ingest",),
+                resources=("heavy_db",),
+                inputs=_inputs(("bronze.weather_daily_wide",)),
+            ),
+        ]
+        # Wide loads fill the pivot directly; silver.weather_daily stays empty
+        accident_weather_dep = ("weather.pivot",)
+        accident_weather_table = "silver.weather_daily_pivot"
+
+    else:
+        weather_steps = [
+            Step(
+                "weather.download",
+                lambda: weather.download(states),
+                deps=("stations",),
+                resources=("network",),
+                # Keyed on the requested range (open-ended), not on
+                # today's date: --force picks up new observations
+                inputs=_inputs(
+                    ("silver.stations",),
+                    states=states, wide=False,
+                    start_date=weather.DEFAULT_START_DATE, end_date=None,
+                ),
+            ),
+            Step(
+                "weather.ingest",
+                weather.ingest,
+                deps=("weather.download",),
+                resources=("heavy_db",),
+                inputs=_inputs(files=(weather.LANDING_DIR, weather.ARCHIVE_DIR)),
+            ),
+            Step(
+                "weather.transform",
+                _validated(weather.transform, "silver.weather_daily"),
+                deps=("weather.ingest",),
+                resources=("heavy_db",),
+                inputs=_inputs(("bronze.weather_daily",)),
+            ),
+            Step(
+                "weather.pivot",
+                _validated(
+                    lambda: build_weather_pivot(incremental=True),
+                    "silver.weather_daily_pivot",
+                ),
+                deps=("weather.transform",),
+                resources=("heavy_db",),
+                inputs=_inputs(("silver.weather_daily",)),
+            ),
+        ]
+        accident_weather_dep = ("weather.transform",)
+        accident_weather_table = "silver.weather_daily"
+
+    return [
+        # -----------------------------
+        # Stations
+        # -----------------------------
+        Step(
+            "stations",
+            _validated(
+                stations.run_all,
+                "silver.stations",
+                required_columns=["station_id", "latitude", "longitude", "geom"],
+            ),
+            resources=("network",),
+            # Own tables included: a manual truncate forces a reload
+            inputs=lambda: {
+                "remote": stations.remote_signature(),
+                **_inputs(("bronze.stations", "silver.stations"))(),
+            },
+        ),
+
+        *weather_steps,
+
+        # -----------------------------
+        # Accidents chain
+        # -----------------------------
+        Step(
+            "accidents.download",
+            accidents.download,
+            resources=("network",),
+            inputs=_inputs(files=(accidents.LANDING_DIR, accidents.ARCHIVE_DIR)),
+        ),
+        Step(
+            "accidents.ingest",
+            accidents.ingest,
+            deps=("accidents.download",),
+            resources=("heavy_db",),
+            inputs=_inputs(files=(accidents.LANDING_DIR, accidents.ARCHIVE_DIR)),
+        ),
+        Step(
+            "accidents.transform",
+            _validated(
+                lambda: accidents.transform(weather_table=accident_weather_table),
+                "silver.us_accidents",
+            ),
+            deps=("accidents.ingest", *accident_weather_dep),
+            resources=("heavy_db",),
+            inputs=_inputs(("bronze.us_accidents", accident_weather_table)),
+        ),
+
+        # -----------------------------
+        # Transform / Gold
+        # -----------------------------
+        Step(
+            "station_map",
+            # In place: only changed mappings bump updated_at,
+            # so gold's incremental build stays incremental
+            _validated(
+                lambda: build_station_map(truncate=False),
+                "silver.accident_station_map",
+            ),
+            deps=("stations", "accidents.transform"),
+            resources=("heavy_db",),
+            inputs=_inputs(("silver.stations", "silver.us_accidents")),
+        ),
+        Step(
+            "gold",
+            _validated(
+                lambda: build_gold(incremental=True),
+                "gold.accident_weather",
+            ),
+            deps=("station_map", "weather.pivot"),
+            resources=("heavy_db",),
+            inputs=_inputs((
+                "silver.us_accidents",
+                "silver.accident_station_map",
+                "silver.weather_daily_pivot",
+            )),
+        ),
+        Step(
+            "rollups",
+            _validated(
+                lambda: build_rollups(incremental=True),
+                "gold.rollup_state_month",
+            ),
+            deps=("gold",),
+            resources=("heavy_db",),
+            inputs=_inputs(("gold.accident_weather",)),
+        ),
+    ]
+
+
 # ==================================
 # RUN FULL PIPELINE
 # ==================================
-def run_full(states: list[str] | None = None) -> dict:
+def run_full(
+    states: list[str] | None = None,
+    wide: bool = False,
+    parallelism: int = DEFAULT_PARALLELISM,
+    resource_limits: dict[str, int] | None = None,
+    force: bool | list[str] = False,
+) -> dict:
     """
     Execute full pipeline DAG.
 
-    Order:
-        1. Stations
-        2. Weather
-        3. Accidents
-        4. Weather Daily Pivot
-        5. Accident → Station Map
-        6. Gold (Accident Weather)
+    Independent branches (e.g. the accidents chain and the
+    weather download) run concurrently on a worker pool.
+    Steps whose inputs (upstream table versions, landing
+    files, parameters) are unchanged since their last
+    successful run are skipped, so a no-op rerun only
+    probes its inputs.
 
     Args:
         states: Optional list of state codes to filter weather ingestion.
                 If None, all states are processed.
+        wide: If True, weather is parsed straight into station-day rows
+              and loaded into silver.weather_daily_pivot, so the pivot
+              build step is skipped.
+        parallelism: Max steps running at once.
+        resource_limits: Per-tag concurrency caps, merged over
+                         dag.DEFAULT_RESOURCE_LIMITS
+                         (e.g. {"heavy_db": 2}).
+        force: True reruns every step; a list of step names
+               reruns just those, ignoring their fingerprints.
+
+    The run and each of its steps are recorded in
+    meta.pipeline_runs / meta.step_runs.
 
     Returns:
-        dict with status
+        dict with run_id, status, per-step timings and the critical path.
+        A failed run can be continued with resume(run_id).
     """
 
+    ensure_schema()
+    apply_data_fixes()
+
     engine = get_engine()
 
-    logger.info("Starting FULL pipeline execution")
+    with engine.begin() as conn:
+        run_id = start_run(conn, {
+            "states": states,
+            "wide": wide,
+            "parallelism": parallelism,
+            "resource_limits": resource_limits,
+            "force": force,
+        })
 
-    # ==========================================================
-    # INGEST LAYER
-    # ==========================================================
+    logger.info(f"Starting FULL pipeline execution (run {run_id})")
 
-    # -----------------------------
-    # Stations
-    # -----------------------------
-    logger.info("Running stations")
-    run_stations()
-
-    validate_table(
-        engine,
-        "silver.stations",
-        not_empty=True,
-        required_columns=[
-            "station_id",
-            "latitude",
-            "longitude",
-            "geom",
-        ],
+    return _execute(
+        run_id,
+        build_steps(states, wide=wide),
+        parallelism=parallelism,
+        resource_limits=resource_limits,
+        force=force,
     )
 
-    # -----------------------------
-    # Weather
-    # -----------------------------
-    logger.info("Running weather")
-    run_weather(states)
 
-    validate_table(
-        engine,
-        "silver.weather_daily",
-        not_empty=True,
-    )
+def resume(
+    run_id: int,
+    parallelism: int | None = None,
+    resource_limits: dict[str, int] | None = None,
+) -> dict:
+    """
+    Resume a failed or interrupted run from its last checkpoint.
 
-    # -----------------------------
-    # Accidents
-    # -----------------------------
-    logger.info("Running accidents")
-    run_accidents()
+    Steps whose latest attempt in `run_id` succeeded (or was
+    skipped) are taken as done; the rest of the DAG runs again
+    under the same run_id with the run's original parameters.
 
-    validate_table(
-        engine,
-        "silver.us_accidents",
-        not_empty=True,
-    )
+    Progress inside a step is not checkpointed here: it is
+    already durable per step. Weather downloads skip files on
+    disk, ingests archive each loaded file, transforms advance
+    watermarks with their writes and the accidents download
+    restores its verified archive, so rerunning a step redoes
+    only its unfinished work.
 
-    # ==========================================================
-    # TRANSFORM LAYER
-    # ==========================================================
+    Returns:
+        dict like run_full, plus the resumed step names.
+    """
 
-    # -----------------------------
-    # Weather Daily Pivot
-    # -----------------------------
-    logger.info("Refreshing weather_daily_pivot")
-    build_weather_pivot()
+    ensure_schema()
+    apply_data_fixes()
 
-    validate_table(
-        engine,
-        "silver.weather_daily_pivot",
-        not_empty=True,
-    )
+    engine = get_engine()
 
-    # -----------------------------
-    # Accident → Station Map
-    # -----------------------------
-    logger.info("Building accident_station_map")
-    build_station_map()
+    with engine.begin() as conn:
+        run = get_run(conn, run_id)
 
-    validate_table(
-        engine,
-        "silver.accident_station_map",
-        not_empty=True,
-    )
+        if run is None:
+            raise ValueError(f"Unknown pipeline run: {run_id}")
+
+        if run["status"] == "success":
+            logger.info(f"Run {run_id} already succeeded; nothing to resume")
+            return {"run_id": run_id, "status": "success", "resumed": [], "skipped": []}
 
-    # ==========================================================
-    # GOLD LAYER
-    # ==========================================================
+        completed = completed_steps(conn, run_id)
+        reopen_run(conn, run_id)
 
-    logger.info("Building gold.accident_weather")
-    build_gold()
+    params = run["params"] or {}
 
-    validate_table(
-        engine,
-        "gold.accident_weather",
-        not_empty=True,
+    logger.info(
+        f"Resuming pipeline run {run_id} "
+        f"({len(completed)} step(s) already completed)"
     )
 
-    logger.info("FULL pipeline execution completed successfully")
+    return _execute(
+        run_id,
+        build_steps(params.get("states"), wide=params.get("wide", False)),
+        parallelism=parallelism or params.get("parallelism") or DEFAULT_PARALLELISM,
+        resource_limits=resource_limits or params.get("resource_limits"),
+        force=params.get("force") or False,
+        completed=completed,
+    )
+
+
+def _execute(
+    run_id: int,
+    steps: list[Step],
+    parallelism: int,
+    resource_limits: dict[str, int] | None,
+    force: bool | list[str],
+    completed: dict | None = None,
+) -> dict:
+    """
+    Runs the DAG under `run_id` and records how the run ended.
+    """
+
+    engine = get_engine()
+
+    try:
+        report = run_dag(
+            steps,
+            parallelism=parallelism,
+            resource_limits=resource_limits,
+            force=force,
+            run_id=run_id,
+            completed=completed,
+        )
+
+    except DagError as e:
+        with engine.begin() as conn:
+            finish_run(conn, run_id, "failed", e.report, error=str(e))
+        raise
+
+    except Exception as e:
+        with engine.begin() as conn:
+            finish_run(conn, run_id, "failed", error=f"{type(e).__name__}: {e}")
+        raise
+
+    with engine.begin() as conn:
+        finish_run(conn, run_id, "success", report)
+        prune_table_changes(conn)
+
+    logger.info(f"FULL pipeline execution completed successfully (run {run_id})")
 
-    return {"status": "success"}
+    return {
+        "run_id": run_id,
+        "status": "success",
+        "resumed": report["resumed"],
+        "skipped": [name for name, t in report["timings"].items() if t["skipped"]],
+        "timings": report["timings"],
+        "critical_path": report["critical_path"],
+        "critical_path_seconds": report["critical_path_seconds"],
+        "pools": pool_stats(),
+        "log_records_dropped": dropped_records(),
+        "seconds": report["seconds"],
+    }
@@ -0,0 +1,466 @@
+# ==================================
+# Imports
+# ==================================
+import math
+import time
+from dataclasses import dataclass
+from sqlalchemy import text
+
+from components.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# Constants
+# ==================================
+# Target rows per sampled table. 20k rows bound a rate to about
+# ±0.7 percentage points, and an all-clean sample puts the upper
+# bound of the true violation rate under 0.02%.
+SAMPLE_ROWS = 20_000
+
+# 95% two-sided normal quantile for the Wilson interval
+Z_95 = 1.96
+
+# Rows per 8 kB page assumed for tables without statistics
+ROWS_PER_PAGE_GUESS = 50
+
+# Fixed seed: repeated checks of an unchanged table see the same rows
+SAMPLE_SEED = 42
+
+
+# ==================================
+# RULES
+# ==================================
+@dataclass
+class Rule:
+    """
+    One declarative data-quality rule on a table column.
+
+    kind:
+        null_rate   fraction of NULLs must stay ≤ max_rate
+        range       fraction of non-NULL values outside
+                    [min_value, max_value] must stay ≤ max_rate
+        coverage    fraction of non-NULL values missing from
+                    `ref` ("schema.table.column") must stay ≤ max_rate
+        distinct    distinct values must lie in [min_value, max_value]
+        freshness   MAX(column) must be at most max_age_days old
+
+    severity "error" fails the step; "warn" only logs.
+    """
+
+    table: str
+    kind: str
+    column: str
+    max_rate: float = 0.0
+    min_value: float | None = None
+    max_value: float | None = None
+    ref: str | None = None
+    max_age_days: float | None = None
+    severity: str = "error"
+
+    @property
+    def name(self) -> str:
+        return f"{self.table}.{self.column}:{self.kind}"
+
+
+def null_rate(table, column, max_rate, severity="error") -> Rule:
+    return Rule(table, "null_rate", column, max_rate=max_rate, severity=severity)
+
+
+def value_range(table, column, min_value, max_value, max_rate=0.0, severity="error") -> Rule:
+    return Rule(
+        table, "range", column,
+        max_rate=max_rate, min_value=min_value, max_value=max_value, severity=severity,
+    )
+
+
+def coverage(table, column, ref, min_coverage=1.0, severity="error") -> Rule:
+    return Rule(table, "coverage", column, max_rate=1 - min_coverage, ref=ref, severity=severity)
+
+
+def distinct_count(table, column, min_value=None, max_value=None, severity="warn") -> Rule:
+    return Rule(
+        table, "distinct", column,
+        min_value=min_value, max_value=max_value, severity=severity,
+    )
+
+
+def freshness(table, column, max_age_days, severity="warn") -> Rule:
+    return Rule(table, "freshness", column, max_age_days=max_age_days, severity=severity)
+
+
+# Rules checked after each pipeline step writes the table.
+# Freshness rules are only declared on indexed columns, so
+# MAX() is an index probe rather than a scan.
+RULES: dict[str, list[Rule]] = {
+    "silver.stations": [
+        value_range("silver.stations", "latitude", -90, 90),
+        value_range("silver.stations", "longitude", -180, 180),
+        null_rate("silver.stations", "geom", 0.0),
+    ],
+    "silver.weather_daily": [
+        null_rate("silver.weather_daily", "value", 0.01, severity="warn"),
+        distinct_count("silver.weather_daily", "element", 1, 10),
+        freshness("silver.weather_daily", "obs_date", 30),
+    ],
+    "silver.weather_daily_pivot": [
+        # weather.transform converts GHCN tenths to °C / mm; an
+        # unconverted load shows up as tmax_c in the hundreds
+        value_range("silver.weather_daily_pivot", "tmax_c", -70, 60, max_rate=0.001),
+        value_range("silver.weather_daily_pivot", "tmin_c", -80, 50, max_rate=0.001),
+        value_range("silver.weather_daily_pivot", "prcp_mm", 0, 1000, max_rate=0.001),
+        value_range("silver.weather_daily_pivot", "snow_mm", 0, 2000, max_rate=0.001),
+    ],
+    "silver.us_accidents": [
+        # US including Alaska, Hawaii and territories
+        value_range("silver.us_accidents", "latitude", 17, 72),
+        value_range("silver.us_accidents", "longitude", -180, -64),
+        value_range("silver.us_accidents", "severity", 1, 4),
+        null_rate("silver.us_accidents", "geom", 0.001),
+        distinct_count("silver.us_accidents", "state", 40, 60),
+    ],
+    "silver.accident_station_map": [
+        coverage(
+            "silver.accident_station_map", "station_id",
+            "silver.stations.station_id", min_coverage=0.999,
+        ),
+        value_range("silver.accident_station_map", "distance_km", 0, 250, max_rate=0.01, severity="warn"),
+    ],
+    "gold.accident_weather": [
+        # Accidents whose nearest station has no reading that day
+        null_rate("gold.accident_weather", "tmax_c", 0.5, severity="warn"),
+        null_rate("gold.accident_weather", "prcp_mm", 0.5, severity="warn"),
+        value_range("gold.accident_weather", "tmax_c", -70, 60, max_rate=0.001),
+    ],
+}
+
+
+class DataQualityError(RuntimeError):
+    """
+    Raised when an "error" rule fails. Carries every rule result.
+    """
+
+    def __init__(self, table: str, results: list[dict]):
+        failed = [r["rule"] for r in results if r["status"] == "fail" and r["severity"] == "error"]
+        super().__init__(f"Data quality check failed for {table}: {', '.join(failed)}")
+        self.table = table
+        self.results = results
+
+
+# ==================================
+# STATISTICS
+# ==================================
+def wilson_interval(k: int, n: int, z: float = Z_95) -> tuple[float | None, float | None]:
+    """
+    Confidence interval for a proportion k/n.
+
+    Unlike the normal approximation it stays inside [0, 1] and
+    is informative when k = 0, the common case for clean data.
+    """
+
+    if n == 0:
+        return None, None
+
+    p = k / n
+    denom = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _rate_status(k: int, low, high, max_rate: float) -> str:
+    # Fail only when the whole interval is above the threshold
+    if low is None:
+        return "unknown"
+    # No violation seen: the upper bound only reflects the sample
+    # size (about 1.9e-4 for 20k rows), which would make every
+    # zero-tolerance rule warn on clean data
+    if k == 0:
+        return "pass"
+    if low > max_rate:
+        return "fail"
+    if high > max_rate:
+        return "warn"
+    return "pass"
+
+
+# ==================================
+# SAMPLING
+# ==================================
+def estimated_rows(conn, table: str) -> float:
+    """
+    Planner row estimate from pg_class, summed over
+    partitions for partitioned tables. Never scans.
+
+    Tables not analyzed since a bulk load report reltuples = -1;
+    those are sized from their page count instead.
+    """
+
+    return conn.execute(
+        text("""
+            SELECT COALESCE(SUM(
+                CASE
+                    WHEN c.reltuples >= 0 THEN c.reltuples
+                    ELSE pg_relation_size(c.oid) / current_setting('block_size')::INT
+                         * :rows_per_page
+                END
+            ), 0)
+            FROM pg_class c
+            WHERE c.oid = CAST(:table AS REGCLASS)
+               OR c.oid IN (
+                   SELECT inhrelid
+                   FROM pg_inherits
+                   WHERE inhparent = CAST(:table AS REGCLASS)
+               )
+        """),
+        {"table": table, "rows_per_page": ROWS_PER_PAGE_GUESS},
+    ).scalar()
+
+
+def _sample_clause(conn, table: str, full: bool, sample_rows: int) -> tuple[str, float]:
+    """
+    Returns (FROM clause, sampled percent).
+
+    TABLESAMPLE SYSTEM picks whole pages, so it reads only the
+    sampled fraction of the table. Rows on one page are not
+    independent, which makes the intervals somewhat optimistic
+    for tables physically clustered on the checked column.
+    """
+
+    rows = estimated_rows(conn, table)
+
+    if full or rows <= sample_rows:
+        return f"{table} s", 100.0
+
+    percent = max(0.01, min(100.0, 100.0 * sample_rows / rows))
+
+    return (
+        f"{table} s TABLESAMPLE SYSTEM ({percent:.4f}) REPEATABLE ({SAMPLE_SEED})",
+        percent,
+    )
+
+
+# ==================================
+# EVALUATION
+# ==================================
+def _counter_sql(rule: Rule, i: int) -> list[str]:
+    """
+    Aggregate expressions for a rate rule: [violations, observed].
+    """
+
+    col = f"s.{rule.column}"
+
+    if rule.kind == "null_rate":
+        return [f"COUNT(*) FILTER (WHERE {col} IS NULL) AS v{i}", f"COUNT(*) AS n{i}"]
+
+    if rule.kind == "range":
+        return [
+            f"COUNT(*) FILTER (WHERE {col} < {float(rule.min_value)} "
+            f"OR {col} > {float(rule.max_value)}) AS v{i}",
+            f"COUNT({col}) AS n{i}",
+        ]
+
+    if rule.kind == "coverage":
+        ref_schema, ref_table, ref_column = rule.ref.split(".")
+        return [
+            f"""COUNT(*) FILTER (WHERE {col} IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM {ref_schema}.{ref_table} r
+                WHERE r.{ref_column} = {col}
+            )) AS v{i}""",
+            f"COUNT({col}) AS n{i}",
+        ]
+
+    raise ValueError(f"Not a rate rule: {rule.kind}")
+
+
+def _distinct(conn, rule: Rule, source: str, full: bool) -> dict:
+    """
+    Distinct count from pg_stats (the ANALYZE estimate),
+    falling back to the sample, which only gives a lower bound.
+    """
+
+    estimate, method = None, None
+
+    if not full:
+        schema, table = rule.table.split(".")
+        n_distinct = conn.execute(
+            text("""
+                SELECT n_distinct
+                FROM pg_stats
+                WHERE schemaname = :schema
+                  AND tablename = :table
+                  AND attname = :column
+                ORDER BY inherited DESC
+                LIMIT 1
+            """),
+            {"schema": schema, "table": table, "column": rule.column},
+        ).scalar()
+
+        if n_distinct is not None:
+            # Negative values are a fraction of the row count
+            estimate = (
+                n_distinct if n_distinct >= 0
+                else -n_distinct * estimated_rows(conn, rule.table)
+            )
+            method = "pg_stats"
+
+    if estimate is None:
+        estimate = conn.execute(
+            text(f"SELECT COUNT(DISTINCT s.{rule.column}) FROM {source}")
+        ).scalar()
+        method = "full" if full else "sample (lower bound)"
+
+    too_low = rule.min_value is not None and estimate < rule.min_value
+    too_high = rule.max_value is not None and estimate > rule.max_value
+
+    # A sampled count can only undercount
+    if too_low and method == "sample (lower bound)":
+        status = "warn"
+    else:
+        status = "fail" if too_low or too_high else "pass"
+
+    return {"estimate": round(estimate), "method": method, "status": status}
+
+
+def _freshness(conn, rule: Rule) -> dict:
+    age_days = conn.execute(
+        text(f"""
+            SELECT EXTRACT(EPOCH FROM now() - MAX({rule.column})::TIMESTAMPTZ) / 86400
+            FROM {rule.table}
+        """)
+    ).scalar()
+
+    if age_days is None:
+        return {"estimate": None, "method": "max", "status": "unknown"}
+
+    return {
+        "estimate": round(float(age_days), 2),
+        "method": "max",
+        "status": "fail" if age_days > rule.max_age_days else "pass",
+    }
+
+
+def check(
+    engine,
+    table_name: str,
+    rules: list[Rule] | None = None,
+    full: bool = False,
+    sample_rows: int = SAMPLE_ROWS,
+) -> list[dict]:
+    """
+    Evaluates the data-quality rules for one table.
+
+    Rate rules (null_rate, range, coverage) share a single
+    pass over a TABLESAMPLE of about `sample_rows` rows and
+    report the sample rate with a 95% Wilson interval. A rule
+    fails only when the whole interval is above its threshold
+    and warns when the interval straddles it. A sample with
+    no violations passes.
+
+    full=True scans the whole table instead (as do tables
+    smaller than the sample); the rates are then exact.
+    Distinct counts come from pg_stats unless full=True.
+
+    Returns:
+        One dict per rule: rule, kind, severity, status
+        (pass / warn / fail / unknown), estimate, interval,
+        method and sampled rows.
+    """
+
+    rules = RULES.get(table_name, []) if rules is None else rules
+    if not rules:
+        return []
+
+    results = []
+    start_time = time.perf_counter()
+
+    with engine.connect() as conn:
+        source, percent = _sample_clause(conn, table_name, full, sample_rows)
+
+        # ----------------------------------
+        # Rate rules: one sampled pass
+        # ----------------------------------
+        rate_rules = [r for r in rules if r.kind in ("null_rate", "range", "coverage")]
+
+        if rate_rules:
+            select = [e for i, r in enumerate(rate_rules) for e in _counter_sql(r, i)]
+
+            counts = conn.execute(
+                text(f"SELECT {', '.join(select)} FROM {source}")
+            ).mappings().one()
+
+            for i, rule in enumerate(rate_rules):
+                k, n = counts[f"v{i}"], counts[f"n{i}"]
+                low, high = (k / n, k / n) if percent >= 100 and n else wilson_interval(k, n)
+
+                results.append({
+                    "rule": rule.name,
+                    "kind": rule.kind,
+                    "severity": rule.severity,
+                    "status": _rate_status(k, low, high, rule.max_rate),
+                    "estimate": round(k / n, 6) if n else None,
+                    "interval": (round(low, 6), round(high, 6)) if n else None,
+                    "threshold": rule.max_rate,
+                    "method": "full" if percent >= 100 else f"sample {percent:.2f}%",
+                    "sampled": n,
+                })
+
+        # ----------------------------------
+        # Catalog / index rules
+        # ----------------------------------
+        for rule in rules:
+            if rule.kind == "distinct":
+                outcome = _distinct(conn, rule, source, full)
+            elif rule.kind == "freshness":
+                outcome = _freshness(conn, rule)
+            elif rule.kind in ("null_rate", "range", "coverage"):
+                continue
+            else:
+                raise ValueError(f"Unknown rule kind: {rule.kind}")
+
+            results.append({
+                "rule": rule.name,
+                "kind": rule.kind,
+                "severity": rule.severity,
+                "interval": None,
+                "threshold": (
+                    rule.max_age_days if rule.kind == "freshness"
+                    else (rule.min_value, rule.max_value)
+                ),
+                "sampled": None,
+                **outcome,
+            })
+
+    elapsed = time.perf_counter() - start_time
+
+    for r in results:
+        if r["status"] in ("warn", "fail"):
+            logger.warning(
+                f"[quality] {r['rule']} {r['status'].upper()}: "
+                f"estimate {r['estimate']} interval {r['interval']} "
+                f"threshold {r['threshold']} ({r['method']})"
+            )
+
+    logger.info(
+        f"[quality] {table_name}: {len(results)} rule(s) checked "
+        f"in {elapsed:.2f} seconds"
+    )
+
+    return results
+
+
+def enforce(engine, table_name: str, full: bool = False) -> list[dict]:
+    """
+    Runs check() and raises DataQualityError when any
+    "error" rule fails. Returns the results otherwise.
+    """
+
+    results = check(engine, table_name, full=full)
+
+    if any(r["status"] == "fail" and r["severity"] == "error" for r in results):
+        raise DataQualityError(table_name, results)
+
+    return results
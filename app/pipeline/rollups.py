@@ -0,0 +1,440 @@
+# ==================================
+# Imports
+# ==================================
+import time
+from datetime import date
+from typing import TYPE_CHECKING
+from sqlalchemy import text
+
+from components.db import get_engine
+from components.tuning import apply_tuning
+from pipeline.validators import validate_table, validate_tables, invalidate
+from pipeline.watermarks import get_watermark, set_watermark
+from components.logger import get_logger
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# Constants
+# ==================================
+WATERMARK_NAME = "gold.rollups"
+
+# Weather bands (mm / °C). Weather-less accidents fall into "unknown".
+# Gold carries the units converted by weather.transform, not GHCN
+# tenths; the 2026_weather_units data fix resets the rollup watermark
+# so slices built from tenths are rebuilt in full.
+PRCP_BAND = """
+    CASE
+        WHEN g.prcp_mm IS NULL THEN 'unknown'
+        WHEN g.prcp_mm = 0 THEN 'none'
+        WHEN g.prcp_mm < 2.5 THEN 'light'
+        WHEN g.prcp_mm < 10 THEN 'moderate'
+        ELSE 'heavy'
+    END
+"""
+
+SNOW_BAND = """
+    CASE
+        WHEN g.snow_mm IS NULL THEN 'unknown'
+        WHEN g.snow_mm = 0 THEN 'none'
+        WHEN g.snow_mm < 25 THEN 'light'
+        WHEN g.snow_mm < 100 THEN 'moderate'
+        ELSE 'heavy'
+    END
+"""
+
+TEMP_BAND = """
+    CASE
+        WHEN g.tmax_c IS NULL THEN 'unknown'
+        WHEN g.tmax_c < 0 THEN 'freezing'
+        WHEN g.tmax_c < 10 THEN 'cold'
+        WHEN g.tmax_c < 25 THEN 'mild'
+        ELSE 'hot'
+    END
+"""
+
+# Additive measures stored in every rollup
+MEASURE_COLUMNS = (
+    "accident_count",
+    "distance_km_sum",
+    "tmax_sum",
+    "tmax_count",
+    "tmin_sum",
+    "tmin_count",
+    "prcp_sum",
+    "prcp_count",
+    "snow_sum",
+    "snow_count",
+)
+
+# Rollups ordered coarsest → finest.
+# Each coarser rollup is re-aggregated from the finest one.
+ROLLUPS = {
+    "gold.rollup_state_month": (
+        "state",
+        "month",
+    ),
+    "gold.rollup_state_month_severity": (
+        "state",
+        "month",
+        "severity",
+        "darkness_level",
+    ),
+    "gold.rollup_accident_weather": (
+        "state",
+        "month",
+        "severity",
+        "darkness_level",
+        "prcp_band",
+        "snow_band",
+        "temp_band",
+    ),
+}
+
+FINEST_ROLLUP = "gold.rollup_accident_weather"
+
+# Finest rollup computed straight from gold.
+# {scope} restricts it to the changed slices.
+FINEST_SELECT = f"""
+    SELECT
+        g.state,
+        DATE_TRUNC('month', g.obs_date)::DATE AS month,
+        g.severity,
+        g.darkness_level,
+        {PRCP_BAND} AS prcp_band,
+        {SNOW_BAND} AS snow_band,
+        {TEMP_BAND} AS temp_band,
+        COUNT(*) AS accident_count,
+        SUM(g.distance_km) AS distance_km_sum,
+        SUM(g.tmax_c) AS tmax_sum,
+        COUNT(g.tmax_c) AS tmax_count,
+        SUM(g.tmin_c) AS tmin_sum,
+        COUNT(g.tmin_c) AS tmin_count,
+        SUM(g.prcp_mm) AS prcp_sum,
+        COUNT(g.prcp_mm) AS prcp_count,
+        SUM(g.snow_mm) AS snow_sum,
+        COUNT(g.snow_mm) AS snow_count
+    FROM gold.accident_weather g
+    {{scope}}
+    GROUP BY 1, 2, 3, 4, 5, 6, 7
+"""
+
+# (state, month) slices touched since the watermark, plus the
+# slices gold rows moved out of (gold.rollup_retired_slices).
+# Held in a temp table so every rollup recomputes the same set.
+CHANGED_SLICES = """
+    CREATE TEMP TABLE rollup_changed_slices ON COMMIT DROP AS
+    SELECT
+        state,
+        DATE_TRUNC('month', obs_date)::DATE AS month
+    FROM gold.accident_weather
+    WHERE updated_at > :low_water
+      AND updated_at <= :high_water
+
+    UNION
+
+    SELECT state, month
+    FROM gold.rollup_retired_slices
+    WHERE retired_at > :low_water
+      AND retired_at <= :high_water
+"""
+
+# Latest change: a build that only moved rows away leaves
+# MAX(updated_at) where it was
+HIGH_WATER = """
+    SELECT GREATEST(
+        (SELECT MAX(updated_at) FROM gold.accident_weather),
+        (SELECT MAX(retired_at) FROM gold.rollup_retired_slices)
+    )
+"""
+
+# Queryable measures → expressions over the rollup columns (°C / mm)
+MEASURES = {
+    "accidents": "SUM(accident_count)",
+    "avg_distance_km": "SUM(distance_km_sum) / NULLIF(SUM(accident_count), 0)",
+    "avg_tmax_c": "SUM(tmax_sum) / NULLIF(SUM(tmax_count), 0)",
+    "avg_tmin_c": "SUM(tmin_sum) / NULLIF(SUM(tmin_count), 0)",
+    "avg_prcp_mm": "SUM(prcp_sum) / NULLIF(SUM(prcp_count), 0)",
+    "avg_snow_mm": "SUM(snow_sum) / NULLIF(SUM(snow_count), 0)",
+    "weather_coverage": "SUM(tmax_count)::FLOAT / NULLIF(SUM(accident_count), 0)",
+}
+
+
+# ==================================
+# SLICE REFRESH
+# ==================================
+def _refresh_rollup(conn, table: str, scoped: bool):
+    """
+    Replaces the rows of one rollup, for the changed
+    slices only (scoped=True) or entirely.
+    """
+
+    dims = ROLLUPS[table]
+
+    if scoped:
+        conn.execute(text(f"""
+            DELETE FROM {table} r
+            USING rollup_changed_slices c
+            WHERE r.state IS NOT DISTINCT FROM c.state
+              AND r.month = c.month
+        """))
+    else:
+        conn.execute(text(f"TRUNCATE TABLE {table}"))
+
+    if table == FINEST_ROLLUP:
+        scope = """
+            JOIN rollup_changed_slices c
+                ON g.state IS NOT DISTINCT FROM c.state
+                AND g.obs_date >= c.month
+                AND g.obs_date < c.month + INTERVAL '1 month'
+        """ if scoped else ""
+
+        select = FINEST_SELECT.format(scope=scope)
+
+    else:
+        scope = """
+            JOIN rollup_changed_slices c
+                ON f.state IS NOT DISTINCT FROM c.state
+                AND f.month = c.month
+        """ if scoped else ""
+
+        measures = ",\n".join(
+            f"SUM(f.{m}) AS {m}" for m in MEASURE_COLUMNS
+        )
+
+        select = f"""
+            SELECT
+                {", ".join(f"f.{d}" for d in dims)},
+                {measures}
+            FROM {FINEST_ROLLUP} f
+            {scope}
+            GROUP BY {", ".join(f"f.{d}" for d in dims)}
+        """
+
+    return conn.execute(text(f"""
+        INSERT INTO {table} (
+            {", ".join(dims)},
+            {", ".join(MEASURE_COLUMNS)}
+        )
+        {select}
+    """)).rowcount
+
+
+# ==================================
+# BUILD ROLLUPS
+# ==================================
+def build(incremental: bool = True) -> dict:
+    """
+    Maintain the gold.rollup_* aggregate tables.
+
+    Modes:
+        incremental=True
+            Recomputes only the (state, month) slices containing
+            gold rows whose updated_at moved since the last
+            build, and the slices gold rows moved out of
+            (gold.rollup_retired_slices). Falls back to a full
+            build when no watermark exists yet. Slices emptied by
+            rows deleted upstream need a full build.
+
+        incremental=False
+            Rebuilds every rollup from scratch.
+
+    The finest rollup is built from gold; coarser ones are
+    re-aggregated from it, so gold is scanned once per slice.
+
+    Returns:
+        dict with slices and rows refreshed, mode and execution time.
+    """
+
+    engine = get_engine("transform")
+
+    # ----------------------------------
+    # Validate Dependencies
+    # ----------------------------------
+    validate_table(engine, "gold.accident_weather", not_empty=True)
+
+    validate_tables(engine, list(ROLLUPS), not_empty=False)
+
+    start_time = time.perf_counter()
+
+    with engine.begin() as conn:
+        apply_tuning(conn, "heavy_transform")
+
+        # ----------------------------------
+        # Watermark Window
+        # ----------------------------------
+        high_water = conn.execute(text(HIGH_WATER)).scalar()
+
+        low_water = get_watermark(conn, WATERMARK_NAME) if incremental else None
+
+        if incremental and low_water is None:
+            logger.info("No rollup watermark found. Running full build.")
+
+        mode = "incremental" if low_water is not None else "full"
+        slices = None
+
+        if mode == "incremental":
+            if high_water is None or high_water <= low_water:
+                logger.info(f"No gold changes since {low_water}. Skipping rollups.")
+                slices = 0
+            else:
+                conn.execute(
+                    text(CHANGED_SLICES),
+                    {"low_water": low_water, "high_water": high_water},
+                )
+                slices = conn.execute(
+                    text("SELECT COUNT(*) FROM rollup_changed_slices")
+                ).scalar()
+
+                logger.info(f"Refreshing rollups for {slices:,} state-month slice(s)")
+
+        # ----------------------------------
+        # Refresh (finest first)
+        # ----------------------------------
+        rows = {}
+
+        if slices != 0:
+            for table in reversed(ROLLUPS):
+                rows[table] = _refresh_rollup(conn, table, scoped=mode == "incremental")
+
+        # Advance watermark atomically with the rollup rows;
+        # retired slices up to it are consumed
+        if high_water is not None:
+            set_watermark(conn, WATERMARK_NAME, high_water)
+            conn.execute(
+                text("DELETE FROM gold.rollup_retired_slices WHERE retired_at <= :high_water"),
+                {"high_water": high_water},
+            )
+
+    invalidate(*ROLLUPS)
+
+    elapsed = time.perf_counter() - start_time
+
+    logger.info(
+        f"Rollups built ({mode}): "
+        + ", ".join(f"{t} {n:,} rows" for t, n in rows.items())
+        + f" in {elapsed:.2f} seconds"
+    )
+
+    return {
+        "mode": mode,
+        "slices_refreshed": slices,
+        "rows_refreshed": sum(rows.values()),
+        "seconds": round(elapsed, 2),
+    }
+
+
+# ==================================
+# QUERY API
+# ==================================
+def route(dimensions: set[str] | list[str]) -> str:
+    """
+    Returns the smallest rollup whose grain covers `dimensions`.
+    """
+
+    wanted = set(dimensions)
+
+    for table, dims in ROLLUPS.items():
+        if wanted <= set(dims):
+            return table
+
+    raise ValueError(f"No rollup covers dimensions: {sorted(wanted)}")
+
+
+def query(
+    measures: list[str] | None = None,
+    group_by: list[str] | None = None,
+    filters: dict | None = None,
+    start_month: date | None = None,
+    end_month: date | None = None,
+    order_by: str | None = None,
+    limit: int | None = None,
+) -> "pd.DataFrame":
+    """
+    Aggregates accident measures from the rollups.
+
+    Args:
+        measures: Names from MEASURES (default: ["accidents"]).
+        group_by: Rollup dimensions to group on.
+        filters: {dimension: value or list of values}.
+        start_month / end_month: Inclusive month range.
+        order_by: Measure or dimension; prefix "-" for descending.
+        limit: Max rows returned.
+
+    The request is answered from the coarsest rollup that has
+    every grouped and filtered dimension, e.g.:
+
+        query(["accidents"], group_by=["state"],
+              filters={"prcp_band": ["moderate", "heavy"]})
+    """
+
+    measures = measures or ["accidents"]
+    group_by = group_by or []
+    filters = filters or {}
+
+    unknown = [m for m in measures if m not in MEASURES]
+    if unknown:
+        raise ValueError(f"Unknown measure(s): {unknown}")
+
+    dimensions = set(group_by) | set(filters)
+    if start_month or end_month:
+        dimensions.add("month")
+
+    table = route(dimensions)
+
+    # ----------------------------------
+    # WHERE
+    # ----------------------------------
+    clauses, params = [], {}
+
+    for i, (dim, value) in enumerate(filters.items()):
+        if isinstance(value, (list, tuple, set)):
+            clauses.append(f"{dim} = ANY(:f{i})")
+            params[f"f{i}"] = list(value)
+        elif value is None:
+            clauses.append(f"{dim} IS NULL")
+        else:
+            clauses.append(f"{dim} = :f{i}")
+            params[f"f{i}"] = value
+
+    if start_month:
+        clauses.append("month >= DATE_TRUNC('month', CAST(:start_month AS DATE))")
+        params["start_month"] = start_month
+
+    if end_month:
+        clauses.append("month <= CAST(:end_month AS DATE)")
+        params["end_month"] = end_month
+
+    # ----------------------------------
+    # SQL
+    # ----------------------------------
+    select = list(group_by) + [f"{MEASURES[m]} AS {m}" for m in measures]
+
+    sql = f"SELECT {', '.join(select)} FROM {table}"
+
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+
+    if group_by:
+        sql += " GROUP BY " + ", ".join(group_by)
+
+    if order_by:
+        column = order_by.lstrip("-")
+        if column not in group_by and column not in measures:
+            raise ValueError(f"Cannot order by {column}")
+        sql += f" ORDER BY {column} {'DESC' if order_by.startswith('-') else 'ASC'} NULLS LAST"
+
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+
+    logger.debug(f"Rollup query routed to {table}")
+
+    import pandas as pd
+
+    with get_engine().connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
@@ -0,0 +1,367 @@
+# ==================================
+# Imports
+# ==================================
+import contextvars
+import json
+import os
+import resource
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import event, text
+
+from components.logger import get_logger
+from components.tuning import add_tuning_listener
+
+
+logger = get_logger(__name__)
+
+
+# ==================================
+# Constants
+# ==================================
+# Result keys reporting rows written, in order of preference
+ROWS_OUT_KEYS = (
+    "rows_written",
+    "rows_refreshed",
+    "rows_inserted",
+    "accepted",
+    "downloaded",
+)
+
+RSS_SAMPLE_SECONDS = 0.5
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Metrics collector of the step running on this thread
+_current = contextvars.ContextVar("step_metrics", default=None)
+
+
+# ==================================
+# PROCESS PROBES
+# ==================================
+def _rss_bytes() -> int:
+    """
+    Current resident set size of this process.
+    """
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        # ru_maxrss is in KB on Linux; best effort elsewhere
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _bytes_read() -> int | None:
+    """
+    Bytes this process has read through read()-family
+    syscalls (files, sockets, pipes), from /proc/self/io.
+    """
+
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    return None
+
+
+# ==================================
+# DB TIME
+# ==================================
+def install_db_timer(engine):
+    """
+    Attributes statement execution time on `engine`
+    to the step collecting metrics on the calling thread.
+    Safe to call repeatedly.
+    """
+
+    if event.contains(engine, "before_cursor_execute", _before_execute):
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    metrics = _current.get()
+
+    if metrics is not None:
+        metrics.db_seconds += time.perf_counter() - started
+
+
+# ==================================
+# STEP METRICS
+# ==================================
+class StepMetrics:
+    """
+    Collects resource metrics while a step runs.
+
+    Intended usage:
+        with StepMetrics() as metrics:
+            result = step()
+        metrics.as_dict()
+
+    Notes:
+    - peak RSS and bytes read are process-wide, so steps
+      running concurrently see each other's usage.
+    - DB time counts SQLAlchemy statements issued from the
+      step's thread, and from worker threads started with
+      contextvars.copy_context(); COPY over raw connections
+      is not included.
+    - tuning lists the session profiles the step applied
+      (components.tuning).
+    """
+
+    def __init__(self):
+        self.started_at = None
+        self.ended_at = None
+        self.db_seconds = 0.0
+        self.peak_rss = 0
+        self.bytes_read = None
+        self.tuning = {}
+        self._bytes_start = None
+        self._stop = threading.Event()
+        self._sampler = None
+        self._token = None
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    def __enter__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.peak_rss = _rss_bytes()
+        self._bytes_start = _bytes_read()
+        self._token = _current.set(self)
+
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._sampler.join()
+        _current.reset(self._token)
+
+        self.ended_at = datetime.now(timezone.utc)
+        self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+        end = _bytes_read()
+        if end is not None and self._bytes_start is not None:
+            self.bytes_read = end - self._bytes_start
+
+        return False
+
+    def as_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "bytes_read": self.bytes_read,
+            "peak_rss_mb": round(self.peak_rss / 1024 ** 2, 1),
+            "db_seconds": round(self.db_seconds, 3),
+            "tuning": self.tuning or None,
+        }
+
+
+def note_tuning(profile: str, settings: dict):
+    """
+    Records a session tuning profile applied by the step
+    collecting metrics on this thread (no-op outside a step).
+    """
+
+    metrics = _current.get()
+
+    if metrics is not None:
+        metrics.tuning[profile] = settings
+
+
+add_tuning_listener(note_tuning)
+
+
+# ==================================
+# ROW COUNTS
+# ==================================
+def extract_rows(result) -> tuple[int | None, int | None]:
+    """
+    Best-effort (rows_in, rows_out) from a step's result dict.
+
+    Nested results (e.g. {"bronze": ..., "silver": ...}) report
+    the last stage's output. Ingest steps also report rejected
+    rows, so rows_in = accepted + rejected.
+    """
+
+    if not isinstance(result, dict):
+        return None, None
+
+    for key in ROWS_OUT_KEYS:
+        if isinstance(result.get(key), int):
+            rows_out = result[key]
+            rejected = result.get("rows_rejected")
+            rows_in = rows_out + rejected if isinstance(rejected, int) else None
+            return rows_in, rows_out
+
+    nested = [v for v in result.values() if isinstance(v, dict)]
+    if nested:
+        return extract_rows(nested[-1])
+
+    return None, None
+
+
+# ==================================
+# RUN RECORDS
+# ==================================
+def _json(value) -> str | None:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def start_run(conn, params: dict) -> int:
+    """
+    Inserts a 'running' pipeline run and returns its run_id.
+    """
+
+    return conn.execute(
+        text("""
+            INSERT INTO meta.pipeline_runs (params)
+            VALUES (CAST(:params AS JSONB))
+            RETURNING run_id
+        """),
+        {"params": _json(params)},
+    ).scalar()
+
+
+def get_run(conn, run_id: int) -> dict | None:
+    """
+    Returns the pipeline_runs row for `run_id` as a dict.
+    """
+
+    row = conn.execute(
+        text("SELECT * FROM meta.pipeline_runs WHERE run_id = :run_id"),
+        {"run_id": run_id},
+    ).mappings().first()
+
+    return dict(row) if row else None
+
+
+def completed_steps(conn, run_id: int) -> dict:
+    """
+    Returns {step: result} for steps whose latest attempt
+    in `run_id` succeeded or was skipped.
+    """
+
+    rows = conn.execute(
+        text("""
+            SELECT step, status, result
+            FROM (
+                SELECT DISTINCT ON (step) step, status, result
+                FROM meta.step_runs
+                WHERE run_id = :run_id
+                ORDER BY step, id DESC
+            ) latest
+            WHERE status IN ('success', 'skipped')
+        """),
+        {"run_id": run_id},
+    ).fetchall()
+
+    return {step: result for step, status, result in rows}
+
+
+def reopen_run(conn, run_id: int):
+    """
+    Marks a run as running again for a resume attempt.
+    """
+
+    conn.execute(
+        text("""
+            UPDATE meta.pipeline_runs
+            SET status = 'running',
+                ended_at = NULL,
+                error = NULL,
+                resumes = resumes + 1
+            WHERE run_id = :run_id
+        """),
+        {"run_id": run_id},
+    )
+
+
+def finish_run(conn, run_id: int, status: str, report: dict | None = None, error: str | None = None):
+    report = report or {}
+
+    conn.execute(
+        text("""
+            UPDATE meta.pipeline_runs
+            SET ended_at = now(),
+                status = :status,
+                seconds = :seconds,
+                critical_path = CAST(:critical_path AS JSONB),
+                critical_path_seconds = :critical_path_seconds,
+                error = :error
+            WHERE run_id = :run_id
+        """),
+        {
+            "run_id": run_id,
+            "status": status,
+            "seconds": report.get("seconds"),
+            "critical_path": _json(report.get("critical_path")),
+            "critical_path_seconds": report.get("critical_path_seconds"),
+            "error": error,
+        },
+    )
+
+
+def record_step(
+    conn,
+    run_id: int | None,
+    step: str,
+    status: str,
+    metrics: dict,
+    seconds: float,
+    params: dict | None = None,
+    fingerprint: str | None = None,
+    result=None,
+    error: str | None = None,
+):
+    """
+    Inserts one meta.step_runs row.
+    """
+
+    rows_in, rows_out = extract_rows(result)
+
+    conn.execute(
+        text("""
+            INSERT INTO meta.step_runs (
+                run_id, step, status, started_at, ended_at, seconds,
+                rows_in, rows_out, bytes_read, peak_rss_mb, db_seconds,
+                tuning, params, fingerprint, result, error
+            )
+            VALUES (
+                :run_id, :step, :status, :started_at, :ended_at, :seconds,
+                :rows_in, :rows_out, :bytes_read, :peak_rss_mb, :db_seconds,
+                CAST(:tuning AS JSONB), CAST(:params AS JSONB), :fingerprint,
+                CAST(:result AS JSONB), :error
+            )
+        """),
+        {
+            "run_id": run_id,
+            "step": step,
+            "status": status,
+            "seconds": round(seconds, 3),
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "params": _json(params),
+            "fingerprint": fingerprint,
+            "result": _json(result),
+            "error": error,
+            **metrics,
+            "tuning": _json(metrics.get("tuning")),
+        },
+    )
@@ -4,11 +4,12 @@
 from pathlib import Path
 import csv
 import requests
-import pandas as pd
 from sqlalchemy import text
 
-from pipeline.validators import validate_table
-from components.db import get_engine
+from pipeline.validators import validate_table, invalidate
+from components.db import get_engine, copy_connection, copy_csv_stream, resolve_copy_format
+from components.bulk_load import bulk_load
+from components.tuning import apply_tuning
 from components.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +23,40 @@ BASE_URL = "https://www.ncei.noaa.gov/pub/data/ghcn/daily"
 OUT_DIR = Path("/data/landing/stations")
 ARCHIVE_DIR = Path("/data/archive/stations")
 
+# Landing CSV column order (see download())
+BRONZE_COLUMNS = (
+    "station_id",
+    "latitude",
+    "longitude",
+    "elevation",
+    "state",
+    "name",
+    "gsn",
+    "hcn",
+    "wmo",
+)
+
+
+# ==================================
+# REMOTE SIGNATURE
+# ==================================
+def remote_signature() -> dict:
+    """
+    HTTP validators of the NOAA station list (HEAD request only).
+
+    Changes whenever NOAA publishes a new ghcnd-stations.txt,
+    so callers can tell if a download would fetch anything new.
+    """
+
+    r = requests.head(f"{BASE_URL}/ghcnd-stations.txt", timeout=30)
+    r.raise_for_status()
+
+    return {
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "content_length": r.headers.get("Content-Length"),
+    }
+
 
 # ==================================
 # DOWNLOAD
@@ -47,17 +82,7 @@ def download() -> Path:
 
         writer = csv.writer(fout)
 
-        writer.writerow([
-            "station_id",
-            "latitude",
-            "longitude",
-            "elevation",
-            "state",
-            "name",
-            "gsn",
-            "hcn",
-            "wmo",
-        ])
+        writer.writerow(BRONZE_COLUMNS)
 
         for line in fin:
             station_id = line[0:11].strip()
@@ -93,13 +118,18 @@ def download() -> Path:
 # ==================================
 # INGEST → BRONZE
 # ==================================
-def ingest(truncate: bool = False) -> dict:
+def ingest(truncate: bool = False, bulk: bool = False, copy_format: str = "csv") -> dict:
     """
     Load ghcnd-stations.csv into bronze.stations.
     Moves file to archive after successful load.
+
+    bulk=True drops the bronze secondary indexes for the load
+    and rebuilds them afterwards (see components.bulk_load).
+
+    copy_format selects CSV or binary COPY (see components.db).
     """
 
-    engine = get_engine()
+    engine = get_engine("bulk")
 
     # -----------------------------
     # Ensure bronze table exists
@@ -117,31 +147,36 @@ def ingest(truncate: bool = False) -> dict:
             "Stations CSV not found. Run download() first."
         )
 
-    df = pd.read_csv(csv_path)
-    row_count = len(df)
-
-    if row_count == 0:
-        raise ValueError("Stations CSV is empty.")
+    copy_format = resolve_copy_format(copy_format)
 
-    with engine.begin() as conn:
+    with (
+        bulk_load(engine, ["bronze.stations"], enabled=bulk),
+        copy_connection(engine, copy_format) as raw_conn,
+    ):
+        apply_tuning(raw_conn, "bulk_load")
 
         # ✅ Only truncate if requested
         if truncate:
             logger.info("Truncating bronze.stations")
-            conn.execute(text("TRUNCATE TABLE bronze.stations"))
-
-        df.to_sql(
-            name="stations",
-            schema="bronze",
-            con=conn,
-            if_exists="append",
-            index=False,
-            method="multi"
-        )
+            cur = raw_conn.cursor()
+            cur.execute("TRUNCATE TABLE bronze.stations")
+            cur.close()
+
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            row_count = copy_csv_stream(
+                raw_conn, "bronze.stations", BRONZE_COLUMNS, f, copy_format
+            )
+
+        # Closing without commit rolls back the truncate
+        if row_count == 0:
+            raise ValueError("Stations CSV is empty.")
+
+        raw_conn.commit()
 
     # -----------------------------
     # Post-Ingest Validation
     # -----------------------------
+    invalidate("bronze.stations")
     validate_table(
         engine,
         "bronze.stations",
@@ -174,12 +209,15 @@ def ingest(truncate: bool = False) -> dict:
 # ==================================
 # TRANSFORM → SILVER
 # ==================================
-def transform(truncate: bool = False) -> dict:
+def transform(truncate: bool = False, bulk: bool = False) -> dict:
     """
     Transform bronze.stations → silver.stations using SQL.
+
+    bulk=True drops the silver secondary indexes for the load
+    and rebuilds them afterwards.
     """
 
-    engine = get_engine()
+    engine = get_engine("transform")
 
     # -----------------------------
     # Pre-Transform Validation
@@ -195,7 +233,10 @@ def transform(truncate: bool = False) -> dict:
         ],
     )
 
-    with engine.begin() as conn:
+    with (
+        bulk_load(engine, ["silver.stations"], enabled=bulk),
+        engine.begin() as conn,
+    ):
 
         if truncate:
             conn.execute(text("TRUNCATE TABLE silver.stations"))
@@ -242,6 +283,7 @@ def transform(truncate: bool = False) -> dict:
     # -----------------------------
     # Post-Transform Validation
     # -----------------------------
+    invalidate("silver.stations")
     validate_table(
         engine,
         "silver.stations",
@@ -3,6 +3,10 @@
 # ----------------------------------
 from sqlalchemy import text
 
+# Catalog cache lives in components (the UI invalidates it
+# too); re-exported for the pipeline modules
+from components.catalog import describe_tables, invalidate  # noqa: F401
+
 
 # ==================================
 # CORE UTILITIES
@@ -121,6 +125,75 @@ def table_columns(engine, table_name: str) -> set:
 # STRICT VALIDATOR
 # ==================================
 
+def validate_tables(
+    engine,
+    table_names: list[str],
+    not_empty: bool = False,
+    required_columns: dict[str, list[str]] | None = None,
+) -> dict[str, bool]:
+    """
+    Batch form of validate_table: existence, required
+    columns and (optionally) non-emptiness of many tables
+    in a single catalog query.
+
+    Args:
+        engine: SQLAlchemy engine
+        table_names: ["schema.table", ...]
+        not_empty: If True, every table must contain at least one row.
+        required_columns: {table: [column, ...]} that must exist.
+
+    Returns:
+        {table: passed}. passed is False ONLY when not_empty=True
+        and the table exists but has no rows.
+
+    Raises:
+        ValueError:
+            - If required_columns names a table not in table_names
+        RuntimeError:
+            - If any table does not exist
+            - If any required columns are missing
+    """
+
+    required_columns = required_columns or {}
+
+    unknown = set(required_columns) - set(table_names)
+    if unknown:
+        raise ValueError(
+            f"required_columns names tables not in table_names: {', '.join(sorted(unknown))}"
+        )
+
+    info = describe_tables(engine, table_names, check_rows=not_empty)
+
+    # ------------------------------------------------
+    # 1️⃣ Existence Check (ALWAYS REQUIRED)
+    # ------------------------------------------------
+    absent = [name for name in table_names if not info[name]["exists"]]
+
+    if absent:
+        raise RuntimeError(
+            f"Required table does not exist: {', '.join(absent)}"
+        )
+
+    # ------------------------------------------------
+    # 2️⃣ Column Validation (Optional)
+    # ------------------------------------------------
+    for name, columns in required_columns.items():
+        missing = set(columns) - info[name]["columns"]
+
+        if missing:
+            raise RuntimeError(
+                f"{name} missing required columns: {missing}"
+            )
+
+    # ------------------------------------------------
+    # 3️⃣ Non-Empty Validation (Optional)
+    # ------------------------------------------------
+    return {
+        name: bool(info[name]["has_rows"]) if not_empty else True
+        for name in table_names
+    }
+
+
 def validate_table(
     engine,
     table_name: str,
@@ -135,6 +208,9 @@ def validate_table(
     - Optionally enforce required columns.
     - Optionally enforce non-empty condition.
 
+    Catalog answers are cached briefly (see CACHE_TTL_SECONDS);
+    writers call invalidate() before re-validating a table.
+
     This function does NOT:
     - Create tables
     - Modify schema
@@ -158,36 +234,11 @@ def validate_table(
             - If required columns are missing
     """
 
-    # ------------------------------------------------
-    # 1️⃣ Existence Check (ALWAYS REQUIRED)
-    # ------------------------------------------------
-    if not table_exists(engine, table_name):
-        raise RuntimeError(
-            f"Required table does not exist: {table_name}"
-        )
-
-    # ------------------------------------------------
-    # 2️⃣ Column Validation (Optional)
-    # ------------------------------------------------
-    if required_columns:
-        existing_columns = table_columns(engine, table_name)
-        missing = set(required_columns) - existing_columns
-
-        if missing:
-            raise RuntimeError(
-                f"{table_name} missing required columns: {missing}"
-            )
-
-    # ------------------------------------------------
-    # 3️⃣ Non-Empty Validation (Optional)
-    # ------------------------------------------------
-    if not_empty:
-        if not table_has_rows(engine, table_name):
-            # We return False instead of raising because
-            # emptiness is often used for pipeline flow control
-            return False
-
-    # ------------------------------------------------
-    # Validation Passed
-    # ------------------------------------------------
-    return True
+    # Emptiness returns False instead of raising because
+    # it is often used for pipeline flow control
+    return validate_tables(
+        engine,
+        [table_name],
+        not_empty=not_empty,
+        required_columns={table_name: required_columns} if required_columns else None,
+    )[table_name]
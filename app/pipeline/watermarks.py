@@ -0,0 +1,127 @@
+# ==================================
+# Imports
+# ==================================
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+
+# ==================================
+# WATERMARK STORE
+# ==================================
+#
+# Watermarks live in meta.watermarks and are read/written
+# on the caller's connection, so advancing a watermark
+# commits atomically with the rows it covers.
+#
+
+def get_watermark(conn, name: str) -> datetime | None:
+    """
+    Returns the stored watermark for `name`,
+    or None if the step has never completed.
+    """
+
+    return conn.execute(
+        text("SELECT value FROM meta.watermarks WHERE name = :name"),
+        {"name": name},
+    ).scalar()
+
+
+def set_watermark(conn, name: str, value: datetime):
+    """
+    Upserts the watermark for `name`.
+
+    Must be called inside the same transaction
+    as the writes it acknowledges.
+    """
+
+    conn.execute(
+        text("""
+            INSERT INTO meta.watermarks (name, value, updated_at)
+            VALUES (:name, :value, now())
+            ON CONFLICT (name)
+            DO UPDATE SET
+                value = EXCLUDED.value,
+                updated_at = now()
+        """),
+        {"name": name, "value": value},
+    )
+
+
+def reset_watermarks(conn, prefix: str):
+    """
+    Deletes every watermark whose name starts with `prefix`
+    so the next run of those steps is a full scan.
+
+    Used when the target table is truncated.
+    """
+
+    conn.execute(
+        text("DELETE FROM meta.watermarks WHERE name LIKE :prefix"),
+        {"prefix": f"{prefix}%"},
+    )
+
+
+# ==================================
+# INGEST WINDOWS
+# ==================================
+#
+# Bronze ingested_at defaults to now(), the start time of the
+# writing transaction, not its commit time. A batch that starts
+# before another but commits after it lands below a watermark
+# already advanced past it, and would be skipped for good.
+#
+# Writers therefore take their table lock first (lock_for_ingest),
+# and readers cap their window just below the oldest in-flight
+# writer (safe_high_water).
+#
+
+def lock_for_ingest(raw_conn, table: str):
+    """
+    First statement of an ingest transaction on a DBAPI
+    connection: makes the writer visible in pg_locks from the
+    moment its ingested_at timestamp is fixed.
+    """
+
+    cur = raw_conn.cursor()
+    try:
+        cur.execute(f"LOCK TABLE {table} IN ROW EXCLUSIVE MODE")
+    finally:
+        cur.close()
+
+
+def safe_high_water(conn, table: str, column: str = "ingested_at") -> datetime | None:
+    """
+    Upper bound for an incremental `column` window on `table`
+    that no uncommitted write can still land at or below.
+
+    MAX(column) capped at the check time and just below the
+    start of the oldest transaction holding (or waiting for) a
+    write lock on `table`. Rows held back are read next run.
+    Needs READ COMMITTED: MAX() must see commits made after
+    the lock check.
+    """
+
+    in_flight, checked_at = conn.execute(
+        text("""
+            SELECT MIN(a.xact_start), clock_timestamp()
+            FROM pg_locks l
+            JOIN pg_stat_activity a
+                ON a.pid = l.pid
+            WHERE l.locktype = 'relation'
+              AND l.relation = CAST(:table AS REGCLASS)
+              AND l.mode = 'RowExclusiveLock'
+              AND l.pid <> pg_backend_pid()
+        """),
+        {"table": table},
+    ).one()
+
+    high = conn.execute(text(f"SELECT MAX({column}) FROM {table}")).scalar()
+
+    if high is None:
+        return None
+
+    bound = checked_at
+    if in_flight is not None:
+        bound = min(bound, in_flight - timedelta(microseconds=1))
+
+    return min(high, bound)
@@ -3,14 +3,24 @@
 # ==================================
 from pathlib import Path
 from datetime import date
+import contextvars
 import csv
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import pandas as pd
 from sqlalchemy import text
 
-from pipeline.validators import validate_table
-from components.db import get_engine
+from pipeline.validators import validate_table, invalidate
+from pipeline.watermarks import (
+    get_watermark,
+    lock_for_ingest,
+    reset_watermarks,
+    safe_high_water,
+    set_watermark,
+)
+from components.db import get_engine, copy_connection, copy_csv_stream, resolve_copy_format
+from components.bulk_load import bulk_load
+from components.tuning import apply_tuning
+from components.resilient_copy import copy_csv_resilient
 from components.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,11 +31,120 @@ logger = get_logger(__name__)
 # ==================================
 BASE_URL = "https://www.ncei.noaa.gov/pub/data/ghcn/daily/all"
 
+# First observation date downloaded when no start_date is given
+DEFAULT_START_DATE = date(2015, 1, 1)
+
 LANDING_DIR = Path("/data/landing/weather")
 ARCHIVE_DIR = Path("/data/archive/weather")
+REJECT_DIR = Path("/data/rejects/weather")
+
+# Wide-format landing (one row per station-day)
+LANDING_WIDE_DIR = Path("/data/landing/weather_wide")
+ARCHIVE_WIDE_DIR = Path("/data/archive/weather_wide")
+
+# Landing CSV column order (see download())
+BRONZE_COLUMNS = (
+    "station_id",
+    "obs_date",
+    "element",
+    "value",
+    "m_flag",
+    "q_flag",
+    "s_flag",
+)
+
+# Elements kept by the wide format, in column order
+WIDE_ELEMENTS = ("TMAX", "TMIN", "PRCP", "SNOW")
+
+# Wide landing CSV column order (see download(wide=True))
+WIDE_COLUMNS = (
+    "station_id",
+    "obs_date",
+    "tmax",
+    "tmin",
+    "prcp",
+    "snow",
+    "tmax_q_flag",
+    "tmin_q_flag",
+    "prcp_q_flag",
+    "snow_q_flag",
+)
+
+
+# ==================================
+# PARSE
+# ==================================
+def iter_dly_values(text_body: str, start_date: date, end_date: date):
+    """
+    Yields one tuple per daily value in a GHCN .dly file:
+        (station_id, obs_date, element, value, m_flag, q_flag, s_flag)
+
+    Missing values (-9999), invalid dates and dates outside
+    [start_date, end_date] are skipped.
+    """
+
+    for line in text_body.splitlines():
+        station = line[0:11].strip()
+        year = int(line[11:15])
+        month = int(line[15:17])
+        element = line[17:21]
+
+        for day in range(1, 32):
+            base = 21 + (day - 1) * 8
+            value = line[base:base+5].strip()
+
+            if value == "-9999":
+                continue
+
+            try:
+                obs_date = date(year, month, day)
+            except ValueError:
+                continue
+
+            if not (start_date <= obs_date <= end_date):
+                continue
+
+            yield (
+                station,
+                obs_date,
+                element,
+                int(value),
+                line[base+5].strip() or None,
+                line[base+6].strip() or None,
+                line[base+7].strip() or None,
+            )
+
 
-LANDING_DIR.mkdir(parents=True, exist_ok=True)
-ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+def parse_dly_wide(text_body: str, start_date: date, end_date: date) -> list[list]:
+    """
+    Parses a GHCN .dly file straight into wide rows:
+        station_id, obs_date, tmax, tmin, prcp, snow,
+        tmax_q_flag, tmin_q_flag, prcp_q_flag, snow_q_flag
+
+    One row per station-day, sorted by date. Elements other
+    than WIDE_ELEMENTS are dropped at parse time.
+    """
+
+    slots = {element: i for i, element in enumerate(WIDE_ELEMENTS)}
+    n = len(WIDE_ELEMENTS)
+    days = {}
+
+    for station, obs_date, element, value, _, q_flag, _ in iter_dly_values(
+        text_body, start_date, end_date
+    ):
+        slot = slots.get(element)
+        if slot is None:
+            continue
+
+        row = days.get(obs_date)
+        if row is None:
+            row = [station, obs_date.isoformat()] + [None] * (2 * n)
+            days[obs_date] = row
+
+        row[2 + slot] = value
+        row[2 + n + slot] = q_flag
+
+    return [days[d] for d in sorted(days)]
 
 
 # ==================================
@@ -36,6 +155,7 @@ def download(
     start_date: date | None = None,
     end_date: date | None = None,
     max_workers: int = 12,
+    wide: bool = False,
 ):
     """
     Download NOAA .dly files.
@@ -44,19 +164,26 @@ def download(
         states=None  → download ALL stations
         states=[]    → skip download
         states=[...] → filter by state list
+
+    wide=False writes one row per (station, date, element)
+    to LANDING_DIR for ingest()/transform().
+
+    wide=True writes one row per (station, date) with
+    TMAX/TMIN/PRCP/SNOW and their quality flags to
+    LANDING_WIDE_DIR for ingest_wide()/transform_wide().
     """
 
-    engine = get_engine()
+    engine = get_engine("transform")
 
     # -----------------------------
     # Fetch station_ids
     # -----------------------------
     if states is None:
         logger.info("Downloading weather for ALL stations")
-        station_ids = pd.read_sql(
-            text("SELECT station_id FROM silver.stations"),
-            engine,
-        )["station_id"].tolist()
+        with engine.connect() as conn:
+            station_ids = conn.execute(
+                text("SELECT station_id FROM silver.stations")
+            ).scalars().all()
 
     elif len(states) == 0:
         logger.info("Empty state list provided — skipping weather download")
@@ -73,23 +200,27 @@ def download(
         """)
         params = {f"s{i}": s for i, s in enumerate(states)}
 
-        station_ids = pd.read_sql(query, engine, params=params)["station_id"].tolist()
+        with engine.connect() as conn:
+            station_ids = conn.execute(query, params).scalars().all()
 
     if not station_ids:
         logger.warning("No station_ids found for weather download")
         return {"downloaded": 0}
 
     if start_date is None:
-        start_date = date(2015, 1, 1)
+        start_date = DEFAULT_START_DATE
     if end_date is None:
         end_date = date.today()
 
     downloaded = 0
 
+    landing_dir = LANDING_WIDE_DIR if wide else LANDING_DIR
+    landing_dir.mkdir(parents=True, exist_ok=True)
+
     def download_station(station_id: str):
         nonlocal downloaded
 
-        out_csv = LANDING_DIR / f"{station_id}.csv"
+        out_csv = landing_dir / f"{station_id}.csv"
         if out_csv.exists():
             return
 
@@ -100,51 +231,28 @@ def download(
         with open(out_csv, "w", newline="") as fout:
             writer = csv.writer(fout)
 
-            writer.writerow([
-                "station_id",
-                "obs_date",
-                "element",
-                "value",
-                "m_flag",
-                "q_flag",
-                "s_flag",
-            ])
-
-            for line in r.text.splitlines():
-                station = line[0:11].strip()
-                year = int(line[11:15])
-                month = int(line[15:17])
-                element = line[17:21]
-
-                for day in range(1, 32):
-                    base = 21 + (day - 1) * 8
-                    value = line[base:base+5].strip()
-
-                    if value == "-9999":
-                        continue
-
-                    try:
-                        obs_date = date(year, month, day)
-                    except ValueError:
-                        continue
-
-                    if not (start_date <= obs_date <= end_date):
-                        continue
-
-                    writer.writerow([
-                        station,
-                        obs_date.isoformat(),
-                        element,
-                        int(value),
-                        line[base+5].strip() or None,
-                        line[base+6].strip() or None,
-                        line[base+7].strip() or None,
-                    ])
+            if wide:
+                writer.writerow(WIDE_COLUMNS)
+                writer.writerows(
+                    parse_dly_wide(r.text, start_date, end_date)
+                )
+
+            else:
+                writer.writerow(BRONZE_COLUMNS)
+
+                for station, obs_date, *rest in iter_dly_values(
+                    r.text, start_date, end_date
+                ):
+                    writer.writerow([station, obs_date.isoformat(), *rest])
 
         downloaded += 1
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(download_station, sid) for sid in station_ids]
+        # Workers inherit the step's log context (run_id, step)
+        futures = [
+            executor.submit(contextvars.copy_context().run, download_station, sid)
+            for sid in station_ids
+        ]
         for f in as_completed(futures):
             f.result()
 
@@ -154,66 +262,144 @@ def download(
 
 
 # ==================================
-# INGEST → BRONZE
+# INGEST HELPERS
 # ==================================
-def ingest(files: list[Path] | None = None, max_workers: int = 4):
+def _copy_files(
+    engine,
+    files: list[Path],
+    table_name: str,
+    columns: tuple[str, ...],
+    archive_dir: Path,
+    max_workers: int = 4,
+    bulk: bool = False,
+    resilient: bool = False,
+    copy_format: str = "csv",
+) -> tuple[int, int]:
+    """
+    COPY landing CSVs into `table_name`, one file per transaction,
+    `max_workers` files at a time. Files move to `archive_dir`
+    after commit. Failed files are logged and left in landing.
 
-    engine = get_engine()
+    copy_format selects CSV or binary COPY (components.db);
+    resilient loads always use CSV.
 
-    validate_table(engine, "bronze.weather_daily", not_empty=False)
+    Returns:
+        (rows accepted, rows rejected)
+    """
 
-    if files is None:
-        files = list(LANDING_DIR.glob("*.csv"))
+    total_rows = 0
+    total_rejected = 0
 
-    if not files:
-        logger.info("No weather files found for ingest")
-        return {"rows_inserted": 0}
+    archive_dir.mkdir(parents=True, exist_ok=True)
 
-    total_rows = 0
+    copy_format = "csv" if resilient else resolve_copy_format(copy_format)
 
-    def worker(file: Path) -> int:
+    def worker(file: Path) -> tuple[int, int]:
         try:
-            raw_conn = engine.raw_connection()
-            try:
-                cur = raw_conn.cursor()
-                try:
-                    with open(file, "r") as f:
-                        cur.copy_expert("""
-                            COPY bronze.weather_daily (
-                                station_id,
-                                obs_date,
-                                element,
-                                value,
-                                m_flag,
-                                q_flag,
-                                s_flag
-                            )
-                            FROM STDIN
-                            WITH (FORMAT CSV, HEADER TRUE)
-                        """, f)
+            with copy_connection(engine, copy_format) as raw_conn:
+                # First: ingested_at is fixed at transaction start
+                lock_for_ingest(raw_conn, table_name)
+                apply_tuning(raw_conn, "bulk_load")
+
+                if resilient:
+                    with open(file, "r", newline="") as f:
+                        stats = copy_csv_resilient(
+                            raw_conn,
+                            table_name,
+                            columns,
+                            f,
+                            REJECT_DIR / f"{file.name}.rejects.csv",
+                        )
 
                     raw_conn.commit()
-                finally:
-                    cur.close()
-            finally:
-                raw_conn.close()
+                    row_count = stats["accepted"]
+                    rejected = stats["rejected"]
 
-            with open(file, "r") as f:
-                row_count = sum(1 for _ in f) - 1
+                else:
+                    with open(file, "r", newline="") as f:
+                        row_count = copy_csv_stream(
+                            raw_conn, table_name, columns, f, copy_format
+                        )
 
-            file.rename(ARCHIVE_DIR / file.name)
+                    raw_conn.commit()
+                    rejected = 0
+
+            file.rename(archive_dir / file.name)
 
-            return row_count
+            logger.info(
+                f"Loaded {file.name}: {row_count:,} rows",
+                extra={"rate_key": f"ingest.{table_name}", "rows": row_count},
+            )
+
+            return row_count, rejected
 
         except Exception as e:
             logger.error(f"Failed ingest for {file.name}: {e}")
-            return 0
+            return 0, 0
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(worker, f) for f in files]
-        for future in as_completed(futures):
-            total_rows += future.result()
+    with bulk_load(engine, [table_name], enabled=bulk):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Each worker inherits the step's metrics context
+            futures = [
+                executor.submit(contextvars.copy_context().run, worker, f)
+                for f in files
+            ]
+            for future in as_completed(futures):
+                accepted, rejected = future.result()
+                total_rows += accepted
+                total_rejected += rejected
+
+    return total_rows, total_rejected
+
+
+# ==================================
+# INGEST → BRONZE
+# ==================================
+def ingest(
+    files: list[Path] | None = None,
+    max_workers: int = 4,
+    bulk: bool = False,
+    resilient: bool = False,
+    copy_format: str = "csv",
+):
+    """
+    COPY landing weather CSVs into bronze.weather_daily.
+
+    bulk=True drops the bronze secondary indexes for the load
+    and rebuilds them afterwards (see components.bulk_load).
 
+    resilient=True loads each file in savepointed chunks and
+    diverts malformed rows to REJECT_DIR/<file>.rejects.csv
+    instead of failing the whole file.
+
+    copy_format="binary" loads typed rows with psycopg 3
+    binary COPY instead of CSV text (see components.db).
+    """
+
+    engine = get_engine("bulk")
+
+    validate_table(engine, "bronze.weather_daily", not_empty=False)
+
+    if files is None:
+        files = list(LANDING_DIR.glob("*.csv"))
+
+    if not files:
+        logger.info("No weather files found for ingest")
+        return {"rows_inserted": 0, "rows_rejected": 0}
+
+    total_rows, total_rejected = _copy_files(
+        engine,
+        files,
+        "bronze.weather_daily",
+        BRONZE_COLUMNS,
+        ARCHIVE_DIR,
+        max_workers=max_workers,
+        bulk=bulk,
+        resilient=resilient,
+        copy_format=copy_format,
+    )
+
+    invalidate("bronze.weather_daily")
     validate_table(
         engine,
         "bronze.weather_daily",
@@ -221,17 +407,34 @@ def ingest(files: list[Path] | None = None, max_workers: int = 4):
         required_columns=["station_id", "obs_date", "element", "value"],
     )
 
-    logger.info(f"Inserted {total_rows:,} rows into bronze.weather_daily")
+    logger.info(
+        f"Inserted {total_rows:,} rows into bronze.weather_daily "
+        f"({total_rejected:,} rejected)",
+        extra={"rows": total_rows},
+    )
 
-    return {"rows_inserted": total_rows}
+    return {"rows_inserted": total_rows, "rows_rejected": total_rejected}
 
 
 # ==================================
 # TRANSFORM → SILVER
 # ==================================
-def transform(truncate: bool = False) -> dict:
+def transform(truncate: bool = False, bulk: bool = False) -> dict:
+    """
+    Upsert bronze.weather_daily → silver.weather_daily.
+
+    Existing rows are only rewritten when the value changed,
+    and last_updated is bumped when they are. That column is
+    the change marker for the incremental pivot build.
+
+    GHCN stores TMAX / TMIN in tenths of °C and PRCP in tenths
+    of mm; they are converted to °C and mm here.
+
+    bulk=True drops the silver secondary indexes for the load
+    and rebuilds them afterwards.
+    """
 
-    engine = get_engine()
+    engine = get_engine("transform")
 
     validate_table(
         engine,
@@ -240,12 +443,19 @@ def transform(truncate: bool = False) -> dict:
         required_columns=["station_id", "obs_date", "element", "value"],
     )
 
-    with engine.begin() as conn:
+    with (
+        bulk_load(engine, ["silver.weather_daily"], enabled=bulk),
+        engine.begin() as conn,
+    ):
+        apply_tuning(conn, "heavy_transform")
 
         if truncate:
             logger.info("Truncating silver.weather_daily")
             conn.execute(text("TRUNCATE TABLE silver.weather_daily"))
 
+            # Deleted rows leave no change marker; force a full pivot rebuild
+            reset_watermarks(conn, "weather_daily_pivot")
+
         result = conn.execute(text("""
             INSERT INTO silver.weather_daily (
                 station_id,
@@ -257,14 +467,23 @@ def transform(truncate: bool = False) -> dict:
                 station_id,
                 obs_date::DATE,
                 element,
-                value::DOUBLE PRECISION
+                CASE
+                    WHEN element IN ('TMAX', 'TMIN', 'PRCP')
+                        THEN value::DOUBLE PRECISION / 10
+                    ELSE value::DOUBLE PRECISION
+                END
             FROM bronze.weather_daily
             ON CONFLICT (station_id, obs_date, element)
-            DO UPDATE SET value = EXCLUDED.value;
+            DO UPDATE SET
+                value = EXCLUDED.value,
+                last_updated = now()
+            WHERE silver.weather_daily.value
+                IS DISTINCT FROM EXCLUDED.value;
         """))
 
         rows_written = result.rowcount
 
+    invalidate("silver.weather_daily")
     validate_table(
         engine,
         "silver.weather_daily",
@@ -280,10 +499,180 @@ def transform(truncate: bool = False) -> dict:
     return {"rows_written": rows_written}
 
 
+# ==================================
+# WIDE FORMAT: INGEST → BRONZE
+# ==================================
+def ingest_wide(
+    files: list[Path] | None = None,
+    max_workers: int = 4,
+    bulk: bool = False,
+    resilient: bool = False,
+    copy_format: str = "csv",
+) -> dict:
+    """
+    COPY wide landing CSVs (download(wide=True)) into
+    bronze.weather_daily_wide. One row per station-day,
+    so roughly 4× fewer rows than the long format.
+    Options as for ingest().
+    """
+
+    engine = get_engine("bulk")
+
+    validate_table(engine, "bronze.weather_daily_wide", not_empty=False)
+
+    if files is None:
+        files = list(LANDING_WIDE_DIR.glob("*.csv"))
+
+    if not files:
+        logger.info("No wide weather files found for ingest")
+        return {"rows_inserted": 0, "rows_rejected": 0}
+
+    total_rows, total_rejected = _copy_files(
+        engine,
+        files,
+        "bronze.weather_daily_wide",
+        WIDE_COLUMNS,
+        ARCHIVE_WIDE_DIR,
+        max_workers=max_workers,
+        bulk=bulk,
+        resilient=resilient,
+        copy_format=copy_format,
+    )
+
+    invalidate("bronze.weather_daily_wide")
+    validate_table(
+        engine,
+        "bronze.weather_daily_wide",
+        not_empty=True,
+        required_columns=list(WIDE_COLUMNS),
+    )
+
+    logger.info(
+        f"Inserted {total_rows:,} rows into bronze.weather_daily_wide "
+        f"({total_rejected:,} rejected)",
+        extra={"rows": total_rows},
+    )
+
+    return {"rows_inserted": total_rows, "rows_rejected": total_rejected}
+
+
+# ==================================
+# WIDE FORMAT: TRANSFORM → SILVER PIVOT
+# ==================================
+def transform_wide(incremental: bool = True) -> dict:
+    """
+    Upsert bronze.weather_daily_wide → silver.weather_daily_pivot.
+
+    Rows are already one per station-day, so this is a
+    plain typed upsert with no long → wide GROUP BY.
+    Incremental mode only reads bronze batches newer than
+    the watermark (ingested_at), and only rows whose values
+    changed are rewritten (bumping updated_at).
+
+    Note: the long-format full pivot build deletes pivot rows
+    that have no silver.weather_daily source. Use one format
+    per deployment.
+    """
+
+    engine = get_engine("transform")
+
+    validate_table(
+        engine,
+        "bronze.weather_daily_wide",
+        not_empty=True,
+        required_columns=list(WIDE_COLUMNS) + ["ingested_at"],
+    )
+
+    watermark_name = "weather.transform_wide"
+    value_columns = ("tmax_c", "tmin_c", "prcp_mm", "snow_mm")
+    flag_columns = ("tmax_q_flag", "tmin_q_flag", "prcp_q_flag", "snow_q_flag")
+    target_columns = value_columns + flag_columns
+
+    with engine.begin() as conn:
+        apply_tuning(conn, "heavy_transform")
+
+        # Parallel ingest workers commit in any order: stay
+        # below the oldest one still writing
+        high_water = safe_high_water(conn, "bronze.weather_daily_wide")
+
+        low_water = get_watermark(conn, watermark_name) if incremental else None
+
+        if high_water is None or (low_water is not None and high_water <= low_water):
+            logger.info(
+                f"No new wide weather batches since {low_water}. "
+                f"Skipping transform."
+            )
+            return {"rows_written": 0}
+
+        filters = ["ingested_at <= :high_water"]
+        params = {"high_water": high_water}
+
+        if low_water is not None:
+            filters.append("ingested_at > :low_water")
+            params["low_water"] = low_water
+
+        # Latest batch wins when a station-day was ingested twice.
+        # tmax / tmin / prcp arrive in GHCN tenths (see transform)
+        result = conn.execute(text(f"""
+            INSERT INTO silver.weather_daily_pivot AS p (
+                station_id,
+                obs_date,
+                {", ".join(target_columns)}
+            )
+            SELECT DISTINCT ON (station_id, obs_date::DATE)
+                station_id,
+                obs_date::DATE,
+                tmax::DOUBLE PRECISION / 10,
+                tmin::DOUBLE PRECISION / 10,
+                prcp::DOUBLE PRECISION / 10,
+                snow::DOUBLE PRECISION,
+                {", ".join(flag_columns)}
+            FROM bronze.weather_daily_wide
+            WHERE {" AND ".join(filters)}
+            ORDER BY station_id, obs_date::DATE, ingested_at DESC
+            ON CONFLICT (station_id, obs_date)
+            DO UPDATE SET
+                {", ".join(f"{c} = EXCLUDED.{c}" for c in target_columns)},
+                updated_at = now()
+            WHERE ({", ".join(f"p.{c}" for c in target_columns)})
+                IS DISTINCT FROM
+                ({", ".join(f"EXCLUDED.{c}" for c in target_columns)})
+        """), params)
+
+        rows_written = result.rowcount
+
+        set_watermark(conn, watermark_name, high_water)
+
+    invalidate("silver.weather_daily_pivot")
+    validate_table(engine, "silver.weather_daily_pivot", not_empty=True)
+
+    logger.info(
+        f"Transformed {rows_written:,} rows "
+        f"bronze.weather_daily_wide → silver.weather_daily_pivot"
+    )
+
+    return {"rows_written": rows_written}
+
+
 # ==================================
 # RUN ALL
 # ==================================
-def run_all(states: list[str] | None = None):
+def run_all(states: list[str] | None = None, wide: bool = False):
+    """
+    Full weather lifecycle:
+        download → ingest → transform
+
+    wide=True parses .dly files straight into station-day rows
+    and loads them into silver.weather_daily_pivot, skipping
+    silver.weather_daily and the pivot build entirely.
+    """
+
+    if wide:
+        return {
+            "download": download(states, wide=True),
+            "ingest": ingest_wide(),
+            "transform": transform_wide(),
+        }
 
     download_result = download(states)
     ingest_result = ingest()
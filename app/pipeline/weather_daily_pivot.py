@@ -1,16 +1,13 @@
 # ==================================
 # Imports
 # ==================================
-from pipeline.stations import run_all as run_stations
-from pipeline.weather import run_all as run_weather
-from pipeline.accidents import run_all as run_accidents
+import time
+from sqlalchemy import text
 
-from pipeline.accident_station_map import build as run_station_map
-from pipeline.weather_daily_pivot import build as run_weather_pivot
-from pipeline.accident_weather import build as run_gold
-
-from pipeline.validators import validate_table
 from components.db import get_engine
+from components.tuning import apply_tuning
+from pipeline.validators import validate_table, invalidate
+from pipeline.watermarks import get_watermark, set_watermark
 from components.logger import get_logger
 
 
@@ -18,110 +15,197 @@ logger = get_logger(__name__)
 
 
 # ==================================
-# RUN FULL PIPELINE
+# Constants
 # ==================================
-def run_full(states: list[str]) -> dict:
-    """
-    Full DAG execution with validation.
+WATERMARK_NAME = "weather_daily_pivot"
+
+PIVOT_COLUMNS = ("tmax_c", "tmin_c", "prcp_mm", "snow_mm")
+
+# Long → wide aggregation over silver.weather_daily.
+# {source} is either the full table or a join to the touched pairs.
+PIVOT_SELECT = """
+    SELECT
+        w.station_id,
+        w.obs_date,
+        MAX(w.value) FILTER (WHERE w.element = 'TMAX') AS tmax_c,
+        MAX(w.value) FILTER (WHERE w.element = 'TMIN') AS tmin_c,
+        MAX(w.value) FILTER (WHERE w.element = 'PRCP') AS prcp_mm,
+        MAX(w.value) FILTER (WHERE w.element = 'SNOW') AS snow_mm
+    FROM {source}
+    GROUP BY w.station_id, w.obs_date
+"""
+
+# Upsert that only rewrites rows whose values changed,
+# so updated_at stays a reliable change marker.
+PIVOT_UPSERT = f"""
+    INSERT INTO silver.weather_daily_pivot AS p (
+        station_id,
+        obs_date,
+        {", ".join(PIVOT_COLUMNS)}
+    )
+    {{select}}
+    ON CONFLICT (station_id, obs_date)
+    DO UPDATE SET
+        {", ".join(f"{c} = EXCLUDED.{c}" for c in PIVOT_COLUMNS)},
+        updated_at = now()
+    WHERE ({", ".join(f"p.{c}" for c in PIVOT_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"EXCLUDED.{c}" for c in PIVOT_COLUMNS)})
+"""
 
-    Execution Order:
 
-    1. Stations
-    2. Weather
-    3. Accidents
-    4. Weather Pivot
-    5. Accident → Station Map
-    6. Gold Build
+# ==================================
+# BUILD WEATHER DAILY PIVOT
+# ==================================
+def build(concurrent: bool = False, incremental: bool = False) -> dict:
+    """
+    Build silver.weather_daily_pivot from silver.weather_daily.
+
+    Modes:
+        incremental=True
+            Re-aggregates only the (station_id, obs_date) pairs
+            whose silver.weather_daily rows changed since the last
+            build (last_updated > watermark). Falls back to a full
+            build when no watermark exists yet.
+
+        concurrent=True (full build)
+            Upserts every pair in place and deletes pairs that
+            no longer exist. Readers keep seeing the old rows
+            until commit.
+
+        default (full build)
+            TRUNCATE + INSERT in one transaction. Fastest full
+            rebuild, but blocks readers while it runs.
+
+    Returns:
+        dict with rows refreshed, mode and execution time.
     """
 
-    engine = get_engine()
-
-    logger.info("Starting FULL pipeline execution")
-
-    # ==========================================================
-    # INGESTION LAYER
-    # ==========================================================
-
-    # -----------------------------
-    # Stations
-    # -----------------------------
-    logger.info("Running Stations")
-    run_stations()
-
-    validate_table(
-        engine,
-        "silver.stations",
-        not_empty=True,
-        required_columns=["station_id", "latitude", "longitude", "geom"],
-    )
-
-    # -----------------------------
-    # Weather
-    # -----------------------------
-    logger.info("Running Weather")
-    run_weather(states)
+    engine = get_engine("transform")
 
+    # ----------------------------------
+    # Validate Dependencies
+    # ----------------------------------
     validate_table(
         engine,
         "silver.weather_daily",
         not_empty=True,
-        required_columns=["station_id", "obs_date", "element", "value"],
-    )
-
-    # -----------------------------
-    # Accidents
-    # -----------------------------
-    logger.info("Running Accidents")
-    run_accidents()
-
-    validate_table(
-        engine,
-        "silver.us_accidents",
-        not_empty=True,
-        required_columns=["accident_id", "start_time", "geom"],
-    )
-
-    # ==========================================================
-    # TRANSFORMATION LAYER
-    # ==========================================================
-
-    # -----------------------------
-    # Weather Pivot
-    # -----------------------------
-    logger.info("Refreshing Weather Pivot")
-    run_weather_pivot()
-
-    validate_table(
-        engine,
-        "silver.weather_daily_pivot",
-        not_empty=True,
-    )
-
-    # -----------------------------
-    # Accident → Station Map
-    # -----------------------------
-    logger.info("Building Accident → Station Map")
-    run_station_map()
-
-    validate_table(
-        engine,
-        "silver.accident_station_map",
-        not_empty=True,
+        required_columns=["station_id", "obs_date", "element", "value", "last_updated"],
     )
 
-    # ==========================================================
-    # GOLD LAYER
-    # ==========================================================
-
-    logger.info("Building Gold accident_weather")
-    run_gold()
-
-    validate_table(
-        engine,
-        "gold.accident_weather",
-        not_empty=True,
+    validate_table(engine, "silver.weather_daily_pivot", not_empty=False)
+
+    start_time = time.perf_counter()
+
+    with engine.begin() as conn:
+        apply_tuning(conn, "heavy_transform")
+
+        # ----------------------------------
+        # Watermark Window
+        # ----------------------------------
+        # Upper bound is fixed up front so rows changed
+        # mid-build are picked up by the next run.
+        high_water = conn.execute(
+            text("SELECT MAX(last_updated) FROM silver.weather_daily")
+        ).scalar()
+
+        low_water = get_watermark(conn, WATERMARK_NAME) if incremental else None
+
+        if incremental and low_water is None:
+            logger.info("No pivot watermark found. Running full build.")
+
+        # ----------------------------------
+        # Incremental
+        # ----------------------------------
+        if low_water is not None:
+            mode = "incremental"
+
+            if high_water is None or high_water <= low_water:
+                logger.info(
+                    f"No weather changes since {low_water}. Skipping pivot build."
+                )
+                rows_refreshed = 0
+
+            else:
+                logger.info(
+                    f"Incremental pivot build from watermark {low_water}"
+                )
+
+                touched = """
+                    silver.weather_daily w
+                    JOIN (
+                        SELECT DISTINCT station_id, obs_date
+                        FROM silver.weather_daily
+                        WHERE last_updated > :low_water
+                          AND last_updated <= :high_water
+                    ) t
+                        ON t.station_id = w.station_id
+                        AND t.obs_date = w.obs_date
+                """
+
+                result = conn.execute(
+                    text(PIVOT_UPSERT.format(
+                        select=PIVOT_SELECT.format(source=touched)
+                    )),
+                    {"low_water": low_water, "high_water": high_water},
+                )
+                rows_refreshed = result.rowcount
+
+        # ----------------------------------
+        # Full (concurrent-safe)
+        # ----------------------------------
+        elif concurrent:
+            mode = "concurrent"
+            logger.info("Full pivot build (in-place upsert)")
+
+            result = conn.execute(text(PIVOT_UPSERT.format(
+                select=PIVOT_SELECT.format(source="silver.weather_daily w")
+            )))
+            rows_refreshed = result.rowcount
+
+            deleted = conn.execute(text("""
+                DELETE FROM silver.weather_daily_pivot p
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM silver.weather_daily w
+                    WHERE w.station_id = p.station_id
+                      AND w.obs_date = p.obs_date
+                )
+            """)).rowcount
+            rows_refreshed += deleted
+
+        # ----------------------------------
+        # Full (truncate + insert)
+        # ----------------------------------
+        else:
+            mode = "full"
+            logger.info("Truncating silver.weather_daily_pivot")
+            conn.execute(text("TRUNCATE TABLE silver.weather_daily_pivot"))
+
+            result = conn.execute(text(f"""
+                INSERT INTO silver.weather_daily_pivot (
+                    station_id,
+                    obs_date,
+                    {", ".join(PIVOT_COLUMNS)}
+                )
+                {PIVOT_SELECT.format(source="silver.weather_daily w")}
+            """))
+            rows_refreshed = result.rowcount
+
+        # Advance watermark atomically with the pivot rows
+        if high_water is not None:
+            set_watermark(conn, WATERMARK_NAME, high_water)
+
+    invalidate("silver.weather_daily_pivot")
+
+    elapsed = time.perf_counter() - start_time
+
+    logger.info(
+        f"Weather daily pivot built ({mode}): {rows_refreshed:,} rows "
+        f"refreshed in {elapsed:.2f} seconds"
     )
 
-    logger.info("FULL pipeline execution completed successfully")
-
-    return {"status": "success"}
+    return {
+        "rows_refreshed": rows_refreshed,
+        "mode": mode,
+        "seconds": round(elapsed, 2),
+    }
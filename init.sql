@@ -1,65 +1,20 @@
 -- ============================================================
--- EXTENSIONS
+-- GENERATED from sql/*.sql by `python -m pipeline migrate --write-init`.
+-- Do not edit by hand: change the files in sql/ instead.
 -- ============================================================
 
+-- >>> 01_extensions.sql
+
 CREATE EXTENSION IF NOT EXISTS postgis;
 
--- ============================================================
--- SCHEMAS
--- ============================================================
+-- >>> 02_schemas.sql
 
 CREATE SCHEMA IF NOT EXISTS bronze;
 CREATE SCHEMA IF NOT EXISTS silver;
 CREATE SCHEMA IF NOT EXISTS gold;
+CREATE SCHEMA IF NOT EXISTS meta;
 
--- ============================================================
--- BRONZE: STATIONS (RAW)
--- ============================================================
-
-CREATE UNLOGGED TABLE IF NOT EXISTS bronze.stations (
-    station_id   TEXT NOT NULL,
-    latitude     TEXT,
-    longitude    TEXT,
-    elevation    TEXT,
-    state        TEXT,
-    name         TEXT,
-    gsn          TEXT,
-    hcn          TEXT,
-    wmo          TEXT,
-    ingested_at  TIMESTAMPTZ DEFAULT now()
-);
-
-CREATE INDEX IF NOT EXISTS idx_bronze_stations_station_id
-    ON bronze.stations (station_id);
-
--- ============================================================
--- SILVER: STATIONS (CLEAN + GEOSPATIAL)
--- ============================================================
-
-CREATE TABLE IF NOT EXISTS silver.stations (
-    station_id       TEXT PRIMARY KEY,
-    country_code     CHAR(2) NOT NULL,
-    state            CHAR(2),
-    name             TEXT,
-    latitude         DOUBLE PRECISION NOT NULL,
-    longitude        DOUBLE PRECISION NOT NULL,
-    elevation_m      DOUBLE PRECISION,
-    is_gsn           BOOLEAN,
-    is_hcn           BOOLEAN,
-    geom             GEOGRAPHY(Point, 4326),
-    created_at       TIMESTAMPTZ DEFAULT now(),
-    last_updated_at  TIMESTAMPTZ DEFAULT now()
-);
-
-CREATE INDEX IF NOT EXISTS idx_silver_stations_lat_lon
-    ON silver.stations (latitude, longitude);
-
-CREATE INDEX IF NOT EXISTS idx_silver_stations_geom
-    ON silver.stations USING GIST (geom);
-
--- ============================================================
--- BRONZE: WEATHER DAILY (RAW)
--- ============================================================
+-- >>> 10_weather_daily.sql
 
 CREATE UNLOGGED TABLE IF NOT EXISTS bronze.weather_daily (
     station_id   TEXT NOT NULL,
@@ -81,32 +36,25 @@ CREATE INDEX IF NOT EXISTS idx_bronze_weather_date
 CREATE INDEX IF NOT EXISTS idx_bronze_weather_element
     ON bronze.weather_daily (element);
 
--- ============================================================
--- SILVER: WEATHER DAILY (CLEAN)
--- ============================================================
+-- >>> 11_bronze_stations.sql
 
-CREATE TABLE IF NOT EXISTS silver.weather_daily (
-    station_id    TEXT NOT NULL,
-    obs_date      DATE NOT NULL,
-    element       TEXT NOT NULL,
-    value         DOUBLE PRECISION,
-    created_at    TIMESTAMPTZ DEFAULT now(),
-    last_updated  TIMESTAMPTZ DEFAULT now(),
-    PRIMARY KEY (station_id, obs_date, element)
+CREATE UNLOGGED TABLE IF NOT EXISTS bronze.stations (
+    station_id   TEXT NOT NULL,
+    latitude     TEXT,
+    longitude    TEXT,
+    elevation    TEXT,
+    state        TEXT,
+    name         TEXT,
+    gsn          TEXT,
+    hcn          TEXT,
+    wmo          TEXT,
+    ingested_at  TIMESTAMPTZ DEFAULT now()
 );
 
-CREATE INDEX IF NOT EXISTS idx_silver_weather_station_date
-    ON silver.weather_daily (station_id, obs_date);
-
-CREATE INDEX IF NOT EXISTS idx_silver_weather_element
-    ON silver.weather_daily (element);
-
-CREATE INDEX IF NOT EXISTS idx_silver_weather_date_only
-    ON silver.weather_daily (obs_date);
+CREATE INDEX IF NOT EXISTS idx_bronze_stations_station_id
+    ON bronze.stations (station_id);
 
--- ============================================================
--- BRONZE: ACCIDENTS (RAW)
--- ============================================================
+-- >>> 12_bronze_us_accidents.sql
 
 CREATE UNLOGGED TABLE IF NOT EXISTS bronze.us_accidents (
     id                      TEXT PRIMARY KEY,
@@ -154,13 +102,52 @@ CREATE UNLOGGED TABLE IF NOT EXISTS bronze.us_accidents (
     sunrise_sunset          TEXT,
     civil_twilight          TEXT,
     nautical_twilight       TEXT,
-    astronomical_twilight   TEXT
+    astronomical_twilight   TEXT,
+    ingested_at             TIMESTAMPTZ DEFAULT now()
 );
 
+-- ------------------------------------------------------------
+-- Batch tagging for incremental transforms
+-- (every row of one COPY shares the same ingested_at)
+-- ------------------------------------------------------------
+ALTER TABLE bronze.us_accidents
+    ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_bronze_accidents_ingested_at
+    ON bronze.us_accidents (ingested_at);
+
+-- >>> 13_bronze_weather_daily_wide.sql
+
 -- ============================================================
--- SILVER: ACCIDENTS (CLEAN + GEOSPATIAL)
+-- TABLE: bronze.weather_daily_wide
+-- Purpose:
+--   Raw wide-format NOAA daily weather, parsed straight from
+--   .dly month lines: one row per (station, date) with
+--   TMAX/TMIN/PRCP/SNOW and their quality flags.
+--
+-- Feeds:
+--   silver.weather_daily_pivot (pipeline.weather.transform_wide)
 -- ============================================================
 
+CREATE UNLOGGED TABLE IF NOT EXISTS bronze.weather_daily_wide (
+    station_id   TEXT NOT NULL,
+    obs_date     TEXT NOT NULL,
+    tmax         INTEGER,
+    tmin         INTEGER,
+    prcp         INTEGER,
+    snow         INTEGER,
+    tmax_q_flag  TEXT,
+    tmin_q_flag  TEXT,
+    prcp_q_flag  TEXT,
+    snow_q_flag  TEXT,
+    ingested_at  TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_bronze_weather_wide_ingested_at
+    ON bronze.weather_daily_wide (ingested_at);
+
+-- >>> 20_us_accidents.sql
+
 CREATE TABLE IF NOT EXISTS silver.us_accidents (
     accident_id            TEXT PRIMARY KEY,
     severity               SMALLINT NOT NULL,
@@ -169,13 +156,11 @@ CREATE TABLE IF NOT EXISTS silver.us_accidents (
     duration_minutes       INTEGER, 
     latitude               DOUBLE PRECISION NOT NULL,
     longitude              DOUBLE PRECISION NOT NULL,
-    
     city                   TEXT,
     county                 TEXT,
     state                  CHAR(2) NOT NULL,
     zipcode                TEXT,
     weather_time           TIMESTAMPTZ,
-
     temperature_f          DOUBLE PRECISION,
     wind_chill_f           DOUBLE PRECISION,
     humidity_pct           DOUBLE PRECISION,
@@ -184,7 +169,6 @@ CREATE TABLE IF NOT EXISTS silver.us_accidents (
     wind_speed_mph         DOUBLE PRECISION,
     precipitation_in       DOUBLE PRECISION,
     weather_condition      TEXT,
-
     is_amenity             BOOLEAN,
     is_bump                BOOLEAN,
     is_crossing            BOOLEAN,
@@ -199,56 +183,232 @@ CREATE TABLE IF NOT EXISTS silver.us_accidents (
     is_traffic_signal      BOOLEAN,
     is_turning_loop        BOOLEAN,
     darkness_level         SMALLINT,
-
-    geom                   GEOGRAPHY(Point, 4326)
+    geom                   GEOGRAPHY(Point, 4326),
+    updated_at             TIMESTAMPTZ DEFAULT now()
 );
 
+-- Change marker for incremental gold maintenance
+ALTER TABLE silver.us_accidents
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_silver_accidents_updated_at
+    ON silver.us_accidents (updated_at);
+
 CREATE INDEX IF NOT EXISTS idx_silver_accidents_geom
     ON silver.us_accidents USING GIST (geom);
 
 CREATE INDEX IF NOT EXISTS idx_silver_accidents_state_time
     ON silver.us_accidents (state, start_time);
 
--- ============================================================
--- SILVER: ACCIDENT → STATION MAP
--- ============================================================
+-- Date-range scans for partition-scoped gold builds
+CREATE INDEX IF NOT EXISTS idx_silver_accidents_start_time
+    ON silver.us_accidents (start_time);
+
+-- >>> 21_silver_stations.sql
+
+CREATE TABLE IF NOT EXISTS silver.stations (
+    station_id       TEXT PRIMARY KEY,
+    country_code     CHAR(2) NOT NULL,
+    state            CHAR(2),
+    name             TEXT,
+    latitude         DOUBLE PRECISION NOT NULL,
+    longitude        DOUBLE PRECISION NOT NULL,
+    elevation_m      DOUBLE PRECISION,
+    is_gsn           BOOLEAN,
+    is_hcn           BOOLEAN,
+    geom             GEOGRAPHY(Point, 4326),
+    created_at       TIMESTAMPTZ DEFAULT now(),
+    last_updated_at  TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_silver_stations_lat_lon
+    ON silver.stations (latitude, longitude);
+
+CREATE INDEX IF NOT EXISTS idx_silver_stations_geom
+    ON silver.stations USING GIST (geom);
+
+-- >>> 22_silver_weather_daily.sql
+
+CREATE TABLE IF NOT EXISTS silver.weather_daily (
+    station_id    TEXT NOT NULL,
+    obs_date      DATE NOT NULL,
+    element       TEXT NOT NULL,
+    value         DOUBLE PRECISION,
+    created_at    TIMESTAMPTZ DEFAULT now(),
+    last_updated  TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (station_id, obs_date, element)
+);
+
+CREATE INDEX IF NOT EXISTS idx_silver_weather_station_date
+    ON silver.weather_daily (station_id, obs_date);
+
+CREATE INDEX IF NOT EXISTS idx_silver_weather_element
+    ON silver.weather_daily (element);
+
+CREATE INDEX IF NOT EXISTS idx_silver_weather_date_only
+    ON silver.weather_daily (obs_date);
+
+-- Change marker for incremental pivot maintenance
+CREATE INDEX IF NOT EXISTS idx_silver_weather_last_updated
+    ON silver.weather_daily (last_updated);
+
+-- >>> 23_silver_accident_station_map.sql
 
 CREATE UNLOGGED TABLE IF NOT EXISTS silver.accident_station_map (
     accident_id TEXT PRIMARY KEY,
     station_id  TEXT NOT NULL,
-    distance_km DOUBLE PRECISION
+    distance_km DOUBLE PRECISION,
+    updated_at  TIMESTAMPTZ DEFAULT now()
 );
 
+-- Change marker for incremental gold maintenance
+ALTER TABLE silver.accident_station_map
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_accident_station_updated_at
+    ON silver.accident_station_map (updated_at);
+
 CREATE INDEX IF NOT EXISTS idx_accident_station_station
     ON silver.accident_station_map (station_id);
 
+-- >>> 24_silver_weather_daily_pivot.sql
+
 -- ============================================================
--- GOLD: WEATHER + ACCIDENT
+-- TABLE: silver.weather_daily_pivot
+-- Purpose:
+--   Pre-aggregated daily weather metrics per station.
+--   Converts row-based elements (TMAX, TMIN, PRCP, SNOW)
+--   into a wide analytical format.
+--
+-- Depends On:
+--   silver.weather_daily        (long format)
+--   bronze.weather_daily_wide   (wide format)
+--
+-- Maintained By:
+--   pipeline.weather_daily_pivot.build
+--   → full rebuild, or incremental upsert of only the
+--     (station_id, obs_date) pairs whose silver.weather_daily
+--     rows changed since the last build (last_updated watermark)
+--   pipeline.weather.transform_wide
+--   → direct upsert of wide rows, no long → wide GROUP BY
+--
+-- updated_at only moves when a pivot value actually changes,
+-- so downstream steps can use it as a change marker.
 -- ============================================================
 
+
+-- ------------------------------------------------------------
+-- Drop legacy materialized view (if exists)
+-- ------------------------------------------------------------
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_matviews
+        WHERE schemaname = 'silver'
+          AND matviewname = 'weather_daily_pivot'
+    ) THEN
+        DROP MATERIALIZED VIEW silver.weather_daily_pivot;
+    END IF;
+END $$;
+
+
+-- ------------------------------------------------------------
+-- Create Table
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS silver.weather_daily_pivot (
+    station_id   TEXT NOT NULL,
+    obs_date     DATE NOT NULL,
+
+    -- Temperature (°C)
+    tmax_c       DOUBLE PRECISION,
+    tmin_c       DOUBLE PRECISION,
+
+    -- Precipitation (mm)
+    prcp_mm      DOUBLE PRECISION,
+
+    -- Snow (mm)
+    snow_mm      DOUBLE PRECISION,
+
+    -- GHCN quality flags (wide-format loads only)
+    tmax_q_flag  TEXT,
+    tmin_q_flag  TEXT,
+    prcp_q_flag  TEXT,
+    snow_q_flag  TEXT,
+
+    updated_at   TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (station_id, obs_date)
+);
+
+ALTER TABLE silver.weather_daily_pivot
+    ADD COLUMN IF NOT EXISTS tmax_q_flag TEXT,
+    ADD COLUMN IF NOT EXISTS tmin_q_flag TEXT,
+    ADD COLUMN IF NOT EXISTS prcp_q_flag TEXT,
+    ADD COLUMN IF NOT EXISTS snow_q_flag TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_weather_pivot_updated_at
+    ON silver.weather_daily_pivot (updated_at);
+
+-- >>> 30_gold_accident_weather.sql
+
+-- ============================================================
+-- TABLE: gold.accident_weather
+-- Purpose:
+--   Final fact table joining accidents + weather.
+--
+-- Partitioning:
+--   RANGE on obs_date, one partition per year
+--   (gold.accident_weather_y<YYYY>), created on demand by
+--   pipeline.accident_weather. Full and backfill builds load
+--   standalone staging tables and DETACH/ATTACH-swap them in,
+--   so readers are never blocked for the length of a build.
+-- ============================================================
+
+
+-- ------------------------------------------------------------
+-- Drop legacy unpartitioned table (if exists)
+-- Gold is fully rebuildable from silver.
+-- ------------------------------------------------------------
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'gold'
+          AND c.relname = 'accident_weather'
+          AND c.relkind = 'r'
+    ) THEN
+        DROP TABLE gold.accident_weather;
+    END IF;
+END $$;
+
+
+-- ------------------------------------------------------------
+-- Create Partitioned Table
+-- ------------------------------------------------------------
 CREATE TABLE IF NOT EXISTS gold.accident_weather (
-    accident_id        TEXT PRIMARY KEY,
+    accident_id        TEXT NOT NULL,
     station_id         TEXT NOT NULL,
     distance_km        DOUBLE PRECISION,
     obs_date           DATE NOT NULL,
-
-    -- Accident
     severity           SMALLINT,
     start_time         TIMESTAMPTZ,
     latitude           DOUBLE PRECISION,
     longitude          DOUBLE PRECISION,
-    geom               GEOMETRY(Point, 4326) NOT NULL, -- added to help improve mapping
+    geom               GEOMETRY(Point, 4326) NOT NULL,
     state              CHAR(2),
     darkness_level     SMALLINT,
-
-    -- Weather (Metric Explicit)
     tmax_c             DOUBLE PRECISION,
     tmin_c             DOUBLE PRECISION,
     prcp_mm            DOUBLE PRECISION,
     snow_mm            DOUBLE PRECISION,
+    created_at         TIMESTAMPTZ DEFAULT now(),
+    updated_at         TIMESTAMPTZ DEFAULT now(),
 
-    created_at         TIMESTAMPTZ DEFAULT now()
-);
+    -- Partition key must be part of the primary key
+    PRIMARY KEY (accident_id, obs_date)
+) PARTITION BY RANGE (obs_date);
 
 CREATE INDEX IF NOT EXISTS idx_gold_obs_date
     ON gold.accident_weather (obs_date);
@@ -256,26 +416,364 @@ CREATE INDEX IF NOT EXISTS idx_gold_obs_date
 CREATE INDEX IF NOT EXISTS idx_gold_state_date
     ON gold.accident_weather (state, obs_date);
 
-CREATE INDEX IF NOT EXISTS idx_gold_station
-    ON gold.accident_weather (station_id);
+CREATE INDEX IF NOT EXISTS idx_gold_station_date
+    ON gold.accident_weather (station_id, obs_date);
 
 CREATE INDEX IF NOT EXISTS idx_gold_darkness
     ON gold.accident_weather (darkness_level);
 
+-- >>> 31_gold_accident_rollups.sql
+
+-- ============================================================
+-- TABLES: gold.rollup_*
+-- Purpose:
+--   Pre-aggregated rollups of gold.accident_weather for
+--   dashboards. Maintained by pipeline.rollups, which
+--   recomputes only the (state, month) slices whose gold
+--   rows changed since the last build.
+--
+--   Grains (coarsest → finest):
+--     rollup_state_month           state × month
+--     rollup_state_month_severity  + severity × darkness_level
+--     rollup_accident_weather      + prcp / snow / temperature bands
+--
+--   Measures are additive (counts and sums), so any
+--   rollup can be re-aggregated to a coarser grain and
+--   averages are derived as SUM(x_sum) / SUM(x_count).
+-- ============================================================
+
+
+-- ------------------------------------------------------------
+-- Finest grain: state × month × severity × darkness × weather
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS gold.rollup_accident_weather (
+    state              CHAR(2),
+    month              DATE NOT NULL,
+    severity           SMALLINT,
+    darkness_level     SMALLINT,
+    prcp_band          TEXT NOT NULL,
+    snow_band          TEXT NOT NULL,
+    temp_band          TEXT NOT NULL,
+
+    accident_count     BIGINT NOT NULL,
+    distance_km_sum    DOUBLE PRECISION,
+    tmax_sum           DOUBLE PRECISION,
+    tmax_count         BIGINT NOT NULL,
+    tmin_sum           DOUBLE PRECISION,
+    tmin_count         BIGINT NOT NULL,
+    prcp_sum           DOUBLE PRECISION,
+    prcp_count         BIGINT NOT NULL,
+    snow_sum           DOUBLE PRECISION,
+    snow_count         BIGINT NOT NULL,
+
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    UNIQUE NULLS NOT DISTINCT (
+        state, month, severity, darkness_level,
+        prcp_band, snow_band, temp_band
+    )
+);
+
+
+-- ------------------------------------------------------------
+-- state × month × severity × darkness
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS gold.rollup_state_month_severity (
+    state              CHAR(2),
+    month              DATE NOT NULL,
+    severity           SMALLINT,
+    darkness_level     SMALLINT,
+
+    accident_count     BIGINT NOT NULL,
+    distance_km_sum    DOUBLE PRECISION,
+    tmax_sum           DOUBLE PRECISION,
+    tmax_count         BIGINT NOT NULL,
+    tmin_sum           DOUBLE PRECISION,
+    tmin_count         BIGINT NOT NULL,
+    prcp_sum           DOUBLE PRECISION,
+    prcp_count         BIGINT NOT NULL,
+    snow_sum           DOUBLE PRECISION,
+    snow_count         BIGINT NOT NULL,
+
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    UNIQUE NULLS NOT DISTINCT (state, month, severity, darkness_level)
+);
+
+
+-- ------------------------------------------------------------
+-- state × month
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS gold.rollup_state_month (
+    state              CHAR(2),
+    month              DATE NOT NULL,
+
+    accident_count     BIGINT NOT NULL,
+    distance_km_sum    DOUBLE PRECISION,
+    tmax_sum           DOUBLE PRECISION,
+    tmax_count         BIGINT NOT NULL,
+    tmin_sum           DOUBLE PRECISION,
+    tmin_count         BIGINT NOT NULL,
+    prcp_sum           DOUBLE PRECISION,
+    prcp_count         BIGINT NOT NULL,
+    snow_sum           DOUBLE PRECISION,
+    snow_count         BIGINT NOT NULL,
+
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    UNIQUE NULLS NOT DISTINCT (state, month)
+);
+
+
+-- ------------------------------------------------------------
+-- Indexes
+-- ------------------------------------------------------------
+-- Leading month serves date-range dashboards;
+-- the unique constraints already lead with state.
+CREATE INDEX IF NOT EXISTS idx_rollup_weather_month
+    ON gold.rollup_accident_weather (month);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_severity_month
+    ON gold.rollup_state_month_severity (month);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_state_month_month
+    ON gold.rollup_state_month (month);
+
+-- >>> 32_gold_rollup_retired_slices.sql
+
 -- ============================================================
--- SILVER: WEATHER DAILY PIVOT (PRE-AGGREGATED)
+-- TABLE: gold.rollup_retired_slices
+-- Purpose:
+--   (state, month) slices that lost gold rows: an accident
+--   whose day or state changed leaves its old slice without
+--   any updated_at marker. Written by the incremental gold
+--   build, consumed (and emptied) by pipeline.rollups.
 -- ============================================================
 
-CREATE MATERIALIZED VIEW IF NOT EXISTS silver.weather_daily_pivot AS
-SELECT
-    station_id,
-    obs_date,
-    MAX(value) FILTER (WHERE element = 'TMAX') AS tmax_c,
-    MAX(value) FILTER (WHERE element = 'TMIN') AS tmin_c,
-    MAX(value) FILTER (WHERE element = 'PRCP') AS prcp_mm,
-    MAX(value) FILTER (WHERE element = 'SNOW') AS snow_mm
-FROM silver.weather_daily
-GROUP BY station_id, obs_date;
-
-CREATE INDEX IF NOT EXISTS idx_weather_pivot_station_date
-ON silver.weather_daily_pivot (station_id, obs_date);
\ No newline at end of file
+CREATE TABLE IF NOT EXISTS gold.rollup_retired_slices (
+    state       CHAR(2),
+    month       DATE NOT NULL,
+    retired_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_retired_slices_retired_at
+    ON gold.rollup_retired_slices (retired_at);
+
+-- >>> 40_meta_watermarks.sql
+
+-- ============================================================
+-- TABLE: meta.watermarks
+-- Purpose:
+--   High-water marks for incremental transforms.
+--   Each row records the latest source timestamp a step
+--   has fully processed, so the next run only reads
+--   rows newer than it.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.watermarks (
+    name        TEXT PRIMARY KEY,
+    value       TIMESTAMPTZ NOT NULL,
+    updated_at  TIMESTAMPTZ DEFAULT now()
+);
+
+-- >>> 41_meta_pending_indexes.sql
+
+-- ============================================================
+-- TABLE: meta.pending_indexes
+-- Purpose:
+--   Index definitions dropped by a bulk load and not yet
+--   rebuilt. Rows are removed as each index is recreated,
+--   so anything left here after a crash is restored by the
+--   next bulk load on the same table.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.pending_indexes (
+    index_name  TEXT PRIMARY KEY,
+    table_name  TEXT NOT NULL,
+    indexdef    TEXT NOT NULL,
+    dropped_at  TIMESTAMPTZ DEFAULT now()
+);
+
+-- >>> 42_meta_table_changes.sql
+
+-- ============================================================
+-- TABLE: meta.table_changes
+-- Purpose:
+--   Per-table change counters. A statement-level trigger
+--   logs one row per (table, writing transaction) whenever
+--   a statement writes to a bronze/silver/gold table
+--   (including TRUNCATE), in the writer's own transaction.
+--
+--   A table's version is MAX(id) of its rows. Pipeline
+--   steps fingerprint their upstream tables by it, so an
+--   unchanged table costs one index lookup instead of a scan.
+--
+--   Rows are appended, never updated, so concurrent writers
+--   to the same table (parallel COPY) never wait on each
+--   other. Older rows are pruned by the pipeline.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.table_changes (
+    id          BIGSERIAL PRIMARY KEY,
+    table_name  TEXT NOT NULL,
+    txid        BIGINT NOT NULL,
+    changed_at  TIMESTAMPTZ DEFAULT now(),
+    UNIQUE (table_name, txid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_table_changes_table_id
+    ON meta.table_changes (table_name, id);
+
+
+-- ------------------------------------------------------------
+-- Bump function (also called directly for DDL-only changes,
+-- e.g. partition swaps, which fire no DML triggers)
+-- ------------------------------------------------------------
+CREATE OR REPLACE FUNCTION meta.bump_table_version(name TEXT)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO meta.table_changes (table_name, txid)
+    VALUES (name, txid_current())
+    ON CONFLICT (table_name, txid) DO NOTHING;
+$$;
+
+CREATE OR REPLACE FUNCTION meta.bump_table_version_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM meta.bump_table_version(TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$;
+
+
+-- ------------------------------------------------------------
+-- Attach to every pipeline table that exists
+-- ------------------------------------------------------------
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'bronze.stations',
+        'bronze.weather_daily',
+        'bronze.weather_daily_wide',
+        'bronze.us_accidents',
+        'silver.stations',
+        'silver.weather_daily',
+        'silver.weather_daily_pivot',
+        'silver.us_accidents',
+        'silver.accident_station_map',
+        'gold.accident_weather',
+        'gold.rollup_accident_weather',
+        'gold.rollup_state_month_severity',
+        'gold.rollup_state_month'
+    ]
+    LOOP
+        IF to_regclass(t) IS NOT NULL THEN
+            EXECUTE format(
+                'CREATE OR REPLACE TRIGGER trg_table_version '
+                'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %s '
+                'FOR EACH STATEMENT '
+                'EXECUTE FUNCTION meta.bump_table_version_trigger()',
+                t
+            );
+        END IF;
+    END LOOP;
+END $$;
+
+-- >>> 43_meta_step_fingerprints.sql
+
+-- ============================================================
+-- TABLE: meta.step_fingerprints
+-- Purpose:
+--   Fingerprint of the inputs of each pipeline step's last
+--   successful run (upstream table versions, landing files,
+--   parameters). A step whose current fingerprint matches
+--   is skipped unless forced.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.step_fingerprints (
+    step         TEXT PRIMARY KEY,
+    fingerprint  TEXT NOT NULL,
+    inputs       JSONB NOT NULL,
+    updated_at   TIMESTAMPTZ DEFAULT now()
+);
+
+-- >>> 44_meta_pipeline_runs.sql
+
+-- ============================================================
+-- TABLES: meta.pipeline_runs / meta.step_runs
+-- Purpose:
+--   Persistent run history. One pipeline_runs row per
+--   orchestrator run, one step_runs row per step invocation
+--   (including skipped steps), with timings and resource
+--   metrics for trend and regression tracking.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.pipeline_runs (
+    run_id                 BIGSERIAL PRIMARY KEY,
+    started_at             TIMESTAMPTZ NOT NULL DEFAULT now(),
+    ended_at               TIMESTAMPTZ,
+    status                 TEXT NOT NULL DEFAULT 'running',
+    seconds                DOUBLE PRECISION,
+    critical_path          JSONB,
+    critical_path_seconds  DOUBLE PRECISION,
+    params                 JSONB,
+    resumes                INTEGER NOT NULL DEFAULT 0,
+    error                  TEXT
+);
+
+ALTER TABLE meta.pipeline_runs
+    ADD COLUMN IF NOT EXISTS resumes INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS meta.step_runs (
+    id            BIGSERIAL PRIMARY KEY,
+    run_id        BIGINT REFERENCES meta.pipeline_runs (run_id) ON DELETE CASCADE,
+    step          TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    started_at    TIMESTAMPTZ NOT NULL,
+    ended_at      TIMESTAMPTZ NOT NULL,
+    seconds       DOUBLE PRECISION NOT NULL,
+    rows_in       BIGINT,
+    rows_out      BIGINT,
+    bytes_read    BIGINT,
+    peak_rss_mb   DOUBLE PRECISION,
+    db_seconds    DOUBLE PRECISION,
+    tuning        JSONB,
+    params        JSONB,
+    fingerprint   TEXT,
+    result        JSONB,
+    error         TEXT
+);
+
+ALTER TABLE meta.step_runs
+    ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+
+ALTER TABLE meta.step_runs
+    ADD COLUMN IF NOT EXISTS tuning JSONB;
+
+CREATE INDEX IF NOT EXISTS idx_step_runs_step_started
+    ON meta.step_runs (step, started_at);
+
+CREATE INDEX IF NOT EXISTS idx_step_runs_run_id
+    ON meta.step_runs (run_id);
+
+-- >>> 45_meta_data_fixes.sql
+
+-- ============================================================
+-- TABLE: meta.data_fixes
+-- Purpose:
+--   Ledger of one-shot data fixes (pipeline.data_fixes).
+--   Unlike the schema files in this directory, a data fix
+--   is not idempotent; each one runs once per database and
+--   is recorded here.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.data_fixes (
+    name        TEXT PRIMARY KEY,
+    applied_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    rows        BIGINT
+);
@@ -44,5 +44,16 @@ CREATE UNLOGGED TABLE IF NOT EXISTS bronze.us_accidents (
     sunrise_sunset          TEXT,
     civil_twilight          TEXT,
     nautical_twilight       TEXT,
-    astronomical_twilight   TEXT
+    astronomical_twilight   TEXT,
+    ingested_at             TIMESTAMPTZ DEFAULT now()
 );
+
+-- ------------------------------------------------------------
+-- Batch tagging for incremental transforms
+-- (every row of one COPY shares the same ingested_at)
+-- ------------------------------------------------------------
+ALTER TABLE bronze.us_accidents
+    ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_bronze_accidents_ingested_at
+    ON bronze.us_accidents (ingested_at);
@@ -0,0 +1,27 @@
+-- ============================================================
+-- TABLE: bronze.weather_daily_wide
+-- Purpose:
+--   Raw wide-format NOAA daily weather, parsed straight from
+--   .dly month lines: one row per (station, date) with
+--   TMAX/TMIN/PRCP/SNOW and their quality flags.
+--
+-- Feeds:
+--   silver.weather_daily_pivot (pipeline.weather.transform_wide)
+-- ============================================================
+
+CREATE UNLOGGED TABLE IF NOT EXISTS bronze.weather_daily_wide (
+    station_id   TEXT NOT NULL,
+    obs_date     TEXT NOT NULL,
+    tmax         INTEGER,
+    tmin         INTEGER,
+    prcp         INTEGER,
+    snow         INTEGER,
+    tmax_q_flag  TEXT,
+    tmin_q_flag  TEXT,
+    prcp_q_flag  TEXT,
+    snow_q_flag  TEXT,
+    ingested_at  TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_bronze_weather_wide_ingested_at
+    ON bronze.weather_daily_wide (ingested_at);
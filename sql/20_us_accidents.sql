@@ -33,11 +33,23 @@ CREATE TABLE IF NOT EXISTS silver.us_accidents (
     is_traffic_signal      BOOLEAN,
     is_turning_loop        BOOLEAN,
     darkness_level         SMALLINT,
-    geom                   GEOGRAPHY(Point, 4326)
+    geom                   GEOGRAPHY(Point, 4326),
+    updated_at             TIMESTAMPTZ DEFAULT now()
 );
 
+-- Change marker for incremental gold maintenance
+ALTER TABLE silver.us_accidents
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_silver_accidents_updated_at
+    ON silver.us_accidents (updated_at);
+
 CREATE INDEX IF NOT EXISTS idx_silver_accidents_geom
     ON silver.us_accidents USING GIST (geom);
 
 CREATE INDEX IF NOT EXISTS idx_silver_accidents_state_time
     ON silver.us_accidents (state, start_time);
+
+-- Date-range scans for partition-scoped gold builds
+CREATE INDEX IF NOT EXISTS idx_silver_accidents_start_time
+    ON silver.us_accidents (start_time);
@@ -16,3 +16,7 @@ CREATE INDEX IF NOT EXISTS idx_silver_weather_element
 
 CREATE INDEX IF NOT EXISTS idx_silver_weather_date_only
     ON silver.weather_daily (obs_date);
+
+-- Change marker for incremental pivot maintenance
+CREATE INDEX IF NOT EXISTS idx_silver_weather_last_updated
+    ON silver.weather_daily (last_updated);
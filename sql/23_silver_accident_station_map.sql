@@ -1,8 +1,16 @@
 CREATE UNLOGGED TABLE IF NOT EXISTS silver.accident_station_map (
     accident_id TEXT PRIMARY KEY,
     station_id  TEXT NOT NULL,
-    distance_km DOUBLE PRECISION
+    distance_km DOUBLE PRECISION,
+    updated_at  TIMESTAMPTZ DEFAULT now()
 );
 
+-- Change marker for incremental gold maintenance
+ALTER TABLE silver.accident_station_map
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_accident_station_updated_at
+    ON silver.accident_station_map (updated_at);
+
 CREATE INDEX IF NOT EXISTS idx_accident_station_station
     ON silver.accident_station_map (station_id);
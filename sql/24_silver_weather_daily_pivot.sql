@@ -1,50 +1,75 @@
 -- ============================================================
--- MATERIALIZED VIEW: silver.weather_daily_pivot
+-- TABLE: silver.weather_daily_pivot
 -- Purpose:
 --   Pre-aggregated daily weather metrics per station.
 --   Converts row-based elements (TMAX, TMIN, PRCP, SNOW)
 --   into a wide analytical format.
 --
 -- Depends On:
---   silver.weather_daily
+--   silver.weather_daily        (long format)
+--   bronze.weather_daily_wide   (wide format)
 --
--- Required For:
---   REFRESH MATERIALIZED VIEW CONCURRENTLY
---   → Requires UNIQUE index with no WHERE clause
+-- Maintained By:
+--   pipeline.weather_daily_pivot.build
+--   → full rebuild, or incremental upsert of only the
+--     (station_id, obs_date) pairs whose silver.weather_daily
+--     rows changed since the last build (last_updated watermark)
+--   pipeline.weather.transform_wide
+--   → direct upsert of wide rows, no long → wide GROUP BY
+--
+-- updated_at only moves when a pivot value actually changes,
+-- so downstream steps can use it as a change marker.
 -- ============================================================
 
 
 -- ------------------------------------------------------------
--- Drop legacy non-unique index (if exists)
+-- Drop legacy materialized view (if exists)
 -- ------------------------------------------------------------
-DROP INDEX IF EXISTS silver.idx_weather_pivot_station_date;
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_matviews
+        WHERE schemaname = 'silver'
+          AND matviewname = 'weather_daily_pivot'
+    ) THEN
+        DROP MATERIALIZED VIEW silver.weather_daily_pivot;
+    END IF;
+END $$;
 
 
 -- ------------------------------------------------------------
--- Create / Replace Materialized View
+-- Create Table
 -- ------------------------------------------------------------
-CREATE MATERIALIZED VIEW IF NOT EXISTS silver.weather_daily_pivot AS
-SELECT
-    station_id,
-    obs_date,
+CREATE TABLE IF NOT EXISTS silver.weather_daily_pivot (
+    station_id   TEXT NOT NULL,
+    obs_date     DATE NOT NULL,
 
     -- Temperature (°C)
-    MAX(value) FILTER (WHERE element = 'TMAX') AS tmax_c,
-    MAX(value) FILTER (WHERE element = 'TMIN') AS tmin_c,
+    tmax_c       DOUBLE PRECISION,
+    tmin_c       DOUBLE PRECISION,
 
     -- Precipitation (mm)
-    MAX(value) FILTER (WHERE element = 'PRCP') AS prcp_mm,
+    prcp_mm      DOUBLE PRECISION,
 
     -- Snow (mm)
-    MAX(value) FILTER (WHERE element = 'SNOW') AS snow_mm
+    snow_mm      DOUBLE PRECISION,
 
-FROM silver.weather_daily
-GROUP BY station_id, obs_date;
+    -- GHCN quality flags (wide-format loads only)
+    tmax_q_flag  TEXT,
+    tmin_q_flag  TEXT,
+    prcp_q_flag  TEXT,
+    snow_q_flag  TEXT,
 
+    updated_at   TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (station_id, obs_date)
+);
 
--- ------------------------------------------------------------
--- REQUIRED UNIQUE INDEX
--- (Needed for CONCURRENT refresh)
--- ------------------------------------------------------------
-CREATE UNIQUE INDEX IF NOT EXISTS idx_weather_pivot_unique
-    ON silver.weather_daily_pivot (station_id, obs_date);
+ALTER TABLE silver.weather_daily_pivot
+    ADD COLUMN IF NOT EXISTS tmax_q_flag TEXT,
+    ADD COLUMN IF NOT EXISTS tmin_q_flag TEXT,
+    ADD COLUMN IF NOT EXISTS prcp_q_flag TEXT,
+    ADD COLUMN IF NOT EXISTS snow_q_flag TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_weather_pivot_updated_at
+    ON silver.weather_daily_pivot (updated_at);
@@ -1,5 +1,41 @@
+-- ============================================================
+-- TABLE: gold.accident_weather
+-- Purpose:
+--   Final fact table joining accidents + weather.
+--
+-- Partitioning:
+--   RANGE on obs_date, one partition per year
+--   (gold.accident_weather_y<YYYY>), created on demand by
+--   pipeline.accident_weather. Full and backfill builds load
+--   standalone staging tables and DETACH/ATTACH-swap them in,
+--   so readers are never blocked for the length of a build.
+-- ============================================================
+
+
+-- ------------------------------------------------------------
+-- Drop legacy unpartitioned table (if exists)
+-- Gold is fully rebuildable from silver.
+-- ------------------------------------------------------------
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'gold'
+          AND c.relname = 'accident_weather'
+          AND c.relkind = 'r'
+    ) THEN
+        DROP TABLE gold.accident_weather;
+    END IF;
+END $$;
+
+
+-- ------------------------------------------------------------
+-- Create Partitioned Table
+-- ------------------------------------------------------------
 CREATE TABLE IF NOT EXISTS gold.accident_weather (
-    accident_id        TEXT PRIMARY KEY,
+    accident_id        TEXT NOT NULL,
     station_id         TEXT NOT NULL,
     distance_km        DOUBLE PRECISION,
     obs_date           DATE NOT NULL,
@@ -14,8 +50,12 @@ CREATE TABLE IF NOT EXISTS gold.accident_weather (
     tmin_c             DOUBLE PRECISION,
     prcp_mm            DOUBLE PRECISION,
     snow_mm            DOUBLE PRECISION,
-    created_at         TIMESTAMPTZ DEFAULT now()
-);
+    created_at         TIMESTAMPTZ DEFAULT now(),
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    -- Partition key must be part of the primary key
+    PRIMARY KEY (accident_id, obs_date)
+) PARTITION BY RANGE (obs_date);
 
 CREATE INDEX IF NOT EXISTS idx_gold_obs_date
     ON gold.accident_weather (obs_date);
@@ -23,8 +63,8 @@ CREATE INDEX IF NOT EXISTS idx_gold_obs_date
 CREATE INDEX IF NOT EXISTS idx_gold_state_date
     ON gold.accident_weather (state, obs_date);
 
-CREATE INDEX IF NOT EXISTS idx_gold_station
-    ON gold.accident_weather (station_id);
+CREATE INDEX IF NOT EXISTS idx_gold_station_date
+    ON gold.accident_weather (station_id, obs_date);
 
 CREATE INDEX IF NOT EXISTS idx_gold_darkness
     ON gold.accident_weather (darkness_level);
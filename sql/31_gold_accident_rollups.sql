@@ -0,0 +1,114 @@
+-- ============================================================
+-- TABLES: gold.rollup_*
+-- Purpose:
+--   Pre-aggregated rollups of gold.accident_weather for
+--   dashboards. Maintained by pipeline.rollups, which
+--   recomputes only the (state, month) slices whose gold
+--   rows changed since the last build.
+--
+--   Grains (coarsest → finest):
+--     rollup_state_month           state × month
+--     rollup_state_month_severity  + severity × darkness_level
+--     rollup_accident_weather      + prcp / snow / temperature bands
+--
+--   Measures are additive (counts and sums), so any
+--   rollup can be re-aggregated to a coarser grain and
+--   averages are derived as SUM(x_sum) / SUM(x_count).
+-- ============================================================
+
+
+-- ------------------------------------------------------------
+-- Finest grain: state × month × severity × darkness × weather
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS gold.rollup_accident_weather (
+    state              CHAR(2),
+    month              DATE NOT NULL,
+    severity           SMALLINT,
+    darkness_level     SMALLINT,
+    prcp_band          TEXT NOT NULL,
+    snow_band          TEXT NOT NULL,
+    temp_band          TEXT NOT NULL,
+
+    accident_count     BIGINT NOT NULL,
+    distance_km_sum    DOUBLE PRECISION,
+    tmax_sum           DOUBLE PRECISION,
+    tmax_count         BIGINT NOT NULL,
+    tmin_sum           DOUBLE PRECISION,
+    tmin_count         BIGINT NOT NULL,
+    prcp_sum           DOUBLE PRECISION,
+    prcp_count         BIGINT NOT NULL,
+    snow_sum           DOUBLE PRECISION,
+    snow_count         BIGINT NOT NULL,
+
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    UNIQUE NULLS NOT DISTINCT (
+        state, month, severity, darkness_level,
+        prcp_band, snow_band, temp_band
+    )
+);
+
+
+-- ------------------------------------------------------------
+-- state × month × severity × darkness
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS gold.rollup_state_month_severity (
+    state              CHAR(2),
+    month              DATE NOT NULL,
+    severity           SMALLINT,
+    darkness_level     SMALLINT,
+
+    accident_count     BIGINT NOT NULL,
+    distance_km_sum    DOUBLE PRECISION,
+    tmax_sum           DOUBLE PRECISION,
+    tmax_count         BIGINT NOT NULL,
+    tmin_sum           DOUBLE PRECISION,
+    tmin_count         BIGINT NOT NULL,
+    prcp_sum           DOUBLE PRECISION,
+    prcp_count         BIGINT NOT NULL,
+    snow_sum           DOUBLE PRECISION,
+    snow_count         BIGINT NOT NULL,
+
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    UNIQUE NULLS NOT DISTINCT (state, month, severity, darkness_level)
+);
+
+
+-- ------------------------------------------------------------
+-- state × month
+-- ------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS gold.rollup_state_month (
+    state              CHAR(2),
+    month              DATE NOT NULL,
+
+    accident_count     BIGINT NOT NULL,
+    distance_km_sum    DOUBLE PRECISION,
+    tmax_sum           DOUBLE PRECISION,
+    tmax_count         BIGINT NOT NULL,
+    tmin_sum           DOUBLE PRECISION,
+    tmin_count         BIGINT NOT NULL,
+    prcp_sum           DOUBLE PRECISION,
+    prcp_count         BIGINT NOT NULL,
+    snow_sum           DOUBLE PRECISION,
+    snow_count         BIGINT NOT NULL,
+
+    updated_at         TIMESTAMPTZ DEFAULT now(),
+
+    UNIQUE NULLS NOT DISTINCT (state, month)
+);
+
+
+-- ------------------------------------------------------------
+-- Indexes
+-- ------------------------------------------------------------
+-- Leading month serves date-range dashboards;
+-- the unique constraints already lead with state.
+CREATE INDEX IF NOT EXISTS idx_rollup_weather_month
+    ON gold.rollup_accident_weather (month);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_severity_month
+    ON gold.rollup_state_month_severity (month);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_state_month_month
+    ON gold.rollup_state_month (month);
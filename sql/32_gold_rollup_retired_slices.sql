@@ -0,0 +1,17 @@
+-- ============================================================
+-- TABLE: gold.rollup_retired_slices
+-- Purpose:
+--   (state, month) slices that lost gold rows: an accident
+--   whose day or state changed leaves its old slice without
+--   any updated_at marker. Written by the incremental gold
+--   build, consumed (and emptied) by pipeline.rollups.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS gold.rollup_retired_slices (
+    state       CHAR(2),
+    month       DATE NOT NULL,
+    retired_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_retired_slices_retired_at
+    ON gold.rollup_retired_slices (retired_at);
@@ -0,0 +1,14 @@
+-- ============================================================
+-- TABLE: meta.watermarks
+-- Purpose:
+--   High-water marks for incremental transforms.
+--   Each row records the latest source timestamp a step
+--   has fully processed, so the next run only reads
+--   rows newer than it.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.watermarks (
+    name        TEXT PRIMARY KEY,
+    value       TIMESTAMPTZ NOT NULL,
+    updated_at  TIMESTAMPTZ DEFAULT now()
+);
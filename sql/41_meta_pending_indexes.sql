@@ -0,0 +1,15 @@
+-- ============================================================
+-- TABLE: meta.pending_indexes
+-- Purpose:
+--   Index definitions dropped by a bulk load and not yet
+--   rebuilt. Rows are removed as each index is recreated,
+--   so anything left here after a crash is restored by the
+--   next bulk load on the same table.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.pending_indexes (
+    index_name  TEXT PRIMARY KEY,
+    table_name  TEXT NOT NULL,
+    indexdef    TEXT NOT NULL,
+    dropped_at  TIMESTAMPTZ DEFAULT now()
+);
@@ -0,0 +1,87 @@
+-- ============================================================
+-- TABLE: meta.table_changes
+-- Purpose:
+--   Per-table change counters. A statement-level trigger
+--   logs one row per (table, writing transaction) whenever
+--   a statement writes to a bronze/silver/gold table
+--   (including TRUNCATE), in the writer's own transaction.
+--
+--   A table's version is MAX(id) of its rows. Pipeline
+--   steps fingerprint their upstream tables by it, so an
+--   unchanged table costs one index lookup instead of a scan.
+--
+--   Rows are appended, never updated, so concurrent writers
+--   to the same table (parallel COPY) never wait on each
+--   other. Older rows are pruned by the pipeline.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.table_changes (
+    id          BIGSERIAL PRIMARY KEY,
+    table_name  TEXT NOT NULL,
+    txid        BIGINT NOT NULL,
+    changed_at  TIMESTAMPTZ DEFAULT now(),
+    UNIQUE (table_name, txid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_table_changes_table_id
+    ON meta.table_changes (table_name, id);
+
+
+-- ------------------------------------------------------------
+-- Bump function (also called directly for DDL-only changes,
+-- e.g. partition swaps, which fire no DML triggers)
+-- ------------------------------------------------------------
+CREATE OR REPLACE FUNCTION meta.bump_table_version(name TEXT)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO meta.table_changes (table_name, txid)
+    VALUES (name, txid_current())
+    ON CONFLICT (table_name, txid) DO NOTHING;
+$$;
+
+CREATE OR REPLACE FUNCTION meta.bump_table_version_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM meta.bump_table_version(TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$;
+
+
+-- ------------------------------------------------------------
+-- Attach to every pipeline table that exists
+-- ------------------------------------------------------------
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'bronze.stations',
+        'bronze.weather_daily',
+        'bronze.weather_daily_wide',
+        'bronze.us_accidents',
+        'silver.stations',
+        'silver.weather_daily',
+        'silver.weather_daily_pivot',
+        'silver.us_accidents',
+        'silver.accident_station_map',
+        'gold.accident_weather',
+        'gold.rollup_accident_weather',
+        'gold.rollup_state_month_severity',
+        'gold.rollup_state_month'
+    ]
+    LOOP
+        IF to_regclass(t) IS NOT NULL THEN
+            EXECUTE format(
+                'CREATE OR REPLACE TRIGGER trg_table_version '
+                'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %s '
+                'FOR EACH STATEMENT '
+                'EXECUTE FUNCTION meta.bump_table_version_trigger()',
+                t
+            );
+        END IF;
+    END LOOP;
+END $$;
@@ -0,0 +1,15 @@
+-- ============================================================
+-- TABLE: meta.step_fingerprints
+-- Purpose:
+--   Fingerprint of the inputs of each pipeline step's last
+--   successful run (upstream table versions, landing files,
+--   parameters). A step whose current fingerprint matches
+--   is skipped unless forced.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.step_fingerprints (
+    step         TEXT PRIMARY KEY,
+    fingerprint  TEXT NOT NULL,
+    inputs       JSONB NOT NULL,
+    updated_at   TIMESTAMPTZ DEFAULT now()
+);
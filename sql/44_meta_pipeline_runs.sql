@@ -0,0 +1,56 @@
+-- ============================================================
+-- TABLES: meta.pipeline_runs / meta.step_runs
+-- Purpose:
+--   Persistent run history. One pipeline_runs row per
+--   orchestrator run, one step_runs row per step invocation
+--   (including skipped steps), with timings and resource
+--   metrics for trend and regression tracking.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.pipeline_runs (
+    run_id                 BIGSERIAL PRIMARY KEY,
+    started_at             TIMESTAMPTZ NOT NULL DEFAULT now(),
+    ended_at               TIMESTAMPTZ,
+    status                 TEXT NOT NULL DEFAULT 'running',
+    seconds                DOUBLE PRECISION,
+    critical_path          JSONB,
+    critical_path_seconds  DOUBLE PRECISION,
+    params                 JSONB,
+    resumes                INTEGER NOT NULL DEFAULT 0,
+    error                  TEXT
+);
+
+ALTER TABLE meta.pipeline_runs
+    ADD COLUMN IF NOT EXISTS resumes INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS meta.step_runs (
+    id            BIGSERIAL PRIMARY KEY,
+    run_id        BIGINT REFERENCES meta.pipeline_runs (run_id) ON DELETE CASCADE,
+    step          TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    started_at    TIMESTAMPTZ NOT NULL,
+    ended_at      TIMESTAMPTZ NOT NULL,
+    seconds       DOUBLE PRECISION NOT NULL,
+    rows_in       BIGINT,
+    rows_out      BIGINT,
+    bytes_read    BIGINT,
+    peak_rss_mb   DOUBLE PRECISION,
+    db_seconds    DOUBLE PRECISION,
+    tuning        JSONB,
+    params        JSONB,
+    fingerprint   TEXT,
+    result        JSONB,
+    error         TEXT
+);
+
+ALTER TABLE meta.step_runs
+    ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+
+ALTER TABLE meta.step_runs
+    ADD COLUMN IF NOT EXISTS tuning JSONB;
+
+CREATE INDEX IF NOT EXISTS idx_step_runs_step_started
+    ON meta.step_runs (step, started_at);
+
+CREATE INDEX IF NOT EXISTS idx_step_runs_run_id
+    ON meta.step_runs (run_id);
@@ -0,0 +1,14 @@
+-- ============================================================
+-- TABLE: meta.data_fixes
+-- Purpose:
+--   Ledger of one-shot data fixes (pipeline.data_fixes).
+--   Unlike the schema files in this directory, a data fix
+--   is not idempotent; each one runs once per database and
+--   is recorded here.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS meta.data_fixes (
+    name        TEXT PRIMARY KEY,
+    applied_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    rows        BIGINT
+);